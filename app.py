@@ -1,15 +1,33 @@
+import importlib
+import uuid
+
 import streamlit as st
 
-from src.state import get_state
+from src.state import commit_state, get_state
 from src.calc import calc_discretionary_hours
+from src.instrument import bind_session, timed
 from src.ui.sidebar import render_sidebar
-from src.ui.onboarding_page import render_onboarding_page
-from src.ui.input_page import render_input_page
-from src.ui.results_page import render_results_page
-from src.ui.support_page import render_decision_support_page
-from src.ui.export_page import render_export_page
+from src.ui.debug_panel import render_debug_panel
+from src.ui.fragments import set_view_deps
+
+# 화면별로 읽는 AppState 필드 (사이드바 조각에서 이 필드가 바뀔 때만 앱 전체를 다시 그린다)
+_HEADER_DEPS = ("persona_name", "persona_note")
+_PAGE_DEPS = {
+    "온보딩": ("value_reference", "basis_hour_value", "basis_note", "weights", "valuation_mode"),
+    "입력": ("weights", "valuation_mode"),
+    "선택 활동 가치 환산 결과": ("basis_hour_value", "basis_note", "valuation_mode"),
+    "의사 결정 지원": ("basis_hour_value", "basis_note", "weights", "valuation_mode"),
+    "주간 계획": ("basis_hour_value", "weights", "valuation_mode"),
+    "내보내기(틀)": ("persona_name", "basis_hour_value", "basis_note"),
+}
+
 
+def _page(module: str, func: str):
+    # 페이지 모듈은 해당 메뉴를 처음 열 때 import (pandas 등 무거운 의존성을 시작 시점에 읽지 않는다)
+    return getattr(importlib.import_module(module), func)
 
+
+@timed("app.main")
 def main():
     # ✅ 항상 제일 먼저!
     st.set_page_config(page_title="시간=돈(기회비용)", layout="wide")
@@ -31,14 +49,17 @@ def main():
         st.session_state["scroll_to"] = None
 
     s = get_state()
+    bind_session(st.session_state.setdefault("_instrument_sid", uuid.uuid4().hex[:8]))
     render_sidebar(s)
+    render_debug_panel()
 
     st.title("시간 = 돈(기회비용)")
     st.caption("사람을 평가하지 않는다. 선택을 비난하지 않는다. 선택의 가치를 ‘보여준다’.")
 
     # ✅ 온보딩이 먼저
     if not s.onboarding_completed:
-        render_onboarding_page(s)
+        set_view_deps(_PAGE_DEPS["온보딩"])
+        _page("src.ui.onboarding_page", "render_onboarding_page")(s)
         return
 
     with st.expander(f"{s.persona_name}의 상황(설계 철학)", expanded=True):
@@ -49,26 +70,34 @@ def main():
     # ✅ tabs 대신: session_state에 고정되는 탭 선택기
     menu = st.radio(
         "메뉴",
-        ["입력", "선택 활동 가치 환산 결과", "의사 결정 지원", "내보내기(틀)"],
+        ["입력", "선택 활동 가치 환산 결과", "의사 결정 지원", "주간 계획", "내보내기(틀)"],
         horizontal=True,
         key="main_menu",  # ✅ 고유 key
         label_visibility="collapsed",
     )
 
     st.divider()
+    set_view_deps(_HEADER_DEPS + _PAGE_DEPS.get(menu, ()))
 
     if menu == "입력":
-        render_input_page(s, discretionary)
+        _page("src.ui.input_page", "render_input_page")(s, discretionary)
 
     elif menu == "선택 활동 가치 환산 결과":
-        render_results_page(s, discretionary, fixed)
+        _page("src.ui.results_page", "render_results_page")(s, discretionary, fixed)
 
     elif menu == "의사 결정 지원":
-        render_decision_support_page(s, discretionary, fixed)
+        _page("src.ui.support_page", "render_decision_support_page")(s, discretionary, fixed)
+
+    elif menu == "주간 계획":
+        _page("src.ui.planner_page", "render_planner_page")(s)
 
     elif menu == "내보내기(틀)":
-        render_export_page(s)
+        _page("src.ui.export_page", "render_export_page")(s)
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        # 세션 저장소가 설정돼 있으면 이번 실행에서 바뀐 상태를 저장 (st.rerun / st.stop으로 끝나도)
+        commit_state()
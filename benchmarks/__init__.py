@@ -0,0 +1 @@
+# 계산 커널 벤치마크 (python -m benchmarks)
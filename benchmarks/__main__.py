@@ -0,0 +1,55 @@
+# 계산 커널 벤치마크 (저장소 루트에서 실행)
+#
+#   python -m benchmarks                               # 전체 실행, 표로 출력
+#   python -m benchmarks --quick -k reallocation       # 큰 입력 제외, 이름 필터
+#   python -m benchmarks -o bench.json                 # 결과 저장(JSON)
+#   python -m benchmarks --baseline bench.json         # 기준과 비교 (기본 20% 이상 느려지면 실패 코드 1)
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Optional, Sequence
+
+from .cases import all_cases
+from .harness import compare, format_report, load_results, regressions, run_case, save_results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks", description="계산 커널 벤치마크")
+    ap.add_argument("-k", "--filter", default="", help="케이스 이름에 이 문자열이 들어간 것만 실행")
+    ap.add_argument("--quick", action="store_true", help="큰 입력(1M 행 등) 제외")
+    ap.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수 (median 사용)")
+    ap.add_argument("--min-time", type=float, default=0.05, help="측정 1회의 최소 시간(초)")
+    ap.add_argument("-o", "--output", help="결과를 저장할 JSON 경로")
+    ap.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    ap.add_argument("--threshold", type=float, default=0.20, help="회귀로 볼 느려짐 비율 (기본 0.20 = 20%%)")
+    args = ap.parse_args(argv)
+
+    cases = [c for c in all_cases() if args.filter in c.key and not (args.quick and c.heavy)]
+    if not cases:
+        print("실행할 케이스가 없습니다.", file=sys.stderr)
+        return 2
+
+    results = []
+    for case in cases:
+        print(f"running {case.key} ...", file=sys.stderr, flush=True)
+        results.append(run_case(case, repeat=args.repeat, min_time=args.min_time))
+
+    if args.output:
+        save_results(args.output, results)
+
+    comparisons = None
+    if args.baseline:
+        comparisons = compare(results, load_results(args.baseline))
+    print(format_report(results, comparisons, args.threshold))
+
+    if comparisons is not None:
+        bad = regressions(comparisons, args.threshold)
+        if bad:
+            print(f"\n{len(bad)}개 케이스가 기준보다 {args.threshold:.0%} 넘게 느려졌습니다.", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,420 @@
+# 계산 커널 벤치마크 케이스
+# - 입력은 고정 seed로 생성 (실행마다 같은 입력)
+# - 결과 캐시(cached_result)를 타지 않도록 .uncached를 재고, 캐시 적중 경로는 따로 잰다
+# - ".table" 케이스는 같은 입력을 ChoiceTable(열 단위)로 넘긴 경우
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from src.aggregates import METRICS, RollingAggregates
+from src.batch import _record_from_json
+from src.cache import clear_caches
+from src.choices import category_hours, reallocate_hours
+from src.calc import (
+    build_alpha_by_label_from_weights,
+    build_reallocation_profile,
+    calc_discretionary_hours,
+    calc_opportunity_cost,
+    calc_opportunity_cost_table,
+    calc_reallocation_gains,
+    rank_reallocation_moves,
+    resolve_config,
+    resolve_factor_vectors,
+)
+from src.models import AppState, ChoiceBlock, ChoiceTable, TimeBasics
+from src.modes import DEFAULT_MODE, all_modes, get_mode, score_modes
+from src.planner import DAYS, WeekPlan, evaluate_week, rank_week_moves
+from src.precompute import compute_support_tables
+from src.quotes import CATEGORY_GROUPS, DEFAULT_ENGINE, features_from_hours
+from src.sensitivity import sensitivity_surface
+from src.service import score_batch
+from src.timeline import MINUTES_PER_DAY, Timeline, TimeBlock
+
+from .harness import Case
+
+SEED = 20240601
+
+
+def _categories(n_cat: int) -> List[str]:
+    return [f"범주{i:04d}" for i in range(n_cat)]
+
+
+def _weights(n_cat: int) -> Dict[str, int]:
+    rng = np.random.default_rng(SEED + n_cat)
+    return {c: int(w) for c, w in zip(_categories(n_cat), rng.integers(0, 101, n_cat))}
+
+
+def _choices(n_cat: int, n_rows: int) -> List[ChoiceBlock]:
+    rng = np.random.default_rng(SEED + n_cat * 7 + n_rows)
+    cats = _categories(n_cat)
+    labels = rng.integers(0, n_cat, n_rows)
+    hours = np.round(rng.uniform(0.0, 4.0, n_rows), 2)
+    return [ChoiceBlock(cats[i], float(h)) for i, h in zip(labels, hours)]
+
+
+# -----------------------------
+# calc_discretionary_hours
+# -----------------------------
+def _discretionary() -> Callable[[], Any]:
+    basics = TimeBasics(sleep_h=7.5, meals_h=1.5, hygiene_h=1.0, commute_h=1.5, chores_h=0.5)
+    return lambda: calc_discretionary_hours(basics)
+
+
+# -----------------------------
+# calc_opportunity_cost_table
+# -----------------------------
+def _oc_table(n_cat: int, n_rows: int, columnar: bool = False) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        choices = _choices(n_cat, n_rows)
+        if columnar:
+            choices = ChoiceTable.from_blocks(choices)
+        weights = _weights(n_cat)
+        fn = calc_opportunity_cost_table.uncached
+        return lambda: fn(choices, 12000.0, None, weights, "ratio")
+
+    return setup
+
+
+def _oc_table_cached(n_cat: int, n_rows: int, columnar: bool = False) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        choices = _choices(n_cat, n_rows)
+        if columnar:
+            choices = ChoiceTable.from_blocks(choices)
+        weights = _weights(n_cat)
+        calc_opportunity_cost_table(choices, 12000.0, weights=weights)
+        return lambda: calc_opportunity_cost_table(choices, 12000.0, weights=weights)
+
+    return setup
+
+
+# -----------------------------
+# build_alpha_by_label_from_weights
+# -----------------------------
+def _alpha(n_cat: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        weights = _weights(n_cat)
+        return lambda: build_alpha_by_label_from_weights(weights)
+
+    return setup
+
+
+# -----------------------------
+# 재배분 그리드 (의사 결정 지원 페이지의 ‘1시간 재배분’ / Δh 스윕과 같은 경로)
+# -----------------------------
+def _realloc_inputs(n_cat: int, n_rows: int) -> Tuple[List[str], List[ChoiceBlock], Dict[str, int]]:
+    return _categories(n_cat), _choices(n_cat, n_rows), _weights(n_cat)
+
+
+def _realloc_profile(categories, choices, weights):
+    _, result = calc_opportunity_cost.uncached(choices, 12000.0, None, weights, "ratio")
+    alpha, p_conv, mult = resolve_factor_vectors(categories, resolve_config(weights=weights))
+    return build_reallocation_profile(
+        categories,
+        [c.label for c in choices],
+        [c.hours for c in choices],
+        result.v_effective[0],
+        fallback_value=12000.0 * alpha * p_conv * mult,
+    )
+
+
+def _realloc_grid(n_cat: int, n_rows: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        categories, choices, weights = _realloc_inputs(n_cat, n_rows)
+
+        def run():
+            profile = _realloc_profile(categories, choices, weights)
+            return rank_reallocation_moves(profile, calc_reallocation_gains(profile, 1.0), limit=10)
+
+        return run
+
+    return setup
+
+
+def _realloc_sweep(n_cat: int, n_rows: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        categories, choices, weights = _realloc_inputs(n_cat, n_rows)
+        profile = _realloc_profile(categories, choices, weights)
+        sweep = np.arange(0.5, 8.0 + 0.25, 0.5)
+
+        def run():
+            gains = calc_reallocation_gains(profile, sweep)
+            return [rank_reallocation_moves(profile, g, limit=1) for g in gains]
+
+        return run
+
+    return setup
+
+
+# -----------------------------
+# choices 어댑터 (대안 가치 모드의 범주 합계 / 재배분, 목록 입력은 dict로)
+# -----------------------------
+def _choice_input(n_cat: int, n_rows: int, kind: str) -> Any:
+    choices = _choices(n_cat, n_rows)
+    if kind == "dict":
+        return [{"name": c.label, "time": c.hours} for c in choices]
+    if kind == "table":
+        return ChoiceTable.from_blocks(choices)
+    return choices
+
+
+def _choices_reallocate(n_cat: int, n_rows: int, kind: str) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        choices = _choice_input(n_cat, n_rows, kind)
+        cats = _categories(n_cat)
+        return lambda: reallocate_hours(choices, cats[0], cats[1], 2.0)
+
+    return setup
+
+
+def _choices_category_hours(n_cat: int, n_rows: int, kind: str) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        choices = _choice_input(n_cat, n_rows, kind)
+        return lambda: category_hours(choices)
+
+    return setup
+
+
+# -----------------------------
+# 누적 집계 (결과 페이지의 주간/월간 기록 흐름)
+# -----------------------------
+def _aggregates(n_cat: int, n_days: int) -> RollingAggregates:
+    rng = np.random.default_rng(SEED + n_cat + n_days)
+    cats = _categories(n_cat)
+    agg = RollingAggregates()
+    start = date(2020, 1, 1)
+    for i in range(n_days):
+        agg.set_day(start + timedelta(days=i), cats, rng.uniform(0.0, 4.0, (len(METRICS), n_cat)), deferred=True)
+    agg.rebuild()
+    return agg
+
+
+def _aggregates_window(n_cat: int, n_days: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        agg = _aggregates(n_cat, n_days)
+        first, last = agg.first_day, agg.last_day
+        return lambda: agg.window(first + timedelta(days=n_days // 4), last - timedelta(days=7))
+
+    return setup
+
+
+def _aggregates_edit(n_cat: int, n_days: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        agg = _aggregates(n_cat, n_days)
+        cats = _categories(n_cat)
+        day = agg.first_day + timedelta(days=n_days // 2)
+        metrics = np.ones((len(METRICS), n_cat))
+        return lambda: agg.set_day(day, cats, metrics)
+
+    return setup
+
+
+# -----------------------------
+# 의사결정 지원 화면 표 한 벌 (백그라운드 미리 계산 작업 하나의 비용, 결과 캐시 없이)
+# -----------------------------
+def _support_tables(n_cat: int, n_rows: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        choices = ChoiceTable.from_blocks(_choices(n_cat, n_rows))
+        weights = _weights(n_cat)
+
+        def run() -> Any:
+            clear_caches()
+            return compute_support_tables(choices, weights, 12000.0, 12.0)
+
+        return run
+
+    return setup
+
+
+# -----------------------------
+# 가중치 반응면: 만들기(캐시 없이) / 가중치 조합 하나의 합계·힌트 조회
+# -----------------------------
+def _sensitivity_build(n_cat: int, n_rows: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        choices = ChoiceTable.from_blocks(_choices(n_cat, n_rows))
+        cats = tuple(_weights(n_cat))
+        return lambda: sensitivity_surface.uncached(choices, cats)
+
+    return setup
+
+
+def _sensitivity_lookup(n_cat: int, n_rows: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        weights = _weights(n_cat)
+        surface = sensitivity_surface.uncached(ChoiceTable.from_blocks(_choices(n_cat, n_rows)), tuple(weights))
+        return lambda: (surface.total(weights, 12000.0), surface.weight_hints(weights, 12000.0, limit=1))
+
+    return setup
+
+
+# -----------------------------
+# 가치 환산 모드 (배치의 한 행 = 하루, --compare-modes는 모든 모드를 한 번에)
+# -----------------------------
+def _mode_inputs(n_cat: int, n_days: int) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(SEED + n_cat + n_days)
+    labels = _categories(n_cat)
+    hours = rng.uniform(0.0, 4.0, (n_days, n_cat))
+    weight_idx = np.where(rng.random((n_days, n_cat)) < 0.8, rng.integers(0, 101, (n_days, n_cat)), -1)
+    return labels, hours, weight_idx, rng.uniform(5_000.0, 30_000.0, n_days)
+
+
+def _modes_score(n_cat: int, n_days: int, every_mode: bool) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        labels, hours, weight_idx, basis = _mode_inputs(n_cat, n_days)
+        if every_mode:
+            modes = all_modes()
+            return lambda: score_modes(modes, labels, hours, weight_idx, basis)
+        mode = get_mode(DEFAULT_MODE)
+        return lambda: mode.value_matrix(labels, hours, weight_idx, basis)
+
+    return setup
+
+
+# -----------------------------
+# 시간 블록 타임라인 (1년치 기록, 하루 수십 블록)
+# -----------------------------
+def _timeline_blocks(n_days: int, per_day: int) -> List[TimeBlock]:
+    rng = np.random.default_rng(SEED + n_days + per_day)
+    labels = _categories(6)
+    step = MINUTES_PER_DAY // per_day
+    blocks = []
+    for d in range(n_days):
+        base = (date(2024, 1, 1).toordinal() + d) * MINUTES_PER_DAY
+        lengths = rng.integers(step // 2, step + 1, per_day)
+        for k, length in enumerate(lengths.tolist()):
+            blocks.append(TimeBlock(base + k * step, base + k * step + length, labels[int(rng.integers(len(labels)))]))
+    order = rng.permutation(len(blocks))
+    return [blocks[i] for i in order]
+
+
+def _timeline_insert(n_days: int, per_day: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        blocks = _timeline_blocks(n_days, per_day)
+        return lambda: Timeline(blocks)
+
+    return setup
+
+
+def _timeline_window(n_days: int, per_day: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        timeline = Timeline(_timeline_blocks(n_days, per_day))
+        start = date(2024, 1, 1).toordinal() * MINUTES_PER_DAY + 437
+        end = start + (n_days - 30) * MINUTES_PER_DAY + 611
+        return lambda: timeline.category_hours(start, end)
+
+    return setup
+
+
+# -----------------------------
+# 주간 계획 (7 × C 평가 + 요일 간 재배분 순위, 히트맵 한 번 그릴 때의 계산)
+# -----------------------------
+def _planner_week(n_cat: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        rng = np.random.default_rng(SEED + n_cat)
+        weights = _weights(n_cat)
+        plan = WeekPlan(tuple(weights), rng.uniform(0.0, 3.0, (len(DAYS), n_cat)), tuple(TimeBasics() for _ in DAYS))
+
+        def run() -> Any:
+            ev = evaluate_week(plan, 12000.0, weights)
+            return ev.total, rank_week_moves(plan, ev, 1.0, 5)
+
+        return run
+
+    return setup
+
+
+# -----------------------------
+# 채점 서비스 (Batcher가 모은 /score 요청 n개를 한 번에 환산)
+# -----------------------------
+def _service_score(n_records: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        rng = np.random.default_rng(SEED + n_records)
+        labels = list(AppState().weights)
+        records = [
+            _record_from_json({"hours": dict(zip(labels, h.tolist())), "weights": {labels[0]: 80}, "basis_hour_value": 12000}, 0.0)
+            for h in np.round(rng.uniform(0.0, 4.0, (n_records, len(labels))), 2)
+        ]
+        return lambda: score_batch(DEFAULT_MODE, records)
+
+    return setup
+
+
+# -----------------------------
+# 상태 문구 규칙 (배치 리포트의 --messages)
+# -----------------------------
+def _quote_rules(n_days: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        rng = np.random.default_rng(SEED + n_days)
+        labels = list(CATEGORY_GROUPS)
+        hours = rng.uniform(0.0, 4.0, (n_days, len(labels)))
+        sleep = rng.uniform(4.0, 9.0, n_days)
+        return lambda: DEFAULT_ENGINE.choose(features_from_hours(labels, hours, sleep), seed=0)
+
+    return setup
+
+
+# (범주 수, choice 행 수)
+OC_TABLE_SIZES = ((4, 10), (4, 1_000), (100, 10_000), (1_000, 100_000), (1_000, 1_000_000))
+ALPHA_SIZES = (4, 100, 1_000)
+REALLOC_SIZES = ((4, 10), (30, 300), (300, 3_000))
+AGGREGATE_SIZES = ((4, 365), (30, 3_650))  # (범주 수, 기록 일수)
+QUOTE_SIZES = (1, 10_000, 100_000)  # 기록 일수
+CHOICE_SIZES = ((4, 100), (30, 100_000))
+SUPPORT_SIZES = ((4, 10), (8, 1_000), (30, 10_000))
+SENSITIVITY_SIZES = ((4, 10), (100, 100_000))
+MODE_SIZES = ((6, 1_000), (6, 100_000))
+TIMELINE_SIZES = ((30, 24), (365, 48))
+PLANNER_SIZES = (4, 30)
+SERVICE_SIZES = (1, 16, 512)  # 배치 하나의 기록 수
+
+
+def all_cases() -> List[Case]:
+    cases = [
+        Case("calc_discretionary_hours", _discretionary),
+    ]
+    for n_cat, n_rows in OC_TABLE_SIZES:
+        params = {"categories": n_cat, "rows": n_rows}
+        cases.append(Case("calc_opportunity_cost_table", _oc_table(n_cat, n_rows), params, heavy=n_rows >= 1_000_000))
+        cases.append(Case("calc_opportunity_cost_table.table", _oc_table(n_cat, n_rows, True), params, heavy=n_rows >= 1_000_000))
+    for n_cat, n_rows in OC_TABLE_SIZES[:3]:
+        params = {"categories": n_cat, "rows": n_rows}
+        cases.append(Case("calc_opportunity_cost_table.cached", _oc_table_cached(n_cat, n_rows), params))
+        cases.append(Case("calc_opportunity_cost_table.table.cached", _oc_table_cached(n_cat, n_rows, True), params))
+    for n_cat in ALPHA_SIZES:
+        cases.append(Case("build_alpha_by_label_from_weights", _alpha(n_cat), {"categories": n_cat}))
+    for n_cat, n_rows in REALLOC_SIZES:
+        params = {"categories": n_cat, "rows": n_rows}
+        cases.append(Case("reallocation_grid", _realloc_grid(n_cat, n_rows), params))
+        cases.append(Case("reallocation_sweep", _realloc_sweep(n_cat, n_rows), params, heavy=n_cat >= 300))
+    for n_cat, n_days in AGGREGATE_SIZES:
+        params = {"categories": n_cat, "days": n_days}
+        cases.append(Case("aggregates.window", _aggregates_window(n_cat, n_days), params))
+        cases.append(Case("aggregates.set_day", _aggregates_edit(n_cat, n_days), params))
+    for n_cat, n_rows in CHOICE_SIZES:
+        for kind in ("blocks", "dict", "table"):
+            params = {"categories": n_cat, "rows": n_rows, "input": kind}
+            cases.append(Case("choices.reallocate", _choices_reallocate(n_cat, n_rows, kind), params))
+            cases.append(Case("choices.category_hours", _choices_category_hours(n_cat, n_rows, kind), params))
+    for n_cat, n_rows in SUPPORT_SIZES:
+        cases.append(Case("support_tables", _support_tables(n_cat, n_rows), {"categories": n_cat, "rows": n_rows}))
+    for n_cat, n_rows in SENSITIVITY_SIZES:
+        params = {"categories": n_cat, "rows": n_rows}
+        cases.append(Case("sensitivity.surface", _sensitivity_build(n_cat, n_rows), params))
+        cases.append(Case("sensitivity.lookup", _sensitivity_lookup(n_cat, n_rows), params))
+    for n_cat, n_days in MODE_SIZES:
+        params = {"categories": n_cat, "days": n_days}
+        cases.append(Case("modes.score", _modes_score(n_cat, n_days, False), params))
+        cases.append(Case("modes.score_all", _modes_score(n_cat, n_days, True), params))
+    for n_days, per_day in TIMELINE_SIZES:
+        params = {"days": n_days, "blocks_per_day": per_day}
+        cases.append(Case("timeline.build", _timeline_insert(n_days, per_day), params))
+        cases.append(Case("timeline.window", _timeline_window(n_days, per_day), params))
+    for n_cat in PLANNER_SIZES:
+        cases.append(Case("planner.week", _planner_week(n_cat), {"categories": n_cat}))
+    for n_records in SERVICE_SIZES:
+        cases.append(Case("service.score_batch", _service_score(n_records), {"records": n_records}))
+    for n_days in QUOTE_SIZES:
+        cases.append(Case("quote_rules", _quote_rules(n_days), {"days": n_days}))
+    return cases
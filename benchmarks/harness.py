@@ -0,0 +1,137 @@
+# 벤치마크 실행/비교 도구 (Streamlit 없이 동작)
+# - Case: 이름 + 파라미터 + setup() -> 측정할 함수(인자 없음)
+# - 호출 1회가 min_time 이상 걸리도록 반복 횟수를 정하고, repeat번 재서 best/median(초/호출)을 기록
+# - 결과는 JSON으로 저장하고, 기준(baseline) 결과와 median을 비교해 threshold 이상 느려진 케이스를 표시
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    params: Dict[str, Any] = field(default_factory=dict)
+    heavy: bool = False  # --quick에서 건너뛸 큰 입력
+
+    @property
+    def key(self) -> str:
+        if not self.params:
+            return self.name
+        return self.name + "[" + ",".join(f"{k}={v}" for k, v in self.params.items()) + "]"
+
+
+@dataclass(frozen=True)
+class CaseResult:
+    key: str
+    name: str
+    params: Dict[str, Any]
+    loops: int
+    repeat: int
+    best_s: float
+    median_s: float
+
+
+@dataclass(frozen=True)
+class Comparison:
+    key: str
+    baseline_s: float
+    current_s: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_s / self.baseline_s if self.baseline_s > 0 else float("inf")
+
+
+def _autorange(fn: Callable[[], Any], min_time: float) -> int:
+    """한 번 측정(loops회 호출)이 min_time 이상이 되는 loops (1, 2, 5, 10, 20, 50, ...)."""
+    loops = 1
+    while True:
+        for mult in (1, 2, 5):
+            n = loops * mult
+            t0 = time.perf_counter()
+            for _ in range(n):
+                fn()
+            if time.perf_counter() - t0 >= min_time:
+                return n
+        loops *= 10
+
+
+def run_case(case: Case, *, repeat: int = 5, min_time: float = 0.05) -> CaseResult:
+    fn = case.setup()
+    fn()  # 워밍업 (import / 첫 할당)
+    loops = _autorange(fn, min_time)
+    times = []
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        times.append((time.perf_counter() - t0) / loops)
+    return CaseResult(
+        key=case.key,
+        name=case.name,
+        params=dict(case.params),
+        loops=loops,
+        repeat=len(times),
+        best_s=min(times),
+        median_s=statistics.median(times),
+    )
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.time(),
+    }
+
+
+def save_results(path: Union[str, Path], results: List[CaseResult]) -> None:
+    payload = {"environment": environment(), "results": [asdict(r) for r in results]}
+    Path(path).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def load_results(path: Union[str, Path]) -> Dict[str, float]:
+    """저장된 결과 파일 -> {key: median_s}"""
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {r["key"]: float(r["median_s"]) for r in payload.get("results", [])}
+
+
+def compare(results: List[CaseResult], baseline: Dict[str, float]) -> List[Comparison]:
+    """baseline에도 있는 케이스만 비교 (ratio = 현재 / 기준)."""
+    return [Comparison(r.key, baseline[r.key], r.median_s) for r in results if r.key in baseline]
+
+
+def regressions(comparisons: List[Comparison], threshold: float) -> List[Comparison]:
+    return [c for c in comparisons if c.ratio > 1.0 + threshold]
+
+
+def format_time(sec: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if sec >= scale:
+            return f"{sec / scale:.2f}{unit}"
+    return f"{sec / 1e-9:.0f}ns"
+
+
+def format_report(results: List[CaseResult], comparisons: Optional[List[Comparison]] = None, threshold: float = 0.0) -> str:
+    by_key = {c.key: c for c in (comparisons or [])}
+    width = max((len(r.key) for r in results), default=10)
+    lines = [f"{'case':<{width}}  {'median':>10}  {'best':>10}  {'loops':>7}" + ("  vs baseline" if comparisons is not None else "")]
+    for r in results:
+        line = f"{r.key:<{width}}  {format_time(r.median_s):>10}  {format_time(r.best_s):>10}  {r.loops:>7}"
+        c = by_key.get(r.key)
+        if c is not None:
+            flag = "  << REGRESSION" if c.ratio > 1.0 + threshold else ""
+            line += f"  {c.ratio:>6.2f}x{flag}"
+        lines.append(line)
+    return "\n".join(lines)
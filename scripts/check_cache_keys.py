@@ -0,0 +1,96 @@
+# 결과 캐시 키 점검 (공용 캐시가 다른 입력의 결과를 돌려주지 않는지)
+# - 계산 결과가 다른 입력끼리는 키가 달라야 하고, 캐시를 탄 결과는 캐시 없이 계산한 결과와 같아야 한다
+# - choices를 목록으로 넘기든 ChoiceTable로 넘기든 결과가 같아야 한다
+#
+#   python scripts/check_cache_keys.py     # 문제가 있으면 종료 코드 1
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any, Callable, List, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.cache import clear_caches, content_key  # noqa: E402
+from src.calc import _oc_cache_key, calc_opportunity_cost  # noqa: E402
+from src.models import FACTOR_COLUMNS, ChoiceBlock, ChoiceTable  # noqa: E402
+
+
+def _block(label: str, hours: float, **factors: Any) -> ChoiceBlock:
+    b = ChoiceBlock(label, hours)
+    for k, v in factors.items():
+        setattr(b, k, v)
+    return b
+
+
+def _factor_variants() -> List[Tuple[str, Any]]:
+    """계수가 없음 / NaN / 숫자가 아닌 값 / 숫자인 choice 목록 (열로 바꾸면 앞의 셋은 모두 NaN)."""
+    rest = [_block("y", 2.0)]
+    return [
+        ("missing", [_block("x", 1.0)] + rest),
+        ("nan", [_block("x", 1.0, alpha=float("nan"))] + rest),
+        ("text", [_block("x", 1.0, alpha="abc")] + rest),
+        ("number", [_block("x", 1.0, alpha=0.25)] + rest),
+    ]
+
+
+def check_distinct_keys() -> List[str]:
+    """계산 결과가 다른 입력은 키도 달라야 한다."""
+    problems = []
+    variants = _factor_variants()
+    for i, (name_a, a) in enumerate(variants):
+        for name_b, b in variants[i + 1 :]:
+            _, ra = calc_opportunity_cost.uncached(a, 100.0)
+            _, rb = calc_opportunity_cost.uncached(b, 100.0)
+            same_result = np.array_equal(ra.value, rb.value, equal_nan=True)
+            same_key = content_key(_oc_cache_key(a, 100.0)) == content_key(_oc_cache_key(b, 100.0))
+            if same_key and not same_result:
+                problems.append(f"{name_a} / {name_b}: 결과가 다른데 캐시 키가 같습니다.")
+    return problems
+
+
+def check_cached_matches_uncached() -> List[str]:
+    """캐시를 번갈아 타도 결과는 캐시 없이 계산한 것과 같아야 한다."""
+    problems = []
+    clear_caches()
+    variants = _factor_variants()
+    for _ in range(2):  # 두 번째 바퀴는 모두 캐시 적중
+        for name, choices in variants:
+            _, cached = calc_opportunity_cost(choices, 100.0)
+            _, direct = calc_opportunity_cost.uncached(choices, 100.0)
+            if not np.array_equal(cached.value, direct.value, equal_nan=True):
+                problems.append(f"{name}: 캐시 결과 {cached.value.tolist()} != 직접 계산 {direct.value.tolist()}")
+    return problems
+
+
+def check_list_table_parity() -> List[str]:
+    """같은 choices를 목록으로 넘기든 ChoiceTable로 넘기든 결과가 같아야 한다 (NaN = 지정 안 함)."""
+    problems = []
+    weights = {"x": 80, "y": 30}
+    for key in FACTOR_COLUMNS:
+        for value in (float("nan"), "abc", None, 0.5):
+            choices = [_block("x", 1.0, **{key: value}), _block("y", 2.0)]
+            for w in (None, weights):
+                _, listed = calc_opportunity_cost.uncached(choices, 100.0, None, w)
+                _, table = calc_opportunity_cost.uncached(ChoiceTable.from_blocks(choices), 100.0, None, w)
+                if not np.array_equal(listed.value, table.value, equal_nan=True):
+                    problems.append(f"{key}={value!r}, weights={w}: 목록 {listed.value.tolist()} != 표 {table.value.tolist()}")
+    return problems
+
+
+CHECKS: Tuple[Callable[[], List[str]], ...] = (check_distinct_keys, check_cached_matches_uncached, check_list_table_parity)
+
+
+def main() -> int:
+    problems = [p for check in CHECKS for p in check()]
+    for p in problems:
+        print(f"실패: {p}", file=sys.stderr)
+    print(f"캐시 키 점검: {len(CHECKS)}개 중 문제 {len(problems)}건")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
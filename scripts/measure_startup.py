@@ -0,0 +1,92 @@
+# 시작(import) 시간 측정
+# - 대상 모듈마다 새 파이썬 프로세스에서 `python -X importtime -c "import ..."`를 반복 실행
+# - 전체 시간(중앙값)과 주요 의존성(pandas/numpy/streamlit)의 누적 import 시간을 보여준다
+#
+#   python scripts/measure_startup.py                 # 기본 대상
+#   python scripts/measure_startup.py src.calc -n 10  # 대상/반복 횟수 지정
+#   python scripts/measure_startup.py --json          # 기계가 읽는 출력
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_TARGETS = ("src.calc", "src.state", "app")
+WATCHED = ("pandas", "numpy", "streamlit")
+
+
+def _parse_importtime(stderr: str) -> Dict[str, int]:
+    """`-X importtime` 출력 -> {최상위 패키지: 누적 시간(us)} (이미 import된 모듈은 다시 세지 않는다)."""
+    out: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2].strip()
+        if name in WATCHED:
+            try:
+                out[name] = int(parts[1])
+            except ValueError:
+                pass
+    return out
+
+
+def measure(target: str, repeat: int = 5, python: Optional[str] = None) -> Dict[str, object]:
+    """target 모듈을 repeat번 새로 import해서 wall time / 의존성별 시간의 중앙값(ms)."""
+    walls: List[float] = []
+    deps: Dict[str, List[float]] = {name: [] for name in WATCHED}
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [python or sys.executable, "-X", "importtime", "-c", f"import {target}"],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        walls.append((time.perf_counter() - t0) * 1000.0)
+        if proc.returncode != 0:
+            tail = proc.stderr.strip().splitlines()[-1:] or ["?"]
+            raise RuntimeError(f"{target} import 실패: {tail[0]}")
+        found = _parse_importtime(proc.stderr)
+        for name in WATCHED:
+            deps[name].append(found.get(name, 0) / 1000.0)
+    return {
+        "target": target,
+        "repeat": len(walls),
+        "wall_ms": round(statistics.median(walls), 1),
+        "imports_ms": {name: round(statistics.median(v), 1) for name, v in deps.items()},
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="모듈별 시작(import) 시간 측정")
+    ap.add_argument("targets", nargs="*", default=list(DEFAULT_TARGETS), help="측정할 모듈 (기본: %(default)s)")
+    ap.add_argument("-n", "--repeat", type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    ap.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = ap.parse_args(argv)
+
+    results = [measure(t, args.repeat) for t in args.targets]
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"{'target':<24}{'wall(ms)':>10}" + "".join(f"{name:>12}" for name in WATCHED))
+    for r in results:
+        imports = r["imports_ms"]
+        print(f"{r['target']:<24}{r['wall_ms']:>10.1f}" + "".join(f"{imports[name]:>12.1f}" for name in WATCHED))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,332 @@
+# 일별 기록의 누적 집계 (주간/월간 합계)
+# - 하루 기록을 calc_opportunity_cost로 환산해 범주별 (시간, 가치, 유효가치)로 쌓는다
+#     가치 = hours * basis, 유효가치 = hours * basis * alpha * p_conv * multiplier
+# - 날짜축 Fenwick 트리(구간 합 트리)에 쌓아 두므로 하루 추가/수정은 O(log n), 임의 기간 합계도 O(log n)
+#   (n = 첫 기록일 ~ 마지막 기록일 일수, 범주 방향은 numpy 벡터 연산)
+# - 저장소와는 saved_at으로 맞춘다: refresh()는 마지막 동기화 이후 저장된 날만 다시 읽는다
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .calc import calc_opportunity_cost
+from .history import DaySnapshot, HistoryStore
+from .instrument import incr, timed
+from .modes import DEFAULT_MODE
+
+METRICS = ("hours", "value", "effective")
+PERIODS = ("week", "month")
+BULK_THRESHOLD = 64  # 한 번에 이보다 많은 날이 바뀌면 하나씩 더하지 않고 트리를 다시 만든다
+MAX_USERS = 32  # history_aggregates가 들고 있는 사용자 수
+
+
+class Fenwick:
+    """
+    values[i] (i = 0..n-1, 원소는 같은 모양의 배열)의 구간 합 트리.
+    add / prefix 모두 O(log n).
+    """
+
+    def __init__(self, values: np.ndarray) -> None:
+        n = len(values)
+        tree = np.zeros((n + 1,) + values.shape[1:], dtype=float)
+        tree[1:] = values
+        for i in range(1, n + 1):  # O(n) 구성
+            j = i + (i & -i)
+            if j <= n:
+                tree[j] += tree[i]
+        self.tree = tree
+
+    def __len__(self) -> int:
+        return len(self.tree) - 1
+
+    def add(self, i: int, delta: np.ndarray) -> None:
+        i += 1
+        n = len(self)
+        while i <= n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i: int) -> np.ndarray:
+        """values[:i]의 합."""
+        i = max(0, min(int(i), len(self)))
+        out = np.zeros(self.tree.shape[1:], dtype=float)
+        while i > 0:
+            out += self.tree[i]
+            i -= i & -i
+        return out
+
+    def range_sum(self, lo: int, hi: int) -> np.ndarray:
+        """values[lo:hi]의 합."""
+        return self.prefix(hi) - self.prefix(lo)
+
+
+@dataclass(frozen=True)
+class WindowTotals:
+    """
+    start ~ end(포함) 기간의 범주별 합계 (배열은 categories 순서, 모양 (C,))
+    - days: 기간 안에 기록이 있는 날 수
+    """
+
+    start: date
+    end: date
+    categories: Tuple[str, ...]
+    hours: np.ndarray
+    value: np.ndarray
+    effective: np.ndarray
+    days: int
+
+    @property
+    def total_hours(self) -> float:
+        return float(self.hours.sum())
+
+    @property
+    def total_value(self) -> float:
+        return float(self.value.sum())
+
+    @property
+    def total_effective(self) -> float:
+        return float(self.effective.sum())
+
+
+def period_start(d: date, period: str) -> date:
+    """d가 속한 주(월요일 시작) / 달의 첫날."""
+    if period == "week":
+        return d - timedelta(days=d.weekday())
+    if period == "month":
+        return d.replace(day=1)
+    raise ValueError(f"알 수 없는 기간 단위입니다: {period} (가능: {', '.join(PERIODS)})")
+
+
+def next_period(d: date, period: str) -> date:
+    """d(기간의 첫날) 다음 기간의 첫날."""
+    if period == "week":
+        return d + timedelta(days=7)
+    if period == "month":
+        return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+    raise ValueError(f"알 수 없는 기간 단위입니다: {period} (가능: {', '.join(PERIODS)})")
+
+
+def snapshot_metrics(snap: DaySnapshot, alpha_mode: str = DEFAULT_MODE) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """하루 기록 -> (choice label 목록, (3, N) 배열: hours / value / effective)."""
+    labels, result = calc_opportunity_cost(snap.choices, snap.basis_hour_value, None, snap.weights, alpha_mode)
+    hours = result.hours[0]
+    return labels, np.stack([hours, hours * result.basis[0], result.value[0]])
+
+
+class RollingAggregates:
+    """
+    한 사용자의 일별 환산 결과를 날짜축 Fenwick 트리로 쌓아 둔 집계.
+    - set_day / add_snapshot / remove_day: 하루 단위 추가·수정·삭제 (O(log n))
+    - window(start, end): 임의 기간의 범주별 합계 (O(log n))
+    - periods(period, count): 최근 count개 주/월 합계
+    - refresh(store, user_id): 저장소에서 바뀐 날만 반영
+    """
+
+    def __init__(self, alpha_mode: str = DEFAULT_MODE) -> None:
+        self.alpha_mode = alpha_mode
+        self.categories: List[str] = []
+        self.synced_at = 0.0
+        self._index: Dict[str, int] = {}
+        self._origin: Optional[date] = None
+        self._daily = np.zeros((0, len(METRICS), 0))  # (일, 지표, 범주)
+        self._present = np.zeros(0)  # 기록이 있는 날 1.0
+        self._tree = Fenwick(self._daily)
+        self._count = Fenwick(self._present)
+        self._first: Optional[date] = None
+        self._last: Optional[date] = None
+        self._lock = threading.RLock()
+
+    # -----------------------------
+    # 크기 (날짜 범위 / 범주)
+    # -----------------------------
+    @property
+    def first_day(self) -> Optional[date]:
+        return self._first
+
+    @property
+    def last_day(self) -> Optional[date]:
+        return self._last
+
+    def _offset(self, d: date) -> int:
+        return (d - self._origin).days if self._origin is not None else 0
+
+    def _reserve(self, start: date, end: date, labels: Iterable[str]) -> None:
+        """start ~ end와 labels가 들어갈 자리 확보. 늘어나면 여유를 두고(2배) 한 번에 다시 만든다."""
+        new_labels = [lb for lb in dict.fromkeys(labels) if lb not in self._index]
+        n_days = len(self._present)
+        if self._origin is None:
+            origin, lo_pad = start, 0
+        elif start < self._origin:
+            origin = start - timedelta(days=n_days // 2)  # 과거 쪽으로도 여유
+            lo_pad = (self._origin - origin).days
+        else:
+            origin, lo_pad = self._origin, 0
+        need = (end - origin).days + 1
+        if not new_labels and lo_pad == 0 and need <= n_days:
+            return
+
+        for lb in new_labels:
+            self._index[lb] = len(self.categories)
+            self.categories.append(lb)
+        cap = max(need, lo_pad + n_days)
+        if cap > n_days:
+            cap = max(cap, 2 * n_days, 32)
+
+        daily = np.zeros((cap, len(METRICS), len(self.categories)))
+        daily[lo_pad : lo_pad + n_days, :, : self._daily.shape[2]] = self._daily
+        present = np.zeros(cap)
+        present[lo_pad : lo_pad + n_days] = self._present
+        self._origin = origin
+        self._daily, self._present = daily, present
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        self._tree = Fenwick(self._daily)
+        self._count = Fenwick(self._present)
+        incr("aggregates.rebuild")
+
+    def _note_day(self, d: date, present: bool) -> None:
+        if present:
+            self._first = d if self._first is None or d < self._first else self._first
+            self._last = d if self._last is None or d > self._last else self._last
+        elif d in (self._first, self._last):
+            idx = np.flatnonzero(self._present)
+            self._first = self._origin + timedelta(days=int(idx[0])) if len(idx) else None
+            self._last = self._origin + timedelta(days=int(idx[-1])) if len(idx) else None
+
+    # -----------------------------
+    # 쓰기
+    # -----------------------------
+    def _day_row(self, labels: Sequence[str], metrics: np.ndarray) -> np.ndarray:
+        row = np.zeros((len(METRICS), len(self.categories)))
+        if len(labels):
+            cols = np.fromiter((self._index[lb] for lb in labels), dtype=np.intp, count=len(labels))
+            for m in range(len(METRICS)):
+                np.add.at(row[m], cols, metrics[m])  # 같은 label이 여러 번 나오면 합친다
+        return row
+
+    def set_day(self, d: date, labels: Sequence[str], metrics: np.ndarray, *, deferred: bool = False) -> None:
+        """
+        하루치 값을 넣는다(있으면 교체). metrics: (3, len(labels)) = hours / value / effective
+        deferred=True면 트리를 고치지 않는다 (여러 날을 넣은 뒤 rebuild()를 부를 때)
+        """
+        with self._lock:
+            self._reserve(d, d, labels)
+            i = self._offset(d)
+            row = self._day_row(labels, np.asarray(metrics, dtype=float))
+            if deferred:
+                self._daily[i] = row
+                self._present[i] = 1.0
+            else:
+                self._tree.add(i, row - self._daily[i])
+                self._count.add(i, np.asarray(1.0 - self._present[i]))
+                self._daily[i] = row
+                self._present[i] = 1.0
+            self._note_day(d, True)
+
+    def add_snapshot(self, snap: DaySnapshot, *, deferred: bool = False) -> None:
+        labels, metrics = snapshot_metrics(snap, self.alpha_mode)
+        self.set_day(snap.day, labels, metrics, deferred=deferred)
+
+    def remove_day(self, d: date) -> None:
+        with self._lock:
+            if self._origin is None:
+                return
+            i = self._offset(d)
+            if not 0 <= i < len(self._present) or not self._present[i]:
+                return
+            self._tree.add(i, -self._daily[i])
+            self._count.add(i, np.asarray(-1.0))
+            self._daily[i] = 0.0
+            self._present[i] = 0.0
+            self._note_day(d, False)
+
+    def extend(self, snaps: Iterable[DaySnapshot]) -> int:
+        """여러 날을 한 번에 (BULK_THRESHOLD일이 넘으면 트리를 한 번만 다시 만든다). returns: 반영한 날 수"""
+        snaps = list(snaps)
+        if not snaps:
+            return 0
+        with self._lock:
+            computed = [(snap.day,) + snapshot_metrics(snap, self.alpha_mode) for snap in snaps]
+            self._reserve(
+                min(d for d, _, _ in computed),
+                max(d for d, _, _ in computed),
+                (lb for _, labels, _ in computed for lb in labels),
+            )
+            bulk = len(computed) > BULK_THRESHOLD
+            for d, labels, metrics in computed:
+                self.set_day(d, labels, metrics, deferred=bulk)
+            if bulk:
+                self.rebuild()
+        return len(computed)
+
+    @timed("aggregates.refresh")
+    def refresh(self, store: HistoryStore, user_id: str) -> int:
+        """마지막 동기화 이후 저장소에 저장(덮어쓰기 포함)된 날만 다시 읽어 반영. returns: 반영한 날 수"""
+        with self._lock:
+            changed = store.saved_since(user_id, self.synced_at)
+            if not changed:
+                return 0
+            synced_at = max(t for _, t in changed)
+            if self.synced_at == 0.0:
+                snaps: Iterable[DaySnapshot] = store.iter_days(user_id)
+            else:
+                snaps = [snap for d, _ in changed for snap in store.load_range(user_id, d, d)]
+            n = self.extend(snaps)
+            self.synced_at = synced_at
+            return n
+
+    # -----------------------------
+    # 읽기
+    # -----------------------------
+    def window(self, start: date, end: date) -> WindowTotals:
+        """start ~ end(포함) 기간의 범주별 합계."""
+        with self._lock:
+            c = len(self.categories)
+            if self._origin is None or end < start:
+                sums, days = np.zeros((len(METRICS), c)), 0.0
+            else:
+                lo = max(0, self._offset(start))
+                hi = min(len(self._present), self._offset(end) + 1)
+                if lo >= hi:
+                    sums, days = np.zeros((len(METRICS), c)), 0.0
+                else:
+                    sums, days = self._tree.range_sum(lo, hi), float(self._count.range_sum(lo, hi))
+            return WindowTotals(start, end, tuple(self.categories), sums[0], sums[1], sums[2], int(round(days)))
+
+    def periods(self, period: str = "week", count: int = 8, end: Optional[date] = None) -> List[WindowTotals]:
+        """end(기본: 마지막 기록일)가 속한 기간부터 거슬러 count개의 주/월 합계 (오래된 것부터)."""
+        end = end or self._last
+        if end is None:
+            return []
+        starts = [period_start(end, period)]
+        for _ in range(max(1, int(count)) - 1):
+            starts.append(period_start(starts[-1] - timedelta(days=1), period))
+        starts.reverse()
+        return [self.window(a, next_period(a, period) - timedelta(days=1)) for a in starts]
+
+
+_shared: "OrderedDict[Tuple[str, str, str], RollingAggregates]" = OrderedDict()
+_shared_lock = threading.Lock()
+
+
+def history_aggregates(store: HistoryStore, user_id: str, alpha_mode: str = DEFAULT_MODE) -> RollingAggregates:
+    """
+    (저장소, 사용자, alpha_mode)별 공용 집계. 부를 때마다 refresh로 바뀐 날만 반영한다.
+    (최근 MAX_USERS명만 들고 있음)
+    """
+    key = (store.path, user_id, alpha_mode)
+    with _shared_lock:
+        agg = _shared.get(key)
+        if agg is None:
+            agg = _shared[key] = RollingAggregates(alpha_mode)
+            while len(_shared) > MAX_USERS:
+                _shared.popitem(last=False)
+        _shared.move_to_end(key)
+    agg.refresh(store, user_id)
+    return agg
@@ -0,0 +1,388 @@
+# 대량 하루 기록 채점(헤드리스 CLI)
+#
+#   python -m src.batch days.jsonl -o scored.jsonl
+#   python -m src.batch days.csv -o scored.csv --alpha-mode ratio
+#   python -m src.batch days.jsonl -o scored.jsonl --compare-modes all   # 등록된 모든 모드의 합계도 (한 번에 환산)
+#
+# 입력 한 줄(행) = 하루 기록
+# - JSONL: {"basics": {...}, "choices": [{"label", "hours"}, ...] 또는 "hours": {label: h},
+#           "weights": {label: 0~100}, "basis_hour_value": 원/시간, ...그 외 필드는 그대로 통과}
+# - CSV: TimeBasics 필드명 열(sleep_h, ...), basis_hour_value, "hours:<범주>", "weight:<범주>" 열
+# 출력 = 입력 + discretionary_h + 범주별 가치(value:<범주> / values) + total_value
+#        (--messages) + 상태 문구 버킷(message) / 문구(quote): quotes.RULES 기준, --seed와 행 번호로 고정
+#        (--compare-modes) + 모드별 합계(totals_by_mode / total:<모드>)
+# 입력은 chunk 단위로 읽고 바로 써서 파일 크기와 무관하게 메모리가 일정하다.
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, TypeVar
+
+import numpy as np
+
+from .calc import _clamp_nonneg, calc_discretionary_hours
+from .models import TimeBasics
+from .modes import DEFAULT_MODE, get_mode, mode_names, score_modes
+from .parallel import ParallelRunner
+from .quotes import DEFAULT_ENGINE, features_from_hours
+
+T = TypeVar("T")
+
+HOURS_PREFIX = "hours:"
+WEIGHT_PREFIX = "weight:"
+VALUE_PREFIX = "value:"
+TOTAL_PREFIX = "total:"
+
+_BASICS_FIELDS = tuple(f.name for f in fields(TimeBasics))
+
+
+@dataclass
+class DayRecord:
+    """입력 한 행을 정리한 형태 (raw: 출력에 그대로 넘길 원본)"""
+    raw: Dict[str, Any]
+    basics: TimeBasics
+    hours: Dict[str, float]
+    weights: Dict[str, Any]
+    basis_hour_value: float
+
+
+# -----------------------------
+# 입력 파싱
+# -----------------------------
+def _basics_from(raw: Dict[str, Any]) -> TimeBasics:
+    return TimeBasics(**{k: _clamp_nonneg(raw[k]) for k in _BASICS_FIELDS if k in raw and raw[k] not in (None, "")})
+
+
+def _record_from_json(obj: Dict[str, Any], default_basis: float) -> DayRecord:
+    hours: Dict[str, float] = {}
+    if isinstance(obj.get("hours"), dict):
+        for label, h in obj["hours"].items():
+            hours[str(label)] = hours.get(str(label), 0.0) + _clamp_nonneg(h)
+    for c in obj.get("choices") or []:
+        label = str(c.get("label", ""))
+        hours[label] = hours.get(label, 0.0) + _clamp_nonneg(c.get("hours", 0.0))
+    return DayRecord(
+        raw=obj,
+        basics=_basics_from(obj.get("basics") or {}),
+        hours=hours,
+        weights=dict(obj.get("weights") or {}),
+        basis_hour_value=_clamp_nonneg(obj.get("basis_hour_value", default_basis), default_basis),
+    )
+
+
+def _record_from_csv(row: Dict[str, str], default_basis: float) -> DayRecord:
+    hours: Dict[str, float] = {}
+    weights: Dict[str, Any] = {}
+    for k, v in row.items():
+        if k is None:
+            continue
+        if k.startswith(HOURS_PREFIX):
+            hours[k[len(HOURS_PREFIX):]] = _clamp_nonneg(v)
+        elif k.startswith(WEIGHT_PREFIX) and v not in (None, ""):
+            weights[k[len(WEIGHT_PREFIX):]] = v
+    basis = row.get("basis_hour_value")
+    return DayRecord(
+        raw=row,
+        basics=_basics_from(row),
+        hours=hours,
+        weights=weights,
+        basis_hour_value=_clamp_nonneg(basis if basis not in (None, "") else default_basis, default_basis),
+    )
+
+
+def _iter_raw(fp: TextIO, fmt: str) -> Iterator[Any]:
+    """입력 스트림을 한 행씩 (JSONL: 문자열 한 줄, CSV: 열 dict). 파싱은 작업자 쪽에서 한다."""
+    if fmt == "csv":
+        yield from csv.DictReader(fp)
+        return
+    for line in fp:
+        if line.strip():
+            yield line
+
+
+def _parse(raw: Any, fmt: str, default_basis: float) -> DayRecord:
+    if fmt == "csv":
+        return _record_from_csv(raw, default_basis)
+    return _record_from_json(json.loads(raw), default_basis)
+
+
+def iter_records(fp: TextIO, fmt: str, default_basis: float = 0.0) -> Iterator[DayRecord]:
+    """입력 스트림을 한 줄씩 DayRecord로. (전체를 메모리에 올리지 않는다)"""
+    for raw in _iter_raw(fp, fmt):
+        yield _parse(raw, fmt, default_basis)
+
+
+def _chunks(it: Iterable[T], size: int) -> Iterator[List[T]]:
+    buf: List[T] = []
+    for rec in it:
+        buf.append(rec)
+        if len(buf) >= size:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+# -----------------------------
+# 채점
+# -----------------------------
+def _weight_int(w: Any, default_weight: int = 50) -> int:
+    # build_alpha_by_label_from_weights와 같은 규칙: int 변환 실패 시 중립 50
+    try:
+        return int(w)
+    except Exception:
+        return default_weight
+
+
+def score_records(records: Sequence[DayRecord], alpha_mode: str = DEFAULT_MODE) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    chunk 하나를 모드의 환산 커널로 한 번에 채점.
+    returns: (범주 목록, 범주별 가치 (S, C), 선택 가능 시간 (S,))
+    - alpha: weights에 있는 범주는 모드의 alpha 표[w], 없으면 1.0
+      (calc_opportunity_cost_table(..., weights=..., alpha_mode=...)와 같은 규칙)
+    """
+    labels, values, disc = score_records_modes(records, [alpha_mode])
+    return labels, values[0], disc
+
+
+def score_records_modes(records: Sequence[DayRecord], modes: Sequence[str]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """score_records를 여러 모드로 한 번에: 범주별 가치가 (M, S, C). (입력 정리는 한 번만)"""
+    labels: List[str] = []
+    index: Dict[str, int] = {}
+    for rec in records:
+        for label in rec.hours:
+            if label not in index:
+                index[label] = len(labels)
+                labels.append(label)
+
+    n, c = len(records), len(labels)
+    hours = np.zeros((n, c))
+    weight_idx = np.full((n, c), -1, dtype=np.int64)
+    basis = np.empty(n)
+    discretionary = np.empty(n)
+    for i, rec in enumerate(records):
+        for label, h in rec.hours.items():
+            hours[i, index[label]] = h
+        for label, w in rec.weights.items():
+            j = index.get(str(label))
+            if j is not None:
+                weight_idx[i, j] = max(0, min(100, _weight_int(w)))
+        basis[i] = rec.basis_hour_value
+        # 대량 배치는 행마다 다른 입력이라 결과 캐시를 거치지 않는다
+        discretionary[i] = calc_discretionary_hours(rec.basics)[0]
+
+    values = score_modes([get_mode(m) for m in modes], labels, hours, weight_idx, basis)
+    return labels, values, discretionary
+
+
+def pick_messages(records: Sequence[DayRecord], start: int = 0, seed: int = 0) -> List[Tuple[str, str]]:
+    """
+    chunk 하나의 상태 문구 (버킷, 문구)를 한 번에.
+    - 문구는 (seed, 전체 입력에서의 행 번호)로 고르므로 chunk 크기/worker 수와 무관하게 같다
+    """
+    labels = list(dict.fromkeys(label for rec in records for label in rec.hours))
+    index = {label: j for j, label in enumerate(labels)}
+    hours = np.zeros((len(records), len(labels)))
+    for i, rec in enumerate(records):
+        for label, h in rec.hours.items():
+            hours[i, index[label]] = h
+    sleep = np.array([rec.basics.sleep_h for rec in records], dtype=float)
+    features = features_from_hours(labels, hours, sleep)
+    return DEFAULT_ENGINE.pick_many(features, seed, np.arange(start, start + len(records)))
+
+
+# -----------------------------
+# 출력
+# -----------------------------
+def _format_rows(
+    records: Sequence[DayRecord],
+    labels: List[str],
+    values: np.ndarray,
+    disc: np.ndarray,
+    out_format: str,
+    messages: Optional[List[Tuple[str, str]]] = None,
+    mode_totals: Optional[Dict[str, np.ndarray]] = None,
+) -> List[Any]:
+    """채점 결과를 출력 행으로 (JSONL: 완성된 문자열, CSV: 열 dict)."""
+    totals = values.sum(axis=1)
+    msgs = messages if messages is not None else [None] * len(records)
+    by_mode = [dict(zip(mode_totals, map(float, col))) for col in zip(*mode_totals.values())] if mode_totals else [None] * len(records)
+    rows: List[Any] = []
+    if out_format == "jsonl":
+        for rec, row_v, d, t, m, bm in zip(records, values, disc, totals, msgs, by_mode):
+            out = dict(rec.raw)
+            out["discretionary_h"] = float(d)
+            out["values"] = {label: float(v) for label, v in zip(labels, row_v) if label in rec.hours}
+            out["total_value"] = float(t)
+            if bm is not None:
+                out["totals_by_mode"] = bm
+            if m is not None:
+                out["message"], out["quote"] = m
+            rows.append(json.dumps(out, ensure_ascii=False) + "\n")
+        return rows
+
+    value_cols = [VALUE_PREFIX + label for label in labels]
+    for rec, row_v, d, t, m, bm in zip(records, values, disc, totals, msgs, by_mode):
+        out: Dict[str, Any] = {k: v for k, v in rec.raw.items() if not isinstance(v, (dict, list))}
+        out["discretionary_h"] = float(d)
+        out.update(zip(value_cols, map(float, row_v)))
+        out["total_value"] = float(t)
+        if bm is not None:
+            out.update((TOTAL_PREFIX + name, v) for name, v in bm.items())
+        if m is not None:
+            out["message"], out["quote"] = m
+        rows.append(out)
+    return rows
+
+
+def score_chunk(
+    chunk: Tuple[int, List[Any]],
+    in_format: str,
+    out_format: str,
+    alpha_mode: str,
+    default_basis: float,
+    message_seed: Optional[int] = None,
+    compare_modes: Sequence[str] = (),
+) -> List[Any]:
+    """
+    입력 chunk 하나(시작 행 번호, 원본 행들)를 파싱 -> 채점 -> 출력 행까지. (프로세스 풀 작업 단위)
+    message_seed가 있으면 상태 문구(message / quote)도 붙인다.
+    compare_modes가 있으면 그 모드들의 합계도 같은 패스에서 환산해 붙인다.
+    """
+    start, raw_rows = chunk
+    records = [_parse(raw, in_format, default_basis) for raw in raw_rows]
+    modes = [alpha_mode] + [m for m in compare_modes if m != alpha_mode]
+    labels, all_values, disc = score_records_modes(records, modes)
+    values = all_values[0]
+    mode_totals = None
+    if compare_modes:
+        mode_totals = {m: all_values[modes.index(m)].sum(axis=1) for m in compare_modes}
+    messages = None if message_seed is None else pick_messages(records, start, message_seed)
+    return _format_rows(records, labels, values, disc, out_format, messages, mode_totals)
+
+
+class _Writer:
+    def __init__(self, fp: TextIO, fmt: str) -> None:
+        self.fp = fp
+        self.fmt = fmt
+        self._csv: Optional[csv.DictWriter] = None
+        self.dropped_cols: set = set()
+
+    def write_rows(self, rows: List[Any]) -> None:
+        if self.fmt == "jsonl":
+            self.fp.writelines(rows)
+            return
+        if not rows:
+            return
+        # 행마다 범주 열이 다를 수 있으므로 chunk 전체의 열을 모은다 (처음 나온 순서)
+        cols: Dict[str, None] = {}
+        for row in rows:
+            cols.update(dict.fromkeys(row))
+        if self._csv is None:
+            # CSV 헤더는 첫 chunk 기준으로 고정 (이후 처음 보는 범주 열은 생략하고 보고)
+            self._csv = csv.DictWriter(self.fp, fieldnames=list(cols), extrasaction="ignore")
+            self._csv.writeheader()
+        known = set(self._csv.fieldnames)
+        self.dropped_cols.update(k for k in cols if k not in known)
+        self._csv.writerows(rows)
+
+
+def _infer_format(path: str, explicit: Optional[str]) -> str:
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def run(
+    src: TextIO,
+    dst: TextIO,
+    *,
+    in_format: str,
+    out_format: str,
+    chunk_size: int = 4096,
+    alpha_mode: str = DEFAULT_MODE,
+    default_basis: float = 0.0,
+    workers: Optional[int] = 1,
+    message_seed: Optional[int] = None,
+    compare_modes: Sequence[str] = (),
+) -> Tuple[int, float]:
+    """
+    입력 스트림 -> 채점 -> 출력 스트림. returns: (처리한 행 수, 걸린 시간(초))
+    - workers > 1이면 chunk 단위 파싱/채점을 프로세스 풀에서 돌린다. (읽기/쓰기는 현재 프로세스)
+    - message_seed가 있으면 행마다 상태 문구(message / quote)를 붙인다
+    - compare_modes: 행마다 모드별 합계를 붙일 모드 목록
+    """
+    compare_modes = tuple(compare_modes)
+    for m in (alpha_mode,) + compare_modes:
+        get_mode(m)  # 모르는 모드면 작업을 나누기 전에 바로 오류
+    t0 = time.perf_counter()
+    writer = _Writer(dst, out_format)
+    n_rows = 0
+    size = max(1, int(chunk_size))
+    chunks = ((i * size, rows) for i, rows in enumerate(_chunks(_iter_raw(src, in_format), size)))
+    with ParallelRunner(workers) as runner:
+        # 결과는 입력 순서대로 돌아오므로 출력 순서도 입력과 같다
+        for rows in runner.map(score_chunk, chunks, in_format, out_format, alpha_mode, default_basis, message_seed, compare_modes):
+            writer.write_rows(rows)
+            n_rows += len(rows)
+    dst.flush()
+    if writer.dropped_cols:
+        print(f"경고: CSV 헤더에 없는 열은 출력에서 빠졌습니다: {sorted(writer.dropped_cols)}", file=sys.stderr)
+    return n_rows, time.perf_counter() - t0
+
+
+def _parse_modes(text: str) -> List[str]:
+    names = [m.strip() for m in text.split(",") if m.strip()]
+    return mode_names() if names == ["all"] else names
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.batch", description="하루 기록(CSV/JSONL)을 대량으로 가치 환산합니다.")
+    parser.add_argument("input", help="입력 파일 경로 (- 이면 stdin)")
+    parser.add_argument("-o", "--output", default="-", help="출력 파일 경로 (기본: stdout)")
+    parser.add_argument("--in-format", choices=["csv", "jsonl"], help="입력 형식 (기본: 확장자로 추정)")
+    parser.add_argument("--out-format", choices=["csv", "jsonl"], help="출력 형식 (기본: 확장자로 추정)")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="한 번에 채점할 행 수")
+    parser.add_argument("--alpha-mode", choices=mode_names(), default=DEFAULT_MODE, help="가치 환산 모드 (가중치 -> alpha 곡선, 범주별 계수)")
+    parser.add_argument("--compare-modes", default="", help="모드별 합계도 붙일 모드 (쉼표로 구분, all = 등록된 모든 모드)")
+    parser.add_argument("--workers", type=int, default=1, help="채점 프로세스 수 (0이면 NOAATS_WORKERS 또는 CPU 수)")
+    parser.add_argument("--basis", type=float, default=0.0, help="행에 basis_hour_value가 없을 때 쓸 기준가치(원/시간)")
+    parser.add_argument("--messages", action="store_true", help="행마다 상태 문구(message / quote) 열 추가")
+    parser.add_argument("--seed", type=int, default=0, help="--messages 문구 선택 seed (같은 seed면 같은 문구)")
+    args = parser.parse_args(argv)
+
+    in_fmt = _infer_format(args.input, args.in_format)
+    out_fmt = _infer_format(args.output, args.out_format or (None if args.output != "-" else in_fmt))
+
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        n_rows, elapsed = run(
+            src,
+            dst,
+            in_format=in_fmt,
+            out_format=out_fmt,
+            chunk_size=args.chunk_size,
+            alpha_mode=args.alpha_mode,
+            default_basis=args.basis,
+            workers=args.workers or None,
+            message_seed=args.seed if args.messages else None,
+            compare_modes=_parse_modes(args.compare_modes),
+        )
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    rate = n_rows / elapsed if elapsed > 0 else float("inf")
+    print(f"{n_rows:,}행 처리 / {elapsed:.2f}초 ({rate:,.0f} rows/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
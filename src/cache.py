@@ -0,0 +1,186 @@
+# 계산 결과 캐시 (서버 프로세스 안의 모든 세션이 공유)
+# - 입력 내용(choices/basics/weights 등)의 해시를 키로 사용 -> 같은 기본 상태를 쓰는 사용자끼리도 결과를 재사용
+# - 크기 상한(LRU) + TTL 만료, 스레드 안전(Streamlit 세션은 서로 다른 스레드)
+# - hit/miss/eviction 카운터는 디버그 화면에서 확인
+from __future__ import annotations
+
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+import numpy as np
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Unhashable(Exception):
+    """캐시 키로 만들 수 없는 인자 (이 경우 캐시를 건너뛰고 바로 계산)."""
+
+
+def _freeze(x: Any) -> Hashable:
+    """인자를 내용 기준의 불변 구조로. (같은 내용이면 객체가 달라도 같은 키)"""
+    if x is None or isinstance(x, (bool, int, float, str, bytes)):
+        return (type(x).__name__, x)
+    if isinstance(x, (list, tuple)):
+        return ("seq", tuple(_freeze(v) for v in x))
+    if isinstance(x, dict):
+        return ("dict", tuple(sorted((repr(_freeze(k)), _freeze(v)) for k, v in x.items())))
+    if isinstance(x, np.ndarray):
+        return ("ndarray", x.dtype.str, x.shape, hashlib.blake2b(np.ascontiguousarray(x).tobytes(), digest_size=16).digest())
+    slots = getattr(type(x), "__slots__", None)
+    if slots is not None and not hasattr(x, "__dict__"):
+        # __slots__ 객체(ChoiceTable 등): 공개 슬롯만 (밑줄로 시작하는 슬롯은 파생 캐시)
+        names = (slots,) if isinstance(slots, str) else slots
+        return (type(x).__qualname__, tuple((n, _freeze(getattr(x, n, None))) for n in names if not n.startswith("_")))
+    if hasattr(x, "__dict__"):
+        # dataclass / 일반 객체: 동적으로 붙은 속성(alpha, category 등)도 계산에 쓰일 수 있으므로 모두 포함
+        return (type(x).__qualname__, _freeze(vars(x)))
+    raise Unhashable(type(x).__name__)
+
+
+def content_key(*args: Any, **kwargs: Any) -> str:
+    """인자 내용의 해시 문자열."""
+    frozen = (_freeze(args), _freeze(kwargs))
+    return hashlib.blake2b(repr(frozen).encode("utf-8"), digest_size=20).hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    bypassed: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+
+
+class ResultCache:
+    """
+    LRU + TTL 캐시.
+    - maxsize를 넘으면 가장 오래 안 쓴 항목부터 제거(eviction)
+    - ttl초가 지난 항목은 조회 시 만료(expiration) 처리 (ttl=None이면 만료 없음)
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: Optional[float] = 600.0) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "bypassed": 0}
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self._counts["misses"] += 1
+                return False, None
+            stored_at, value = item
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                self._counts["expirations"] += 1
+                self._counts["misses"] += 1
+                return False, None
+            self._data.move_to_end(key)
+            self._counts["hits"] += 1
+            return True, value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._counts["evictions"] += 1
+
+    def note_bypass(self) -> None:
+        with self._lock:
+            self._counts["bypassed"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for k in self._counts:
+                self._counts[k] = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(size=len(self._data), maxsize=self.maxsize, **self._counts)
+
+
+# 서버 프로세스 공용 캐시 (계산 함수별로 따로 둔다: 디버그 화면에서 함수별 적중률 확인)
+_CACHES: Dict[str, ResultCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_cache(name: str, maxsize: int = 512, ttl: Optional[float] = 600.0) -> ResultCache:
+    with _CACHES_LOCK:
+        cache = _CACHES.get(name)
+        if cache is None:
+            cache = _CACHES[name] = ResultCache(maxsize=maxsize, ttl=ttl)
+        return cache
+
+
+def all_cache_stats() -> Dict[str, CacheStats]:
+    with _CACHES_LOCK:
+        items = list(_CACHES.items())
+    return {name: cache.stats() for name, cache in items}
+
+
+def clear_caches(reset_stats: bool = False) -> None:
+    with _CACHES_LOCK:
+        caches = list(_CACHES.values())
+    for cache in caches:
+        cache.clear()
+        if reset_stats:
+            cache.reset_stats()
+
+
+def cached_result(
+    *,
+    maxsize: int = 512,
+    ttl: Optional[float] = 600.0,
+    copy: Optional[Callable[[Any], Any]] = None,
+    key: Optional[Callable[..., Any]] = None,
+) -> Callable[[F], F]:
+    """
+    계산 함수용 데코레이터. 호출부 코드는 그대로 두고 결과만 재사용한다.
+    - copy: 캐시된 결과를 돌려줄 때 복사 방법 (DataFrame/dict처럼 호출부가 수정할 수 있는 결과용)
+    - key: 인자 -> 키로 해시할 값 (기본: 인자 그대로). 객체 목록처럼 그대로 해시하면 느린 인자를
+           계산에 쓰는 내용만 배열로 바꿔 해시할 때 쓴다
+    - 캐시 없이 돌려야 하는 곳(대량 배치 등)은 fn.uncached(...)를 쓴다.
+    """
+
+    def deco(fn: F) -> F:
+        cache = get_cache(f"{fn.__module__}.{fn.__qualname__}", maxsize=maxsize, ttl=ttl)
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                k = content_key(key(*args, **kwargs)) if key is not None else content_key(*args, **kwargs)
+            except Unhashable:
+                cache.note_bypass()
+                return fn(*args, **kwargs)
+            hit, value = cache.get(k)
+            if not hit:
+                value = fn(*args, **kwargs)
+                cache.set(k, value)
+            return copy(value) if copy is not None else value
+
+        wrapper.uncached = fn  # type: ignore[attr-defined]
+        wrapper.cache = cache  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return deco
@@ -2,11 +2,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional, Any, Sequence
 
-import pandas as pd
+import numpy as np
 
-from .models import ChoiceBlock, TimeBasics
+from .cache import cached_result
+from .instrument import timed
+from .models import FACTOR_COLUMNS, ChoiceBlock, ChoiceTable, TimeBasics
+from .modes import DEFAULT_MODE, get_mode
+
+if TYPE_CHECKING:  # pandas는 표로 보여줄 때(oc_table_from_result)만 불러온다
+    import pandas as pd
 
 
 def krw(x: float) -> str:
@@ -92,25 +98,24 @@ def _get_choice_factor(
 
 
 def sum_choice_hours(choices: List[ChoiceBlock]) -> float:
+    if isinstance(choices, ChoiceTable):
+        return choices.total_hours()
     return float(sum(_clamp_nonneg(getattr(c, "hours", 0.0)) for c in choices))
 
-def weight_to_alpha(weight: int, mode: str = "ratio") -> float:
+def weight_to_alpha(weight: int, mode: str = DEFAULT_MODE) -> float:
     """
-    weight(0~100) -> alpha 변환
+    weight(0~100) -> alpha 변환 (모드별 101칸 표 조회, src/modes.py)
     mode:
       - "ratio": alpha = w/100 (0~1)
-      - "neutral_1": alpha = 0.5 + w/100 (0.5~1.5)  ✅ 추천
+      - "neutral_1": alpha = 0.5 + w/100 (0.5~1.5)  ✅ 추천 (기본)
+      - 그 밖에 등록된 모드(job_prep / health / study ...)
     """
-    w = max(0, min(100, int(weight)))
-    if mode == "ratio":
-        return w / 100.0
-    # neutral_1
-    return 0.5 + (w / 100.0)
+    return get_mode(mode).weight_to_alpha(weight)
 
 def build_alpha_by_label_from_weights(
     weights: Dict[str, int],
     *,
-    mode: str = "neutral_1",
+    mode: str = DEFAULT_MODE,
     default_weight: int = 50,
 ) -> Dict[str, float]:
     """
@@ -118,22 +123,348 @@ def build_alpha_by_label_from_weights(
     - mode="neutral_1": 0.5~1.5 (추천: 과격하지 않음)
     - label 누락 시 default_weight(중립 50)로 처리
     """
+    lut = get_mode(mode).alpha
     alpha_by_label: Dict[str, float] = {}
     for label, w in (weights or {}).items():
         try:
             wi = int(w)
         except Exception:
             wi = default_weight
-        alpha_by_label[str(label)] = float(weight_to_alpha(wi, mode=mode))
+        alpha_by_label[str(label)] = float(lut[max(0, min(100, wi))])
     return alpha_by_label
 
 
+# -----------------------------
+# 배치 엔진: 시나리오 × 범주 행렬을 한 번에 환산
+# -----------------------------
+OC_TABLE_COLUMNS: Tuple[str, ...] = (
+    "선택",
+    "시간(시간)",
+    "기준가치(원/시간)",
+    "alpha",
+    "p_conv",
+    "multiplier",
+    "유효가치(원/시간)",
+    "가치환산(원)",
+)
+
+
+@dataclass(frozen=True)
+class OCBatchResult:
+    """
+    calc_value_matrix 결과(모두 (S, C) float 배열, S=시나리오 수, C=범주 수)
+    - hours: 0 이상으로 정리된 시간
+    - basis: 기준가치(원/시간)
+    - alpha / p_conv / multiplier: 정리된 계수
+    - v_effective: basis * alpha * p_conv * multiplier
+    - value: hours * v_effective
+    """
+    hours: np.ndarray
+    basis: np.ndarray
+    alpha: np.ndarray
+    p_conv: np.ndarray
+    multiplier: np.ndarray
+    v_effective: np.ndarray
+    value: np.ndarray
+
+    @property
+    def total(self) -> np.ndarray:
+        """시나리오별 가치환산 합계 (S,)"""
+        return self.value.sum(axis=1)
+
+
+def _as_float_array(x: Any, default: float) -> np.ndarray:
+    """숫자/배열을 float 배열로. 변환할 수 없는 원소는 default로 채운다."""
+    try:
+        return np.asarray(x, dtype=float)
+    except (TypeError, ValueError):
+        obj = np.asarray(x, dtype=object)
+        flat = [_to_float(v, default) for v in obj.ravel()]
+        return np.asarray(flat, dtype=float).reshape(obj.shape)
+
+
+def _to_float(x: Any, default: float) -> float:
+    try:
+        return float(x)
+    except Exception:
+        return float(default)
+
+
+def _clamp_nonneg_array(x: Any, default: float = 0.0) -> np.ndarray:
+    """_clamp_nonneg의 배열 버전 (NaN/음수 -> 0)."""
+    arr = _as_float_array(x, default)
+    return np.where(arr > 0.0, arr, 0.0)
+
+
+def _clamp_01_array(x: Any, default: float = 1.0) -> np.ndarray:
+    """_clamp_01의 배열 버전."""
+    return np.clip(_as_float_array(x, default), 0.0, 1.0)
+
+
+def calc_value_matrix(
+    hours: Any,
+    basis_hour_value: Any,
+    alpha: Any = 1.0,
+    p_conv: Any = 1.0,
+    multiplier: Any = 1.0,
+) -> OCBatchResult:
+    """
+    여러 시나리오의 가치환산을 한 번에 계산하는 NumPy 엔진.
+
+    - hours: (S, C) 또는 (C,) 시간 행렬 (1차원이면 S=1)
+    - basis_hour_value: 스칼라 또는 시나리오별 (S,)
+    - alpha / p_conv / multiplier: 스칼라, 범주별 (C,), 또는 (S, C)
+
+      V = basis * alpha * p_conv * multiplier
+      OC = hours * V
+
+    계수 정리 규칙은 calc_opportunity_cost_table과 같다.
+    (hours/alpha/multiplier/basis는 0 이상, p_conv는 0~1)
+    """
+    h = _clamp_nonneg_array(hours)
+    if h.ndim == 1:
+        h = h[np.newaxis, :]
+    if h.ndim != 2:
+        raise ValueError("hours는 (S, C) 또는 (C,) 형태여야 합니다.")
+
+    v0 = _clamp_nonneg_array(basis_hour_value)
+    if v0.ndim == 1:
+        v0 = v0[:, np.newaxis]
+
+    shape = h.shape
+    v0 = np.broadcast_to(v0, shape)
+    a = np.broadcast_to(_clamp_nonneg_array(alpha), shape)
+    p = np.broadcast_to(_clamp_01_array(p_conv), shape)
+    m = np.broadcast_to(_clamp_nonneg_array(multiplier), shape)
+
+    v_eff = v0 * a * p * m
+    return OCBatchResult(
+        hours=h,
+        basis=v0,
+        alpha=a,
+        p_conv=p,
+        multiplier=m,
+        v_effective=v_eff,
+        value=h * v_eff,
+    )
+
+
+def resolve_config(
+    config: Optional[OCConfig] = None,
+    weights: Optional[Dict[str, int]] = None,
+    alpha_mode: str = DEFAULT_MODE,
+) -> OCConfig:
+    """
+    weights가 주어지면 alpha_by_label을 weights 기반으로 바꾼 설정을 돌려준다.
+    모드에 범주별 계수 기본값(p_conv / multiplier)이 있으면 config에 없는 범주만 채운다.
+    """
+    cfg = config or OCConfig()
+    mode = get_mode(alpha_mode)
+    if weights is None and not mode.has_factors:
+        return cfg
+    return OCConfig(
+        default_alpha=cfg.default_alpha,
+        default_p_conv=cfg.default_p_conv,
+        default_multiplier=cfg.default_multiplier,
+        alpha_by_label=cfg.alpha_by_label if weights is None else build_alpha_by_label_from_weights(weights, mode=alpha_mode),
+        p_conv_by_label=_with_defaults(mode.p_conv, cfg.p_conv_by_label),
+        multiplier_by_label=_with_defaults(mode.multiplier, cfg.multiplier_by_label),
+    )
+
+
+def _with_defaults(defaults: Dict[str, float], override: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+    if not defaults:
+        return override
+    return {**defaults, **(override or {})}
+
+
+def resolve_factor_vectors(
+    labels: Sequence[str],
+    config: Optional[OCConfig] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    범주(label) 목록에 대한 (alpha, p_conv, multiplier) 벡터.
+    - 우선순위: config.*_by_label[label] -> config.default_*
+    - 범주 단위로 한 번만 풀어서, 시나리오 수와 상관없이 재사용한다.
+    """
+    cfg = config or OCConfig()
+
+    def _vec(override: Optional[Dict[str, float]], default_value: float, clamp_fn) -> np.ndarray:
+        d = clamp_fn(default_value, default_value)
+        if not override:
+            return np.full(len(labels), d, dtype=float)
+        return np.fromiter(
+            (clamp_fn(override[lb], default_value) if lb in override else d for lb in labels),
+            dtype=float,
+            count=len(labels),
+        )
+
+    return (
+        _vec(cfg.alpha_by_label, cfg.default_alpha, _clamp_nonneg),
+        _vec(cfg.p_conv_by_label, cfg.default_p_conv, _clamp_01),
+        _vec(cfg.multiplier_by_label, cfg.default_multiplier, _clamp_nonneg),
+    )
+
+
+def _resolve_choice_factors(
+    choices: Sequence[ChoiceBlock],
+    labels: List[str],
+    cfg: OCConfig,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    ChoiceBlock 목록용 계수 해석.
+    label 단위 벡터를 먼저 만들고, 속성(alpha/p_conv/multiplier)을 가진 choice만 덮어쓴다.
+    (override dict[label] > ChoiceBlock.<key> > default 우선순위는 _get_choice_factor와 같음)
+    속성값이 NaN이거나 숫자가 아니면 '지정 안 함' (ChoiceTable 계수 열의 NaN과 같은 규칙)
+    """
+    alpha, p_conv, mult = resolve_factor_vectors(labels, cfg)
+    specs = (
+        ("alpha", cfg.alpha_by_label, cfg.default_alpha, _clamp_nonneg, alpha),
+        ("p_conv", cfg.p_conv_by_label, cfg.default_p_conv, _clamp_01, p_conv),
+        ("multiplier", cfg.multiplier_by_label, cfg.default_multiplier, _clamp_nonneg, mult),
+    )
+    for key, override, default_value, clamp_fn, out in specs:
+        for i, c in enumerate(choices):
+            if hasattr(c, key) and not np.isnan(_to_float(getattr(c, key), np.nan)):
+                out[i] = _get_choice_factor(
+                    c,
+                    key,
+                    label=labels[i],
+                    override=override,
+                    default_value=default_value,
+                    clamp_fn=clamp_fn,
+                )
+    return alpha, p_conv, mult
+
+
+def _resolve_table_factors(table: ChoiceTable, cfg: OCConfig) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    ChoiceTable용 계수 해석: 범주(C) 단위로 풀어서 코드로 펼친 뒤, 계수 열이 지정된 행만 덮어쓴다.
+    (override dict[label] > 계수 열 > default 우선순위는 _resolve_choice_factors와 같음)
+    """
+    by_category = resolve_factor_vectors(table.categories, cfg)
+    specs = (
+        (table.alpha, cfg.alpha_by_label, _clamp_nonneg_array),
+        (table.p_conv, cfg.p_conv_by_label, _clamp_01_array),
+        (table.multiplier, cfg.multiplier_by_label, _clamp_nonneg_array),
+    )
+    out = []
+    for vec, (col, override, clamp_fn) in zip(by_category, specs):
+        v = vec[table.codes]
+        if col is not None:
+            use = ~np.isnan(col)
+            if override:
+                overridden = np.fromiter((c in override for c in table.categories), dtype=bool, count=len(table.categories))
+                use &= ~overridden[table.codes]
+            v[use] = clamp_fn(col[use])
+        out.append(v)
+    return out[0], out[1], out[2]
+
+
+def oc_table_from_result(labels: Sequence[str], result: OCBatchResult, row: int = 0) -> "pd.DataFrame":
+    """배치 결과의 한 시나리오(row)를 기존 환산표(DataFrame) 형태로 변환. (표시용 경계)"""
+    import pandas as pd
+
+    return pd.DataFrame(
+        {
+            "선택": list(labels),
+            "시간(시간)": result.hours[row],
+            "기준가치(원/시간)": result.basis[row],
+            "alpha": result.alpha[row],
+            "p_conv": result.p_conv[row],
+            "multiplier": result.multiplier[row],
+            "유효가치(원/시간)": result.v_effective[row],
+            "가치환산(원)": result.value[row],
+        },
+        columns=list(OC_TABLE_COLUMNS),
+    )
+
+
+def _freeze_result(result: OCBatchResult) -> OCBatchResult:
+    # 캐시에서 여러 세션이 같은 배열을 공유하므로 읽기 전용으로 둔다
+    for arr in (result.hours, result.basis, result.alpha, result.p_conv, result.multiplier, result.v_effective, result.value):
+        arr.setflags(write=False)
+    return result
+
+
+def _oc_cache_key(
+    choices: Any,
+    basis_hour_value: Any,
+    config: Optional[OCConfig] = None,
+    weights: Optional[Dict[str, int]] = None,
+    alpha_mode: str = DEFAULT_MODE,
+) -> Tuple[Any, ...]:
+    # ChoiceBlock 목록은 객체마다 vars()를 훑는 대신 열(ChoiceTable)로 바꿔 배열째 해시한다
+    # 열로 바꾸면 계수가 "없음 / NaN / 숫자가 아닌 값"일 때 모두 NaN이 되므로 행별 상태를 같이 넣는다
+    # (목록 경로는 이 셋을 다르게 계산한다. 표 입력과는 키 모양이 달라 서로 섞이지 않는다)
+    if isinstance(choices, (list, tuple)):
+        table = ChoiceTable.from_blocks(choices)
+        choices = ("choices", table, _factor_states(choices, table))
+    return choices, basis_hour_value, config, weights, alpha_mode
+
+
+def _factor_states(choices: Sequence[Any], table: ChoiceTable) -> np.ndarray:
+    """행 × 계수(FACTOR_COLUMNS) 상태: 0 없음, 1 숫자(NaN 포함), 2 숫자로 바꿀 수 없는 값."""
+    states = np.zeros((len(choices), len(FACTOR_COLUMNS)), dtype=np.int8)
+    for j, key in enumerate(FACTOR_COLUMNS):
+        if getattr(table, key) is None:  # 이 계수를 가진 choice가 하나도 없다
+            continue
+        for i, c in enumerate(choices):
+            if hasattr(c, key):
+                states[i, j] = 1 if _is_number(getattr(c, key)) else 2
+    return states
+
+
+def _is_number(x: Any) -> bool:
+    try:
+        float(x)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+@cached_result(key=_oc_cache_key)
+def calc_opportunity_cost(
+    choices: List[ChoiceBlock],
+    basis_hour_value: float,
+    config: Optional[OCConfig] = None,
+    weights: Optional[Dict[str, int]] = None,
+    alpha_mode: str = DEFAULT_MODE,
+) -> Tuple[Tuple[str, ...], OCBatchResult]:
+    """
+    calc_opportunity_cost_table의 계산 부분 (pandas 없이 배열로).
+    returns: (choices 순서의 label 목록, 1 × N 배치 결과(읽기 전용 배열))
+    """
+    cfg = resolve_config(config, weights, alpha_mode)
+
+    if isinstance(choices, ChoiceTable):
+        # 열 단위 경로: choice마다 속성을 찾지 않고 범주 코드로 한 번에 펼친다
+        labels = choices.labels
+        hours = _clamp_nonneg_array(choices.hours)
+        alpha, p_conv, mult = _resolve_table_factors(choices, cfg)
+    else:
+        labels = [str(getattr(c, "label", "")) for c in choices]
+        hours = [_clamp_nonneg(getattr(c, "hours", 0.0)) for c in choices]
+        alpha, p_conv, mult = _resolve_choice_factors(choices, labels, cfg)
+
+    result = calc_value_matrix(
+        np.asarray(hours, dtype=float),
+        _clamp_nonneg(basis_hour_value),
+        alpha,
+        p_conv,
+        mult,
+    )
+    return tuple(labels), _freeze_result(result)
+
+
+@timed()
+@cached_result(copy=lambda df: df.copy(), key=_oc_cache_key)
 def calc_opportunity_cost_table(
     choices: List[ChoiceBlock],
     basis_hour_value: float,
     config: Optional[OCConfig] = None,
     weights: Optional[Dict[str, int]] = None,
-    alpha_mode: str = "ratio",
+    alpha_mode: str = DEFAULT_MODE,
 ) -> pd.DataFrame:
     """
     기회비용(가능성 가치) 환산표
@@ -148,80 +479,111 @@ def calc_opportunity_cost_table(
 
     - 활동 자체에 대한 평가/판정은 하지 않는다.
     - '선택으로 전환될 수 있었던 가치'을 숫자로 보여준다.
+    - alpha_mode: weights -> alpha 변환 모드 (기본 neutral_1, src/modes.py)
+    - 계산은 calc_opportunity_cost(배열)에서 하고, 여기서는 표(DataFrame)로만 바꾼다.
+      (표 캐시가 이미 키를 만들었으므로 배열 쪽 캐시는 건너뛴다: 호출마다 해시 한 번, .uncached는 캐시 없이)
     """
-    cfg = config or OCConfig()
+    labels, result = calc_opportunity_cost.uncached(choices, basis_hour_value, config, weights, alpha_mode)
+    return oc_table_from_result(labels, result)
 
-    if weights is not None:
-        alpha_by_label = build_alpha_by_label_from_weights(weights, mode=alpha_mode)
-        cfg = OCConfig(
-            default_alpha=cfg.default_alpha,
-            default_p_conv=cfg.default_p_conv,
-            default_multiplier=cfg.default_multiplier,
-            alpha_by_label=alpha_by_label,
-            p_conv_by_label=cfg.p_conv_by_label,
-            multiplier_by_label=cfg.multiplier_by_label,
-        )
 
-    v0 = _clamp_nonneg(basis_hour_value)
-
-    rows: List[Dict[str, float | str]] = []
-    for c in choices:
-        label = str(getattr(c, "label", ""))
-        h = _clamp_nonneg(getattr(c, "hours", 0.0))
-
-        alpha = _get_choice_factor(
-            c,
-            "alpha",
-            label=label,
-            override=cfg.alpha_by_label,
-            default_value=cfg.default_alpha,
-            clamp_fn=_clamp_nonneg,
-        )
-        p_conv = _get_choice_factor(
-            c,
-            "p_conv",
-            label=label,
-            override=cfg.p_conv_by_label,
-            default_value=cfg.default_p_conv,
-            clamp_fn=_clamp_01,
-        )
-        mult = _get_choice_factor(
-            c,
-            "multiplier",
-            label=label,
-            override=cfg.multiplier_by_label,
-            default_value=cfg.default_multiplier,
-            clamp_fn=_clamp_nonneg,
-        )
-
-        v_effective = v0 * alpha * p_conv * mult
-        oc = h * v_effective
-
-        rows.append(
-            {
-                "선택": label,
-                "시간(시간)": float(h),
-                "기준가치(원/시간)": float(v0),
-                "alpha": float(alpha),
-                "p_conv": float(p_conv),
-                "multiplier": float(mult),
-                "유효가치(원/시간)": float(v_effective),
-                "가치환산(원)": float(oc),
-            }
-        )
-
-    df = pd.DataFrame(rows)
-    if not df.empty:
-        # 수치형 강제
-        num_cols = [
-            "시간(시간)",
-            "기준가치(원/시간)",
-            "alpha",
-            "p_conv",
-            "multiplier",
-            "유효가치(원/시간)",
-            "가치환산(원)",
-        ]
-        for col in num_cols:
-            df[col] = df[col].astype(float)
-    return df
+# -----------------------------
+# 재배분 이득 엔진: "r 범주에서 Δh 빼서 a 범주에 더하기"
+# 가치가 시간에 선형이므로, 표를 다시 만들지 않고 범주별 유효가치로 바로 계산한다.
+# -----------------------------
+@dataclass(frozen=True)
+class ReallocationProfile:
+    """
+    범주별 재배분 계산 재료 (C=범주 수, K=범주당 최대 choice 수)
+    - hours: 범주별 총 시간 (C,)
+    - add_value: 범주에 시간을 더할 때의 유효가치(원/시간) (C,)
+    - seg_hours / seg_value: 범주에서 시간을 뺄 때 깎이는 순서대로의 (시간, 유효가치) (C, K)
+    """
+    categories: Tuple[str, ...]
+    hours: np.ndarray
+    add_value: np.ndarray
+    seg_hours: np.ndarray
+    seg_value: np.ndarray
+
+
+def build_reallocation_profile(
+    categories: Sequence[str],
+    choice_categories: Sequence[str],
+    choice_hours: Sequence[float],
+    choice_v_effective: Sequence[float],
+    fallback_value: Any = 0.0,
+) -> ReallocationProfile:
+    """
+    choice 단위 (범주, 시간, 유효가치)를 범주 단위 프로필로 묶는다.
+    - 더하기: 범주의 첫 번째 choice 유효가치 (없으면 fallback_value)
+    - 빼기: 범주에 속한 choice 순서대로 깎는다 (_reallocate_time_between_categories와 같은 순서)
+    """
+    cats = tuple(str(c) for c in categories)
+    index = {c: i for i, c in enumerate(cats)}
+    n_cat = len(cats)
+
+    segs: List[List[Tuple[float, float]]] = [[] for _ in range(n_cat)]
+    for cat, h, v in zip(choice_categories, choice_hours, choice_v_effective):
+        i = index.get(str(cat))
+        if i is not None:
+            segs[i].append((_clamp_nonneg(h), float(v)))
+
+    k = max((len(sg) for sg in segs), default=0)
+    seg_hours = np.zeros((n_cat, k), dtype=float)
+    seg_value = np.zeros((n_cat, k), dtype=float)
+    add_value = np.array(np.broadcast_to(_as_float_array(fallback_value, 0.0), (n_cat,)), dtype=float)
+    for i, sg in enumerate(segs):
+        if sg:
+            seg_hours[i, : len(sg)] = [h for h, _ in sg]
+            seg_value[i, : len(sg)] = [v for _, v in sg]
+            add_value[i] = sg[0][1]
+
+    return ReallocationProfile(
+        categories=cats,
+        hours=seg_hours.sum(axis=1),
+        add_value=add_value,
+        seg_hours=seg_hours,
+        seg_value=seg_value,
+    )
+
+
+def calc_reallocation_gains(profile: ReallocationProfile, delta_h: Any) -> np.ndarray:
+    """
+    모든 (더할 범주 a, 줄일 범주 r) 조합의 가치 변화량.
+    - delta_h 스칼라: (C, C) 행렬, gains[a, r]
+    - delta_h 배열(N,): (N, C, C) 스윕, gains[n, a, r]
+    - 실제 이동량은 min(Δh, r 범주 시간). a == r이거나 이동량이 0이면 NaN.
+    """
+    d = _clamp_nonneg_array(delta_h)
+    scalar = d.ndim == 0
+    d = np.atleast_1d(d)
+
+    moved = np.minimum(d[:, np.newaxis], profile.hours[np.newaxis, :])  # (N, C)
+    start = np.cumsum(profile.seg_hours, axis=1) - profile.seg_hours  # (C, K)
+    cut = np.clip(moved[:, :, np.newaxis] - start, 0.0, profile.seg_hours)  # (N, C, K)
+    cost = (cut * profile.seg_value).sum(axis=2)  # (N, C)
+
+    gains = moved[:, np.newaxis, :] * profile.add_value[np.newaxis, :, np.newaxis] - cost[:, np.newaxis, :]
+    invalid = (moved <= 0.0)[:, np.newaxis, :] | np.eye(len(profile.categories), dtype=bool)[np.newaxis]
+    gains[invalid] = np.nan
+    return gains[0] if scalar else gains
+
+
+def rank_reallocation_moves(
+    profile: ReallocationProfile,
+    gains: np.ndarray,
+    limit: Optional[int] = None,
+) -> List[Tuple[str, str, float]]:
+    """
+    (C, C) 변화량 행렬 -> (늘릴 범주, 줄일 범주, 변화량) 목록(변화량 내림차순, 동률은 범주 순서)
+    - limit이 있으면 상위 limit개만 정렬한다.
+    """
+    flat = -gains.ravel()
+    idx = np.flatnonzero(~np.isnan(flat))
+    if limit is not None and 0 < limit < len(idx):
+        kth = np.partition(flat[idx], limit - 1)[limit - 1]
+        idx = idx[flat[idx] <= kth]
+    order = idx[np.argsort(flat[idx], kind="stable")][:limit]
+    n = len(profile.categories)
+    cats = profile.categories
+    return [(cats[i // n], cats[i % n], -float(flat[i])) for i in order]
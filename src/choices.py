@@ -0,0 +1,257 @@
+# choices 입력 정리(어댑터)
+# - choices는 ChoiceBlock / ChoiceTable 말고도 dict나 외부 객체로 들어올 수 있다 (label/name/title..., hours/time/h...)
+# - 필드 이름을 고르는 일은 입력 모양(type, dict 키 구성)마다 한 번만 하고 ChoiceAccessor로 캐시
+# - normalize_choices: choices -> ChoiceColumns(라벨 / 범주 / 시간 열). 시뮬레이션 루프는 이 열만 쓴다
+# - with_hours: 시간 열을 바꾼 새 choices (입력 구조 유지: ChoiceTable -> ChoiceTable, 목록 -> 목록)
+# - reallocate_hours: "A 범주에서 Δh 빼서 B 범주에 더하기" (대안 가치 모드)
+from __future__ import annotations
+
+import copy
+import dataclasses
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import FACTOR_COLUMNS, ChoiceBlock, ChoiceTable
+
+LABEL_KEYS: Tuple[str, ...] = ("label", "name", "title", "activity")
+CATEGORY_KEYS: Tuple[str, ...] = ("category", "cat", "type", "kind", "group")
+HOURS_KEYS: Tuple[str, ...] = ("hours", "hour", "time", "duration", "h")
+
+DEFAULT_LABEL = "선택지"
+MAX_ACCESSORS = 1024  # 캐시할 입력 모양 수 (넘으면 비우고 다시 채운다)
+
+
+def _present(value: Any) -> bool:
+    # 예전 _get_field 규칙: None / "" 는 값이 없는 것으로 본다
+    return value is not None and not (isinstance(value, str) and value == "")
+
+
+class ChoiceAccessor:
+    """
+    한 입력 모양에 대해 미리 정해 둔 label / category / hours 읽기·쓰기.
+    - *_keys: 그 모양에 실제로 있는 후보 필드만 (우선순위 순). 값이 None / ""이면 다음 후보로
+    - hours_target: 시간을 쓸 필드 (있는 첫 후보, 없으면 "hours")
+    """
+
+    __slots__ = ("is_mapping", "label_keys", "category_keys", "hours_keys", "hours_target")
+
+    def __init__(self, is_mapping: bool, has: Callable[[str], bool]) -> None:
+        self.is_mapping = is_mapping
+        self.label_keys = tuple(k for k in LABEL_KEYS if has(k))
+        self.category_keys = tuple(k for k in CATEGORY_KEYS if has(k))
+        self.hours_keys = tuple(k for k in HOURS_KEYS if has(k))
+        self.hours_target = self.hours_keys[0] if self.hours_keys else HOURS_KEYS[0]
+
+    def _get(self, choice: Any, keys: Tuple[str, ...], default: Any) -> Any:
+        if self.is_mapping:
+            for k in keys:
+                v = choice.get(k)
+                if _present(v):
+                    return v
+        else:
+            for k in keys:
+                v = getattr(choice, k, None)
+                if _present(v):
+                    return v
+        return default
+
+    def label(self, choice: Any) -> str:
+        return str(self._get(choice, self.label_keys, DEFAULT_LABEL))
+
+    def category(self, choice: Any) -> str:
+        return self.label_and_category(choice)[1]
+
+    def label_and_category(self, choice: Any) -> Tuple[str, str]:
+        # 범주 필드가 없으면 label이 곧 범주
+        label = self.label(choice)
+        cat = self._get(choice, self.category_keys, None)
+        return label, label if cat is None else str(cat)
+
+    def hours(self, choice: Any) -> float:
+        try:
+            return float(self._get(choice, self.hours_keys, 0.0))
+        except (TypeError, ValueError):
+            return 0.0
+
+    def set_hours(self, choice: Any, value: float) -> None:
+        if self.is_mapping:
+            choice[self.hours_target] = float(value)
+        else:
+            setattr(choice, self.hours_target, float(value))
+
+
+_accessors: Dict[Hashable, ChoiceAccessor] = {}
+
+
+def _shape_key(choice: Any) -> Hashable:
+    """같은 키면 같은 필드 구성. dataclass / __slots__ 타입은 타입만으로, dict / 일반 객체는 키 구성까지."""
+    t = type(choice)
+    if t is dict or isinstance(choice, Mapping):
+        return (t, tuple(choice.keys()))
+    if dataclasses.is_dataclass(t) or not hasattr(choice, "__dict__"):
+        return t
+    return (t, tuple(vars(choice)))
+
+
+def accessor_for(choice: Any, key: Hashable = None) -> ChoiceAccessor:
+    """choice 모양에 맞는 접근자 (key: 이미 구한 _shape_key가 있으면 넘겨서 다시 구하지 않는다)."""
+    if key is None:
+        key = _shape_key(choice)
+    acc = _accessors.get(key)
+    if acc is None:
+        if isinstance(choice, Mapping):
+            acc = ChoiceAccessor(True, choice.__contains__)
+        else:
+            acc = ChoiceAccessor(False, lambda k: hasattr(choice, k))
+        if len(_accessors) >= MAX_ACCESSORS:
+            _accessors.clear()
+        _accessors[key] = acc
+    return acc
+
+
+@dataclass(frozen=True)
+class ChoiceColumns:
+    """
+    choices를 정리한 열 (행 순서는 입력과 같음)
+    - items: 원본 choices (with_hours에서 구조를 유지하는 데 씀)
+    - labels / categories: 문자열 목록, hours: float 배열 (정리 전 값, 음수/NaN 그대로)
+    """
+
+    items: Any
+    labels: List[str]
+    categories: List[str]
+    hours: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def clamped_hours(self) -> np.ndarray:
+        """음수 / NaN 시간은 0으로."""
+        return np.where(self.hours > 0.0, self.hours, 0.0)
+
+
+def normalize_choices(choices: Iterable[Any]) -> ChoiceColumns:
+    if isinstance(choices, ChoiceTable):
+        labels = choices.labels
+        return ChoiceColumns(choices, labels, labels, choices.hours)
+
+    items = list(choices)
+    labels: List[str] = []
+    categories: List[str] = []
+    hours = np.empty(len(items))
+    last_type: Optional[type] = None
+    last_key: Hashable = None
+    acc: Optional[ChoiceAccessor] = None
+    for i, c in enumerate(items):
+        # 보통 같은 모양이 이어지므로 캐시 조회는 모양이 바뀔 때만.
+        # 타입만으로 모양이 정해지면(dataclass / __slots__) 모양 계산도 건너뛴다
+        if type(c) is not last_type or last_key is not last_type:
+            key = _shape_key(c)
+            if key != last_key:
+                acc, last_key = accessor_for(c, key), key
+            last_type = type(c)
+        label, cat = acc.label_and_category(c)
+        labels.append(label)
+        categories.append(cat)
+        hours[i] = acc.hours(c)
+    return ChoiceColumns(items, labels, categories, hours)
+
+
+def category_hours(choices: Iterable[Any]) -> Dict[str, float]:
+    """범주별 시간 합계 (음수/NaN 시간은 0, 처음 나온 순서)."""
+    if isinstance(choices, ChoiceTable):
+        return choices.category_hours()
+    cols = choices if isinstance(choices, ChoiceColumns) else normalize_choices(choices)
+    out: Dict[str, float] = {}
+    for cat, h in zip(cols.categories, cols.clamped_hours().tolist()):
+        out[cat] = out.get(cat, 0.0) + h
+    return out
+
+
+def with_hours(
+    cols: ChoiceColumns,
+    hours: np.ndarray,
+    changed: np.ndarray,
+    append: Sequence[Tuple[str, float]] = (),
+) -> Any:
+    """
+    cols.items의 시간을 hours로 바꾼 새 choices. (원본은 그대로)
+    - changed: 바꿀 행 (bool 배열). 목록 입력이면 그 행만 복사해서 고치고 나머지는 원본 객체를 그대로 담는다
+    - append: 뒤에 붙일 (범주, 시간). ChoiceTable / ChoiceBlock 목록이면 ChoiceBlock(범주, 시간),
+              dict 목록이면 {"category", "label", "hours"} dict로 붙인다
+    """
+    items = cols.items
+    if isinstance(items, ChoiceTable):
+        # 열 배열을 그대로 이어 붙인다 (행마다 label을 다시 코드로 바꾸지 않음)
+        index = {c: i for i, c in enumerate(items.categories)}
+        extra_codes = [index.setdefault(str(cat), len(index)) for cat, _ in append]
+        codes = np.concatenate([items.codes, np.asarray(extra_codes, dtype=np.int32)])
+        new_hours = np.concatenate([np.where(changed, hours, items.hours), [float(h) for _, h in append]])
+        factors = {}
+        for key in FACTOR_COLUMNS:
+            col = getattr(items, key)
+            if col is not None:
+                factors[key] = np.concatenate([col, np.full(len(append), np.nan)])
+        return ChoiceTable(tuple(index), codes, new_hours, **factors)
+
+    out = list(items)
+    for i in np.flatnonzero(changed).tolist():
+        c = dict(out[i]) if isinstance(out[i], dict) else copy.copy(out[i])
+        accessor_for(c).set_hours(c, float(hours[i]))
+        out[i] = c
+    as_dict = bool(out) and isinstance(out[0], Mapping)
+    for cat, h in append:
+        if as_dict:
+            out.append({"category": cat, "label": f"{cat} (대안 추가)", "hours": float(h)})
+        else:
+            out.append(ChoiceBlock(cat, float(h)))
+    return out
+
+
+def reallocate_hours(
+    choices: Iterable[Any],
+    reduce_from_cat: str,
+    add_to_cat: str,
+    delta_h: float,
+) -> Tuple[Any, float]:
+    """
+    returns: (new_choices, moved_hours)
+    - reduce_from_cat에 속한 choice들의 시간을 합쳐서 delta_h만큼 줄이고
+      add_to_cat에 속한 choice(들) 중 첫 번째에 delta_h만큼 더함(없으면 새 choice 생성)
+    - 입력이 ChoiceTable이면 ChoiceTable로, 목록이면 목록으로 돌려준다 (바뀐 choice만 복사)
+    - reduce_from_cat 안에서는 앞 choice부터 순서대로 깎는다
+    """
+    cols = normalize_choices(choices)
+    no_change = np.zeros(len(cols), dtype=bool)
+    delta_h = max(0.0, float(delta_h))
+    if delta_h <= 0:
+        return with_hours(cols, cols.hours, no_change), 0.0
+
+    # 1) reduce_from_cat에서 뺄 수 있는 시간 계산
+    categories = np.asarray(cols.categories, dtype=object)
+    h = cols.clamped_hours()
+    reduce_mask = categories == reduce_from_cat
+    moved = min(delta_h, float(h[reduce_mask].sum()))
+    if moved <= 0:
+        # 뺄 시간이 없다면 그대로
+        return with_hours(cols, cols.hours, no_change), 0.0
+
+    # 2) reduce_from_cat의 choices에서 앞에서부터 순서대로 차감
+    #    (앞 choice들이 이미 깎은 양(before)이 moved에 못 미친 choice까지 손댄다)
+    reduce_h = np.where(reduce_mask, h, 0.0)
+    before = np.cumsum(reduce_h) - reduce_h
+    touched = reduce_mask & (before < moved)
+    cut = np.clip(moved - before, 0.0, reduce_h)
+    new_hours = np.where(touched, h - cut, cols.hours)
+
+    # 3) add_to_cat에 시간 추가: 해당 범주 choice가 있으면 첫번째에 더하고, 없으면 새로 만든다
+    add_idx = np.flatnonzero(categories == add_to_cat)
+    if len(add_idx):
+        i = int(add_idx[0])
+        new_hours[i] = max(0.0, float(new_hours[i])) + moved
+        touched[i] = True
+        return with_hours(cols, new_hours, touched), moved
+    return with_hours(cols, new_hours, touched, append=[(add_to_cat, moved)]), moved
@@ -0,0 +1,375 @@
+# 일별 기록 저장소(SQLite)
+# - (user_id, day) 단위로 basics / choices / weights / basis_hour_value 스냅샷을 저장
+# - 쓰기는 백그라운드 스레드가 모아서(batch) 한 트랜잭션으로 처리 -> 저장이 rerun을 막지 않는다
+# - WAL 모드라 쓰는 중에도 읽기(불러오기)가 막히지 않는다
+from __future__ import annotations
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field, fields
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .models import AppState, ChoiceBlock, TimeBasics
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data" / "history.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS day_snapshot (
+    user_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    basics TEXT NOT NULL,
+    weights TEXT NOT NULL,
+    basis_hour_value REAL NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (user_id, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS day_choice (
+    user_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    hours REAL NOT NULL,
+    PRIMARY KEY (user_id, day, seq)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_day_choice_label ON day_choice (user_id, label, day);
+"""
+
+DayLike = Union[date, str]
+
+
+@dataclass
+class DaySnapshot:
+    user_id: str
+    day: date
+    basics: TimeBasics = field(default_factory=TimeBasics)
+    choices: List[ChoiceBlock] = field(default_factory=list)
+    weights: Dict[str, int] = field(default_factory=dict)
+    basis_hour_value: float = 0.0
+
+
+def snapshot_from_state(s: AppState, day: Optional[date] = None, user_id: Optional[str] = None) -> DaySnapshot:
+    """현재 AppState를 하루 스냅샷으로 복사 (이후 state가 바뀌어도 영향 없음)."""
+    return DaySnapshot(
+        user_id=str(user_id if user_id is not None else s.persona_name),
+        day=day or date.today(),
+        basics=TimeBasics(**asdict(s.basics)),
+        choices=[ChoiceBlock(str(c.label), float(c.hours)) for c in (s.choices or [])],
+        weights={str(k): int(v) for k, v in (s.weights or {}).items()},
+        basis_hour_value=float(s.basis_hour_value),
+    )
+
+
+def _day_key(d: DayLike) -> str:
+    return d.isoformat() if isinstance(d, date) else date.fromisoformat(str(d)).isoformat()
+
+
+_BASICS_FIELDS = frozenset(f.name for f in fields(TimeBasics))
+
+
+def _basics_from_json(text: str) -> TimeBasics:
+    # 저장 당시와 TimeBasics 필드가 달라져도 아는 필드만 읽는다
+    raw = json.loads(text)
+    return TimeBasics(**{k: v for k, v in raw.items() if k in _BASICS_FIELDS})
+
+
+class HistoryStore:
+    """
+    일별 기록 저장소.
+    - save_day / save_days: 큐에 넣고 바로 반환 (백그라운드 스레드가 batch_size개씩 묶어서 기록)
+    - flush: 큐에 쌓인 기록이 모두 쓰일 때까지 대기
+    - load_range / category_hours: (user_id, day) 기본키와 (user_id, label, day) 인덱스를 타는 조회
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_DB_PATH,
+        *,
+        batch_size: int = 256,
+        flush_interval: float = 0.2,
+    ) -> None:
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+
+        self._local = threading.local()
+        self._queue: "queue.Queue[Optional[DaySnapshot]]" = queue.Queue()
+        self._closed = False
+        self._error: Optional[Exception] = None
+
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    # -----------------------------
+    # 연결
+    # -----------------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드마다 따로 (Streamlit 세션은 서로 다른 스레드에서 돈다)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    # -----------------------------
+    # 쓰기
+    # -----------------------------
+    def save_day(self, snap: DaySnapshot) -> None:
+        if self._closed:
+            raise RuntimeError("닫힌 HistoryStore에는 저장할 수 없습니다.")
+        _day_key(snap.day)  # 잘못된 날짜는 쓰기 스레드가 아니라 여기(호출한 쪽)에서 오류
+        self._queue.put(snap)
+
+    def save_days(self, snaps: Iterable[DaySnapshot]) -> None:
+        for snap in snaps:
+            self.save_day(snap)
+
+    def flush(self) -> None:
+        """큐에 쌓인 기록이 모두 쓰일 때까지 대기. 기록 중 오류가 있었다면 여기서 다시 던진다."""
+        self._queue.join()
+        err, self._error = self._error, None
+        if err is not None:
+            raise err
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            # flush_interval 동안 들어오는 기록을 batch_size개까지 묶는다 (None = 종료 신호)
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            snaps = [b for b in batch if b is not None]
+            try:
+                if snaps:
+                    self._write_batch_safe(conn, snaps)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    def _write_batch_safe(self, conn: sqlite3.Connection, snaps: List[DaySnapshot]) -> None:
+        # 어떤 오류든 쓰기 스레드는 살아 있어야 한다 (죽으면 이후 flush()가 영원히 기다린다)
+        # batch가 실패하면 하나씩 다시 써서 멀쩡한 기록은 살리고, 첫 오류는 flush()에서 다시 던진다
+        try:
+            self._write_batch(conn, snaps)
+            return
+        except Exception as e:
+            if len(snaps) == 1:
+                self._keep_error(e)
+                return
+        for snap in snaps:
+            try:
+                self._write_batch(conn, [snap])
+            except Exception as e:
+                self._keep_error(e)
+
+    def _keep_error(self, e: Exception) -> None:
+        if self._error is None:
+            self._error = e
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection, batch: List[DaySnapshot]) -> None:
+        now = time.time()
+        snap_rows = []
+        choice_rows = []
+        # 같은 날을 한 batch에서 여러 번 저장하면 마지막 것만 남긴다
+        latest = {(snap.user_id, _day_key(snap.day)): snap for snap in batch}
+        keys = list(latest.keys())
+        for (_, day), snap in latest.items():
+            snap_rows.append(
+                (
+                    snap.user_id,
+                    day,
+                    json.dumps(asdict(snap.basics)),
+                    json.dumps(snap.weights, ensure_ascii=False),
+                    float(snap.basis_hour_value),
+                    now,
+                )
+            )
+            choice_rows.extend(
+                (snap.user_id, day, seq, str(c.label), float(c.hours)) for seq, c in enumerate(snap.choices)
+            )
+        with conn:
+            conn.executemany("DELETE FROM day_choice WHERE user_id = ? AND day = ?", keys)
+            conn.executemany("INSERT OR REPLACE INTO day_snapshot VALUES (?, ?, ?, ?, ?, ?)", snap_rows)
+            conn.executemany("INSERT INTO day_choice VALUES (?, ?, ?, ?, ?)", choice_rows)
+
+    # -----------------------------
+    # 읽기
+    # -----------------------------
+    def load_range(self, user_id: str, start: DayLike, end: DayLike) -> List[DaySnapshot]:
+        """start ~ end(포함) 기간의 스냅샷 (날짜 오름차순)."""
+        conn = self._reader()
+        args = (user_id, _day_key(start), _day_key(end))
+        snaps: Dict[str, DaySnapshot] = {}
+        for day, basics, weights, basis in conn.execute(
+            "SELECT day, basics, weights, basis_hour_value FROM day_snapshot "
+            "WHERE user_id = ? AND day BETWEEN ? AND ? ORDER BY day",
+            args,
+        ):
+            snaps[day] = DaySnapshot(
+                user_id=user_id,
+                day=date.fromisoformat(day),
+                basics=_basics_from_json(basics),
+                weights=json.loads(weights),
+                basis_hour_value=float(basis),
+            )
+        for day, label, hours in conn.execute(
+            "SELECT day, label, hours FROM day_choice "
+            "WHERE user_id = ? AND day BETWEEN ? AND ? ORDER BY day, seq",
+            args,
+        ):
+            snap = snaps.get(day)
+            if snap is not None:
+                snap.choices.append(ChoiceBlock(label, float(hours)))
+        return list(snaps.values())
+
+    def load_day(self, user_id: str, day: DayLike) -> Optional[DaySnapshot]:
+        found = self.load_range(user_id, day, day)
+        return found[0] if found else None
+
+    def days(self, user_id: str) -> List[date]:
+        conn = self._reader()
+        rows = conn.execute("SELECT day FROM day_snapshot WHERE user_id = ? ORDER BY day", (user_id,))
+        return [date.fromisoformat(d) for (d,) in rows]
+
+    def saved_since(self, user_id: str, since: float = 0.0) -> List[Tuple[date, float]]:
+        """since(time.time()) 이후에 저장(덮어쓰기 포함)된 날짜와 저장 시각 (날짜 오름차순)."""
+        conn = self._reader()
+        rows = conn.execute(
+            "SELECT day, saved_at FROM day_snapshot WHERE user_id = ? AND saved_at > ? ORDER BY day",
+            (user_id, float(since)),
+        )
+        return [(date.fromisoformat(d), float(t)) for d, t in rows]
+
+    def count_days(self, user_id: Optional[str] = None, start: Optional[DayLike] = None, end: Optional[DayLike] = None) -> int:
+        conn = self._reader()
+        where, args = self._range_filter(user_id, start, end)
+        (n,) = conn.execute(f"SELECT COUNT(*) FROM day_snapshot WHERE {where}", args).fetchone()
+        return int(n)
+
+    def labels(self, user_id: Optional[str] = None) -> List[str]:
+        """기록에 나온 범주 이름 전체 (choices의 label + weights의 키, 정렬)."""
+        conn = self._reader()
+        where, args = self._range_filter(user_id, None, None)
+        rows = conn.execute(
+            f"SELECT label FROM day_choice WHERE {where} "
+            f"UNION SELECT j.key FROM day_snapshot, json_each(day_snapshot.weights) AS j WHERE {where} "
+            "ORDER BY 1",
+            args + args,
+        )
+        return [str(label) for (label,) in rows]
+
+    def iter_days(
+        self,
+        user_id: Optional[str] = None,
+        start: Optional[DayLike] = None,
+        end: Optional[DayLike] = None,
+        *,
+        page_size: int = 500,
+    ) -> Iterator[DaySnapshot]:
+        """
+        (user_id, day) 순서로 스냅샷을 하나씩. (user_id=None이면 전체 사용자)
+        page_size일씩 기본키 범위로 끊어 읽으므로 기록 기간과 무관하게 메모리가 일정하다.
+        """
+        conn = self._reader()
+        where, args = self._range_filter(user_id, start, end)
+        page_size = max(1, int(page_size))
+        after: Tuple[str, str] = ("", "")
+        while True:
+            rows = conn.execute(
+                "SELECT user_id, day, basics, weights, basis_hour_value FROM day_snapshot "
+                f"WHERE {where} AND (user_id, day) > (?, ?) ORDER BY user_id, day LIMIT ?",
+                args + [after[0], after[1], page_size],
+            ).fetchall()
+            if not rows:
+                return
+            snaps: Dict[Tuple[str, str], DaySnapshot] = {}
+            for uid, day, basics, weights, basis in rows:
+                snaps[(uid, day)] = DaySnapshot(
+                    user_id=uid,
+                    day=date.fromisoformat(day),
+                    basics=_basics_from_json(basics),
+                    weights=json.loads(weights),
+                    basis_hour_value=float(basis),
+                )
+            first, last = rows[0][:2], rows[-1][:2]
+            for uid, day, label, hours in conn.execute(
+                "SELECT user_id, day, label, hours FROM day_choice "
+                "WHERE (user_id, day) BETWEEN (?, ?) AND (?, ?) ORDER BY user_id, day, seq",
+                (first[0], first[1], last[0], last[1]),
+            ):
+                snap = snaps.get((uid, day))
+                if snap is not None:
+                    snap.choices.append(ChoiceBlock(label, float(hours)))
+            yield from snaps.values()
+            after = last
+
+    @staticmethod
+    def _range_filter(user_id: Optional[str], start: Optional[DayLike], end: Optional[DayLike]) -> Tuple[str, List[object]]:
+        where = ["day BETWEEN ? AND ?"]
+        args: List[object] = [_day_key(start or date.min), _day_key(end or date.max)]
+        if user_id is not None:
+            where.insert(0, "user_id = ?")
+            args.insert(0, user_id)
+        return " AND ".join(where), args
+
+    def category_hours(
+        self,
+        user_id: str,
+        label: str,
+        start: Optional[DayLike] = None,
+        end: Optional[DayLike] = None,
+    ) -> List[Tuple[date, float]]:
+        """한 범주(label)의 날짜별 시간 합계."""
+        conn = self._reader()
+        rows = conn.execute(
+            "SELECT day, SUM(hours) FROM day_choice "
+            "WHERE user_id = ? AND label = ? AND day BETWEEN ? AND ? GROUP BY day ORDER BY day",
+            (user_id, label, _day_key(start or date.min), _day_key(end or date.max)),
+        )
+        return [(date.fromisoformat(d), float(h)) for d, h in rows]
+
+
+_default_store: Optional[HistoryStore] = None
+_default_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore:
+    """프로세스 공용 저장소 (data/history.sqlite3)."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = HistoryStore()
+        return _default_store
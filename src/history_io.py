@@ -0,0 +1,340 @@
+# 일별 기록 내보내기 / 가져오기 (JSONL / CSV, 스트리밍)
+#
+#   python -m src.history_io export -o history.jsonl [--user 노아]
+#   python -m src.history_io import history.csv [--user 노아]
+#
+# - JSONL: 한 줄 = 하루 {"user_id", "day", "basics", "choices": [{"label", "hours"}], "weights", "basis_hour_value"}
+# - CSV: 한 행 = 하루, src.batch 입력과 같은 열(TimeBasics 필드, basis_hour_value, "hours:<범주>", "weight:<범주>")
+#   + user_id, day 열 (같은 범주의 choice는 시간 합계로 합쳐진다)
+#   -> 내보낸 파일을 그대로 `python -m src.batch`로 채점할 수 있다
+# - 내보내기는 저장소에서 페이지 단위로 읽어 바로 쓰고, 가져오기는 한 줄씩 검증해서 chunk 단위로 저장한다
+#   (파일 크기와 무관하게 메모리가 일정)
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import math
+import sys
+from dataclasses import asdict, dataclass, field, fields
+from datetime import date
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from .history import DaySnapshot, HistoryStore, get_history_store
+from .models import ChoiceBlock, TimeBasics
+
+FORMATS = ("jsonl", "csv")
+HOURS_PREFIX = "hours:"
+WEIGHT_PREFIX = "weight:"
+MAX_ERRORS = 50  # 보고서에 남길 오류 줄 수 (그 이상은 개수만 센다)
+
+_BASICS_FIELDS = tuple(f.name for f in fields(TimeBasics))
+
+Progress = Callable[[int, int], None]  # (처리한 양, 전체 양)
+
+
+# -----------------------------
+# 스냅샷 <-> 레코드
+# -----------------------------
+def snapshot_to_json(snap: DaySnapshot) -> Dict[str, Any]:
+    return {
+        "user_id": snap.user_id,
+        "day": snap.day.isoformat(),
+        "basics": asdict(snap.basics),
+        "choices": [{"label": c.label, "hours": c.hours} for c in snap.choices],
+        "weights": snap.weights,
+        "basis_hour_value": snap.basis_hour_value,
+    }
+
+
+def csv_header(labels: Sequence[str]) -> List[str]:
+    return (
+        ["user_id", "day", *_BASICS_FIELDS, "basis_hour_value"]
+        + [HOURS_PREFIX + lb for lb in labels]
+        + [WEIGHT_PREFIX + lb for lb in labels]
+    )
+
+
+def snapshot_to_csv_row(snap: DaySnapshot) -> Dict[str, Any]:
+    row: Dict[str, Any] = {"user_id": snap.user_id, "day": snap.day.isoformat(), **asdict(snap.basics)}
+    row["basis_hour_value"] = snap.basis_hour_value
+    for c in snap.choices:
+        key = HOURS_PREFIX + c.label
+        row[key] = row.get(key, 0.0) + c.hours
+    for label, w in snap.weights.items():
+        row[WEIGHT_PREFIX + label] = w
+    return row
+
+
+def _number(value: Any, what: str, *, lo: float = 0.0, hi: float = math.inf) -> float:
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{what}: 숫자가 아닙니다 ({value!r})") from None
+    if math.isnan(v) or not lo <= v <= hi:
+        raise ValueError(f"{what}: {lo:g} ~ {hi:g} 범위를 벗어났습니다 ({value!r})")
+    return v
+
+
+def _day(value: Any) -> date:
+    try:
+        return date.fromisoformat(str(value).strip())
+    except ValueError:
+        raise ValueError(f"day: YYYY-MM-DD 형식이 아닙니다 ({value!r})") from None
+
+
+def _basics(raw: Dict[str, Any]) -> TimeBasics:
+    vals = {k: _number(raw[k], k, hi=24.0) for k in _BASICS_FIELDS if raw.get(k) not in (None, "")}
+    return TimeBasics(**vals)
+
+
+def _weights(raw: Dict[str, Any]) -> Dict[str, int]:
+    return {str(k): int(_number(v, f"weight:{k}", hi=100.0)) for k, v in raw.items()}
+
+
+def snapshot_from_json(obj: Any, default_user: str) -> DaySnapshot:
+    """JSONL 한 줄(dict) -> DaySnapshot. 잘못된 값이면 ValueError."""
+    if not isinstance(obj, dict):
+        raise ValueError("JSON 객체가 아닙니다.")
+    if "day" not in obj:
+        raise ValueError("day가 없습니다.")
+    choices = []
+    for i, c in enumerate(obj.get("choices") or []):
+        if not isinstance(c, dict) or not str(c.get("label", "")).strip():
+            raise ValueError(f"choices[{i}]: label이 없습니다.")
+        choices.append(ChoiceBlock(str(c["label"]), _number(c.get("hours", 0.0), f"choices[{i}].hours", hi=24.0)))
+    basics = obj.get("basics") or {}
+    weights = obj.get("weights") or {}
+    if not isinstance(basics, dict) or not isinstance(weights, dict):
+        raise ValueError("basics / weights는 객체여야 합니다.")
+    return DaySnapshot(
+        user_id=str(obj.get("user_id") or default_user),
+        day=_day(obj["day"]),
+        basics=_basics(basics),
+        choices=choices,
+        weights=_weights(weights),
+        basis_hour_value=_number(obj.get("basis_hour_value", 0.0), "basis_hour_value"),
+    )
+
+
+def snapshot_from_csv_row(row: Dict[str, Any], default_user: str) -> DaySnapshot:
+    """CSV 한 행 -> DaySnapshot. (빈 칸인 hours / weight 열은 없는 것으로 본다)"""
+    if not row.get("day"):
+        raise ValueError("day가 없습니다.")
+    choices = []
+    weights: Dict[str, Any] = {}
+    for k, v in row.items():
+        if k is None or v in (None, ""):
+            continue
+        if k.startswith(HOURS_PREFIX):
+            choices.append(ChoiceBlock(k[len(HOURS_PREFIX):], _number(v, k, hi=24.0)))
+        elif k.startswith(WEIGHT_PREFIX):
+            weights[k[len(WEIGHT_PREFIX):]] = v
+    basis = row.get("basis_hour_value")
+    return DaySnapshot(
+        user_id=str(row.get("user_id") or default_user),
+        day=_day(row["day"]),
+        basics=_basics(row),
+        choices=choices,
+        weights=_weights(weights),
+        basis_hour_value=_number(basis, "basis_hour_value") if basis not in (None, "") else 0.0,
+    )
+
+
+# -----------------------------
+# 내보내기
+# -----------------------------
+def iter_export(
+    store: HistoryStore,
+    fmt: str,
+    *,
+    user_id: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> Iterator[str]:
+    """내보낼 파일 내용을 한 줄(행)씩 문자열로. (CSV는 첫 줄이 머리글)"""
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    snaps = store.iter_days(user_id, start, end)
+    if fmt == "jsonl":
+        for snap in snaps:
+            yield json.dumps(snapshot_to_json(snap), ensure_ascii=False) + "\n"
+        return
+
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=csv_header(store.labels(user_id)), lineterminator="\n")
+
+    def _flush() -> str:
+        text = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        return text
+
+    writer.writeheader()
+    yield _flush()
+    for snap in snaps:
+        writer.writerow(snapshot_to_csv_row(snap))
+        yield _flush()
+
+
+def export_history(
+    store: HistoryStore,
+    fp: TextIO,
+    fmt: str,
+    *,
+    user_id: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    progress: Optional[Progress] = None,
+    every: int = 1000,
+) -> int:
+    """fp에 내보내기. returns: 내보낸 일수. progress(일수, 전체 일수)는 every일마다 호출."""
+    total = store.count_days(user_id, start, end)
+    n = -1 if fmt == "csv" else 0  # CSV 첫 줄은 머리글
+    for line in iter_export(store, fmt, user_id=user_id, start=start, end=end):
+        fp.write(line)
+        n += 1
+        if progress is not None and n > 0 and n % every == 0:
+            progress(n, total)
+    n = max(0, n)
+    if progress is not None:
+        progress(n, total)
+    return n
+
+
+# -----------------------------
+# 가져오기
+# -----------------------------
+@dataclass
+class ImportReport:
+    imported: int = 0
+    failed: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)  # (줄 번호, 사유), 최대 MAX_ERRORS개
+
+    def add_error(self, line_no: int, reason: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((line_no, reason))
+
+
+def _iter_parsed(fp: TextIO, fmt: str, default_user: str) -> Iterator[Tuple[int, Optional[DaySnapshot], str]]:
+    """(줄 번호, 스냅샷 또는 None, 오류 사유)"""
+    if fmt == "csv":
+        reader = csv.DictReader(fp)
+        if reader.fieldnames is None or "day" not in reader.fieldnames:
+            yield 1, None, "CSV 머리글에 day 열이 없습니다."
+            return
+        for row in reader:
+            try:
+                yield reader.line_num, snapshot_from_csv_row(row, default_user), ""
+            except ValueError as e:
+                yield reader.line_num, None, str(e)
+        return
+
+    for line_no, line in enumerate(fp, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, snapshot_from_json(json.loads(line), default_user), ""
+        except json.JSONDecodeError as e:
+            yield line_no, None, f"JSON 형식 오류: {e.msg}"
+        except ValueError as e:
+            yield line_no, None, str(e)
+
+
+def import_history(
+    store: HistoryStore,
+    fp: TextIO,
+    fmt: str,
+    *,
+    default_user: str,
+    force_user: bool = False,
+    chunk_size: int = 1000,
+    progress: Optional[Callable[[int], None]] = None,
+) -> ImportReport:
+    """
+    fp에서 한 줄씩 읽어 검증하고 chunk_size일씩 저장한다. 잘못된 줄은 건너뛰고 보고서에 남긴다.
+    - default_user: user_id가 없는 줄에 쓸 사용자, force_user=True면 모든 줄을 이 사용자로
+    - progress(처리한 줄 수): chunk마다 호출 (호출하는 쪽에서 읽은 바이트 수 등으로 진행률 계산)
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    report = ImportReport()
+    pending = 0
+    lines = 0
+    for line_no, snap, reason in _iter_parsed(fp, fmt, default_user):
+        lines = line_no
+        if snap is None:
+            report.add_error(line_no, reason)
+            continue
+        if force_user:
+            snap.user_id = default_user
+        store.save_day(snap)
+        report.imported += 1
+        pending += 1
+        if pending >= chunk_size:
+            store.flush()  # 쓰기 큐가 입력 속도만큼 쌓이지 않도록 chunk마다 기다린다
+            pending = 0
+            if progress is not None:
+                progress(lines)
+    store.flush()
+    if progress is not None:
+        progress(lines)
+    return report
+
+
+def detect_format(name: str) -> str:
+    return "csv" if name.lower().endswith(".csv") else "jsonl"
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.history_io", description="일별 기록 내보내기 / 가져오기")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    ex = sub.add_parser("export", help="기록을 JSONL/CSV로 내보내기")
+    ex.add_argument("-o", "--output", default="-", help="출력 경로 (기본: 표준출력)")
+    ex.add_argument("--format", choices=FORMATS, help="형식 (기본: 확장자로 추정)")
+    ex.add_argument("--user", help="이 사용자만 (기본: 전체)")
+    ex.add_argument("--start", type=date.fromisoformat, help="시작일 YYYY-MM-DD")
+    ex.add_argument("--end", type=date.fromisoformat, help="종료일 YYYY-MM-DD")
+
+    im = sub.add_parser("import", help="JSONL/CSV 기록 가져오기")
+    im.add_argument("input", help="입력 경로 (- 이면 표준입력)")
+    im.add_argument("--format", choices=FORMATS, help="형식 (기본: 확장자로 추정)")
+    im.add_argument("--user", default="노아", help="user_id가 없는 줄에 쓸 사용자")
+    im.add_argument("--force-user", action="store_true", help="모든 줄을 --user 사용자로 가져오기")
+
+    args = parser.parse_args(argv)
+    store = get_history_store()
+
+    if args.cmd == "export":
+        fmt = args.format or detect_format(args.output)
+        out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+        try:
+            n = export_history(store, out, fmt, user_id=args.user, start=args.start, end=args.end)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        print(f"{n}일 내보냄", file=sys.stderr)
+        return 0
+
+    fmt = args.format or detect_format(args.input)
+    inp = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8-sig", newline="")
+    try:
+        report = import_history(store, inp, fmt, default_user=args.user, force_user=args.force_user)
+    finally:
+        if inp is not sys.stdin:
+            inp.close()
+    store.close()
+    print(f"{report.imported}일 가져옴, {report.failed}줄 실패", file=sys.stderr)
+    for line_no, reason in report.errors:
+        print(f"  {line_no}행: {reason}", file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,222 @@
+# 계측(instrumentation): 타이머 / 카운터
+# - @timed("이름")으로 함수 실행 시간을, incr("이름")으로 횟수를 모은다
+# - 집계는 프로세스 전체 + 세션별 두 가지 (count / p50 / p95 / max)
+# - 꺼져 있으면(기본) 전역 플래그 하나만 확인하고 바로 원래 함수를 호출한다
+#   켜기: 환경변수 NOAATS_INSTRUMENT=1 또는 enable() (디버그 패널의 토글)
+# - dump_jsonl(...)로 집계를 JSON lines 파일에 덧붙여 저장
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, TypeVar, Union
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+INSTRUMENT_ENV = "NOAATS_INSTRUMENT"
+DEFAULT_DUMP_PATH = Path(__file__).resolve().parent.parent / "data" / "instrument.jsonl"
+
+PROCESS = "process"
+WINDOW = 2048  # 분위수는 최근 WINDOW개 측정값으로 계산 (메모리 일정)
+MAX_SESSIONS = 256  # 세션별 집계는 최근 세션만 유지
+
+_enabled = os.environ.get(INSTRUMENT_ENV, "").strip().lower() in ("1", "true", "yes")
+_session: ContextVar[Optional[str]] = ContextVar("instrument_session", default=None)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable(on: bool = True) -> None:
+    global _enabled
+    _enabled = bool(on)
+
+
+def disable() -> None:
+    enable(False)
+
+
+@dataclass(frozen=True)
+class MetricStats:
+    name: str
+    kind: str  # "timer" | "counter"
+    count: int
+    total_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+class _Metric:
+    __slots__ = ("kind", "count", "total", "max", "samples")
+
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: Deque[float] = deque(maxlen=WINDOW)
+
+    def add(self, ms: float, n: int = 1) -> None:
+        if self.kind == "counter":
+            self.count += n
+            return
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+        self.samples.append(ms)
+
+    def stats(self, name: str) -> MetricStats:
+        s = sorted(self.samples)
+        return MetricStats(
+            name=name,
+            kind=self.kind,
+            count=self.count,
+            total_ms=self.total,
+            p50_ms=_percentile(s, 0.50),
+            p95_ms=_percentile(s, 0.95),
+            max_ms=self.max,
+        )
+
+
+def _percentile(sorted_vals: List[float], q: float) -> float:
+    # nearest-rank
+    if not sorted_vals:
+        return 0.0
+    k = min(len(sorted_vals) - 1, max(0, int(q * len(sorted_vals) + 0.5) - 1))
+    return sorted_vals[k]
+
+
+class _Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._process: Dict[str, _Metric] = {}
+        self._sessions: "OrderedDict[str, Dict[str, _Metric]]" = OrderedDict()
+
+    def record(self, name: str, kind: str, ms: float, n: int = 1) -> None:
+        sid = _session.get()
+        with self._lock:
+            self._metric(self._process, name, kind).add(ms, n)
+            if sid is not None:
+                metrics = self._sessions.get(sid)
+                if metrics is None:
+                    metrics = self._sessions[sid] = {}
+                    while len(self._sessions) > MAX_SESSIONS:
+                        self._sessions.popitem(last=False)
+                else:
+                    self._sessions.move_to_end(sid)
+                self._metric(metrics, name, kind).add(ms, n)
+
+    @staticmethod
+    def _metric(metrics: Dict[str, _Metric], name: str, kind: str) -> _Metric:
+        m = metrics.get(name)
+        if m is None:
+            m = metrics[name] = _Metric(kind)
+        return m
+
+    def stats(self, session: Optional[str] = None) -> List[MetricStats]:
+        with self._lock:
+            metrics = self._process if session is None else self._sessions.get(session, {})
+            return [m.stats(name) for name, m in sorted(metrics.items())]
+
+    def sessions(self) -> List[str]:
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def reset(self) -> None:
+        with self._lock:
+            self._process.clear()
+            self._sessions.clear()
+
+
+_registry = _Registry()
+
+
+# -----------------------------
+# 측정 API
+# -----------------------------
+def bind_session(session_id: Optional[str]) -> None:
+    """현재 실행 흐름(스레드/컨텍스트)의 측정값을 session_id 세션에도 집계."""
+    _session.set(session_id)
+
+
+def incr(name: str, n: int = 1) -> None:
+    if not _enabled:
+        return
+    _registry.record(name, "counter", 0.0, int(n))
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    if not _enabled:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _registry.record(name, "timer", (time.perf_counter() - t0) * 1000.0)
+
+
+def timed(name: Optional[str] = None) -> Callable[[F], F]:
+    """함수 실행 시간 측정 데코레이터. (name 기본값: 모듈.함수)"""
+
+    def deco(fn: F) -> F:
+        metric = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _registry.record(metric, "timer", (time.perf_counter() - t0) * 1000.0)
+
+        return wrapper  # type: ignore[return-value]
+
+    return deco
+
+
+# -----------------------------
+# 조회 / 저장
+# -----------------------------
+def process_stats() -> List[MetricStats]:
+    return _registry.stats(None)
+
+
+def session_stats(session_id: str) -> List[MetricStats]:
+    return _registry.stats(session_id)
+
+
+def reset_stats() -> None:
+    _registry.reset()
+
+
+def dump_jsonl(path: Union[str, Path] = DEFAULT_DUMP_PATH, *, include_sessions: bool = True) -> int:
+    """현재 집계를 JSON lines로 덧붙여 저장. returns: 쓴 줄 수"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ts = time.time()
+    scopes = [(PROCESS, None)]
+    if include_sessions:
+        scopes += [("session", sid) for sid in _registry.sessions()]
+
+    n = 0
+    with path.open("a", encoding="utf-8") as f:
+        for scope, sid in scopes:
+            for st in _registry.stats(sid):
+                row = {"ts": ts, "scope": scope, "session": sid, **asdict(st)}
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                n += 1
+    return n
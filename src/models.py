@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Dict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 
 @dataclass
@@ -21,6 +23,183 @@ class ChoiceBlock:
     hours: float
 
 
+FACTOR_COLUMNS: Tuple[str, ...] = ("alpha", "p_conv", "multiplier")
+
+
+class ChoiceTable:
+    """
+    choices를 열(column) 단위로 담는 컨테이너 (ChoiceBlock 리스트 대신, 15분 단위 기록처럼 행이 많을 때)
+    - categories: 범주 이름 (코드 -> 이름), codes: 행별 범주 코드 (int32), hours: 행별 시간 (float64)
+    - alpha / p_conv / multiplier: 선택 계수 열 (없으면 None, NaN인 행은 '지정 안 함')
+    - for c in table: ChoiceBlock으로 순회 (지정된 계수는 c.alpha 같은 속성으로 붙는다) -> 기존 코드 그대로 동작
+    - table[i] -> ChoiceBlock, table[a:b] / table[mask] -> ChoiceTable (열 배열을 잘라 만든다)
+    """
+
+    __slots__ = ("categories", "codes", "hours", "alpha", "p_conv", "multiplier", "_index")
+
+    def __init__(
+        self,
+        categories: Sequence[str] = (),
+        codes: Any = (),
+        hours: Any = (),
+        *,
+        alpha: Any = None,
+        p_conv: Any = None,
+        multiplier: Any = None,
+    ) -> None:
+        self.categories: Tuple[str, ...] = tuple(str(c) for c in categories)
+        self.codes = np.asarray(codes, dtype=np.int32).reshape(-1)
+        self.hours = np.asarray(hours, dtype=float).reshape(-1)
+        if self.codes.shape != self.hours.shape:
+            raise ValueError("codes와 hours의 길이가 다릅니다.")
+        if len(self.codes) and (self.codes.min() < 0 or self.codes.max() >= len(self.categories)):
+            raise ValueError("범주 코드가 categories 범위를 벗어났습니다.")
+        self.alpha = self._column(alpha)
+        self.p_conv = self._column(p_conv)
+        self.multiplier = self._column(multiplier)
+        self._index: Optional[Dict[str, int]] = None
+
+    def _column(self, values: Any) -> Optional[np.ndarray]:
+        if values is None:
+            return None
+        col = np.asarray(values, dtype=float).reshape(-1)
+        if col.shape != self.hours.shape:
+            raise ValueError("계수 열의 길이가 hours와 다릅니다.")
+        return col
+
+    # -----------------------------
+    # 만들기
+    # -----------------------------
+    @classmethod
+    def from_columns(
+        cls,
+        labels: Sequence[str],
+        hours: Any,
+        *,
+        categories: Optional[Sequence[str]] = None,
+        **factors: Any,
+    ) -> "ChoiceTable":
+        """행별 label 목록 -> 코드로 바꿔 담는다. (categories를 주면 그 순서를 코드로 쓰고, 없는 label은 뒤에 추가)"""
+        index: Dict[str, int] = {str(c): i for i, c in enumerate(categories or ())}
+        codes = np.fromiter((index.setdefault(str(lb), len(index)) for lb in labels), dtype=np.int32, count=len(labels))
+        return cls(tuple(index), codes, hours, **factors)
+
+    @classmethod
+    def from_blocks(cls, blocks: Iterable[Any], *, categories: Optional[Sequence[str]] = None) -> "ChoiceTable":
+        """ChoiceBlock(또는 label/hours 속성을 가진 객체) 목록 -> ChoiceTable."""
+        if isinstance(blocks, ChoiceTable):
+            return blocks
+        blocks = list(blocks)
+        labels = [str(getattr(b, "label", "")) for b in blocks]
+        hours = [_float_or(getattr(b, "hours", 0.0), 0.0) for b in blocks]
+        factors = {}
+        for key in FACTOR_COLUMNS:
+            if any(hasattr(b, key) for b in blocks):
+                factors[key] = [_float_or(getattr(b, key, None), np.nan) for b in blocks]
+        return cls.from_columns(labels, hours, categories=categories, **factors)
+
+    # -----------------------------
+    # ChoiceBlock 리스트처럼 쓰기
+    # -----------------------------
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __iter__(self) -> Iterator[ChoiceBlock]:
+        for i in range(len(self.codes)):
+            yield self._block(i)
+
+    def __getitem__(self, key: Union[int, slice, np.ndarray]) -> Union[ChoiceBlock, "ChoiceTable"]:
+        if isinstance(key, (int, np.integer)):
+            n = len(self.codes)
+            i = int(key) + n if key < 0 else int(key)
+            if not 0 <= i < n:
+                raise IndexError("ChoiceTable index out of range")
+            return self._block(i)
+        return self._take(key)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ChoiceTable):
+            return NotImplemented
+        return (
+            self.labels == other.labels
+            and np.array_equal(self.hours, other.hours, equal_nan=True)
+            and all(_same_column(getattr(self, k), getattr(other, k)) for k in FACTOR_COLUMNS)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"ChoiceTable(rows={len(self)}, categories={len(self.categories)})"
+
+    def _block(self, i: int) -> ChoiceBlock:
+        b = ChoiceBlock(self.categories[self.codes[i]], float(self.hours[i]))
+        for key in FACTOR_COLUMNS:
+            col = getattr(self, key)
+            if col is not None and not np.isnan(col[i]):
+                setattr(b, key, float(col[i]))
+        return b
+
+    def _take(self, key: Any) -> "ChoiceTable":
+        # 범주 목록은 그대로 두고 행만 고른다 (코드가 바뀌지 않아서 범주별 집계 결과를 바로 비교할 수 있다)
+        out = ChoiceTable.__new__(ChoiceTable)
+        out.categories = self.categories
+        out.codes = self.codes[key]
+        out.hours = self.hours[key]
+        for k in FACTOR_COLUMNS:
+            col = getattr(self, k)
+            setattr(out, k, None if col is None else col[key])
+        out._index = self._index
+        return out
+
+    def copy(self) -> "ChoiceTable":
+        """열 배열까지 복사한 표 (다른 스레드에 넘겨도 원본을 고치는 쪽과 메모리를 나누지 않는다)."""
+        return self._take(np.arange(len(self.codes)))
+
+    def to_blocks(self) -> List[ChoiceBlock]:
+        return list(self)
+
+    # -----------------------------
+    # 열 / 범주 단위 계산
+    # -----------------------------
+    @property
+    def labels(self) -> List[str]:
+        cats = self.categories
+        return [cats[c] for c in self.codes.tolist()]
+
+    def code_of(self, label: str) -> Optional[int]:
+        if self._index is None:
+            self._index = {c: i for i, c in enumerate(self.categories)}
+        return self._index.get(str(label))
+
+    def select(self, label: str) -> "ChoiceTable":
+        """한 범주의 행만."""
+        code = self.code_of(label)
+        return self._take(self.codes == (-1 if code is None else code))
+
+    def category_hours(self, *, clamp: bool = True) -> Dict[str, float]:
+        """범주별 시간 합계 (행이 하나도 없는 범주는 빠진다). clamp=True면 음수/NaN 시간은 0으로."""
+        h = np.where(self.hours > 0.0, self.hours, 0.0) if clamp else self.hours
+        sums = np.bincount(self.codes, weights=h, minlength=len(self.categories))
+        present = np.bincount(self.codes, minlength=len(self.categories)) > 0
+        return {c: float(v) for c, v, p in zip(self.categories, sums, present) if p}
+
+    def total_hours(self) -> float:
+        return float(np.where(self.hours > 0.0, self.hours, 0.0).sum())
+
+
+def _float_or(x: Any, default: float) -> float:
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return default
+
+
+def _same_column(a: Optional[np.ndarray], b: Optional[np.ndarray]) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    return np.array_equal(a, b, equal_nan=True)
+
+
 @dataclass
 class AppState:
     persona_name: str = "노아"
@@ -54,5 +233,14 @@ class AppState:
         }
     )
 
-    # choices는 리스트(가변)이므로 이것도 default_factory 추천
-    choices: List[ChoiceBlock] = field(default_factory=list)
+    # choices는 열 단위 컨테이너(ChoiceTable). ChoiceBlock처럼 순회할 수 있다
+    choices: ChoiceTable = field(default_factory=ChoiceTable)
+
+    # 가치 환산 모드 (src/modes.py 등록 이름, 기본: modes.DEFAULT_MODE)
+    valuation_mode: str = "neutral_1"
+
+    # 입력 화면의 시간 블록 기록 (행: {"start": "HH:MM", "end": "HH:MM", "label": 범주}, src/timeline.py)
+    time_blocks: List[Dict[str, str]] = field(default_factory=list)
+
+    # 주간 계획 (src/planner.py WeekPlan.to_dict, 비어 있으면 오늘 입력으로 만든다)
+    week_plan: Dict[str, Any] = field(default_factory=dict)
@@ -0,0 +1,212 @@
+# 가치 환산 모드 (DEV_first.md §9)
+# - 모드마다: 범주 목록과 기본 가중치, 가중치 -> alpha 곡선(0~100점 101칸 표), 범주별 계수 기본값(p_conv / multiplier)
+# - 곡선은 등록할 때 한 번 표로 만들어 두므로, 가중치 -> alpha는 표 조회 (모드를 바꿔도 실행 중 비용 없음)
+# - value_matrix: 모드 하나로 (S, C) 시간 행렬을 한 번에 환산, score_modes: 여러 모드를 한 번에 (M, S, C)
+# - 새 모드는 register_mode(ValuationMode(...))로 추가
+# (계산 모듈(calc)이 이 모듈을 쓰므로 여기서는 calc를 import하지 않는다)
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import AppState, ChoiceBlock, ChoiceTable
+
+DEFAULT_MODE = "neutral_1"  # weight_to_alpha 설명의 추천 모드 (0.5~1.5, 과격하지 않음)
+NEUTRAL_WEIGHT = 50
+
+_BASE_WEIGHTS = dict(AppState().weights)  # 기본 모드 범주 = 앱 기본 가중치
+
+
+def alpha_table(curve: Callable[[int], float]) -> np.ndarray:
+    """가중치 0~100점 -> alpha 표 (101,), 음수는 0으로. (읽기 전용)"""
+    lut = np.array([max(0.0, float(curve(w))) for w in range(101)], dtype=float)
+    lut.setflags(write=False)
+    return lut
+
+
+def ratio_curve(w: int) -> float:
+    return w / 100.0
+
+
+def neutral_curve(w: int) -> float:
+    return 0.5 + w / 100.0
+
+
+def saturating_curve(w: int, scale: float = 35.0) -> float:
+    """0.5~1.5, 낮은 가중치 구간에서 빨리 오르고 높은 구간에서는 완만 (조금만 챙겨도 큰 차이)."""
+    return 0.5 + (1.0 - math.exp(-w / scale)) / (1.0 - math.exp(-100.0 / scale))
+
+
+@dataclass(frozen=True)
+class ValuationMode:
+    """
+    가치 환산 모드
+    - name: 등록 이름 (alpha_mode 인자로 쓰는 값), title: 화면 표시 이름
+    - weights: 이 모드의 범주와 기본 가중치 (키 순서 = 범주 순서)
+    - alpha: 가중치 0~100 -> alpha 표 (101,)
+    - p_conv / multiplier: 범주별 계수 기본값 (없는 범주는 1.0)
+    """
+
+    name: str
+    title: str
+    weights: Mapping[str, int]
+    alpha: np.ndarray
+    p_conv: Mapping[str, float] = field(default_factory=dict)
+    multiplier: Mapping[str, float] = field(default_factory=dict)
+    note: str = ""
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        return tuple(self.weights)
+
+    @property
+    def has_factors(self) -> bool:
+        return bool(self.p_conv or self.multiplier)
+
+    def weight_to_alpha(self, weight: Any) -> float:
+        return float(self.alpha[_clamp_weight(weight)])
+
+    def factor_vectors(self, labels: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """범주 목록의 (p_conv, multiplier) 기본값 벡터."""
+        p = np.fromiter((min(1.0, max(0.0, float(self.p_conv.get(lb, 1.0)))) for lb in labels), dtype=float, count=len(labels))
+        m = np.fromiter((max(0.0, float(self.multiplier.get(lb, 1.0))) for lb in labels), dtype=float, count=len(labels))
+        return p, m
+
+    def value_matrix(
+        self,
+        labels: Sequence[str],
+        hours: np.ndarray,
+        weight_idx: np.ndarray,
+        basis: Any,
+    ) -> np.ndarray:
+        """
+        (S, C) 시간 행렬의 범주별 가치 (S, C).
+        - weight_idx: 가중치 0~100 (그 범주의 가중치가 없으면 -1 -> alpha 1.0)
+        - basis: 스칼라 또는 행별 (S,) 기준가치
+        (calc_opportunity_cost(..., weights=..., alpha_mode=이 모드)와 같은 규칙)
+        """
+        return score_modes([self], labels, hours, weight_idx, basis)[0]
+
+
+def _clamp_weight(w: Any) -> int:
+    try:
+        wi = int(w)
+    except Exception:
+        wi = NEUTRAL_WEIGHT
+    return max(0, min(100, wi))
+
+
+_MODES: Dict[str, ValuationMode] = {}
+
+
+def register_mode(mode: ValuationMode) -> ValuationMode:
+    """모드 등록 (같은 이름이면 교체)."""
+    if len(mode.alpha) != 101:
+        raise ValueError(f"{mode.name}: alpha 표는 0~100점 101칸이어야 합니다.")
+    _MODES[mode.name] = mode
+    return mode
+
+
+def get_mode(name: Optional[str] = None) -> ValuationMode:
+    """이름으로 모드 찾기 (None이면 기본 모드)."""
+    mode = _MODES.get(DEFAULT_MODE if name is None else name)
+    if mode is None:
+        raise ValueError(f"알 수 없는 가치 환산 모드: {name!r} (가능: {', '.join(_MODES)})")
+    return mode
+
+
+def mode_names() -> List[str]:
+    return list(_MODES)
+
+
+def all_modes() -> List[ValuationMode]:
+    return list(_MODES.values())
+
+
+def score_modes(
+    modes: Sequence[ValuationMode],
+    labels: Sequence[str],
+    hours: np.ndarray,
+    weight_idx: np.ndarray,
+    basis: Any,
+) -> np.ndarray:
+    """
+    같은 입력을 여러 모드로 한 번에 환산 -> (M, S, C).
+    시간 / 가중치 정리는 한 번만 하고, 모드별로는 alpha 표와 계수 벡터만 다르다.
+    """
+    h = np.asarray(hours, dtype=float)
+    h = np.where(h > 0.0, h, 0.0)  # 음수 / NaN -> 0
+    idx = np.asarray(weight_idx)
+    has_weight = idx >= 0
+    col = np.clip(idx, 0, 100)
+    b = np.asarray(basis, dtype=float)
+    b = np.where(b > 0.0, b, 0.0)
+    if b.ndim == 1:
+        b = b[:, np.newaxis]
+
+    luts = np.stack([m.alpha for m in modes])  # (M, 101)
+    alpha = np.where(has_weight, luts[:, col], 1.0)  # (M, S, C)
+    factors = [m.factor_vectors(labels) for m in modes]
+    pm = np.stack([p * mult for p, mult in factors])[:, np.newaxis, :]  # (M, 1, C)
+    return h * b * alpha * pm
+
+
+def apply_mode(s: AppState, name: str) -> bool:
+    """
+    s를 모드 name으로 바꾼다. 범주 구성이 다르면 가중치는 모드 기본값으로,
+    시간 배분은 모드 범주로 다시 만든다 (같은 이름 범주의 시간은 유지).
+    returns: 범주 구성이 바뀌었는지
+    """
+    mode = get_mode(name)
+    s.valuation_mode = mode.name
+    if set(mode.categories) == set(s.weights):
+        return False
+    hours = ChoiceTable.from_blocks(s.choices).category_hours()
+    s.weights = dict(mode.weights)
+    s.choices = ChoiceTable.from_blocks(
+        [ChoiceBlock(c, hours.get(c, 0.0)) for c in mode.categories],
+        categories=mode.categories,
+    )
+    return True
+
+
+# -----------------------------
+# 기본 모드
+# -----------------------------
+register_mode(ValuationMode("neutral_1", "기본(중립)", _BASE_WEIGHTS, alpha_table(neutral_curve), note="alpha = 0.5 + 가중치/100 (0.5~1.5)"))
+register_mode(ValuationMode("ratio", "기본(비율)", _BASE_WEIGHTS, alpha_table(ratio_curve), note="alpha = 가중치/100 (0~1)"))
+
+# 확장 모드 예시 (DEV_first.md §9.3): 계수는 참고용 예시 값
+register_mode(
+    ValuationMode(
+        "job_prep",
+        "취업준비",
+        {"지원서 작성": 80, "포트폴리오": 70, "면접 준비": 80, "회복,건강,여가": 60, "소비성 여가, 저생산 활동": 30},
+        alpha_table(neutral_curve),
+        p_conv={"지원서 작성": 0.6, "포트폴리오": 0.5, "면접 준비": 0.7},
+        note="지원서/포트폴리오/면접은 결과로 이어질 확률(p_conv)을 반영",
+    )
+)
+register_mode(
+    ValuationMode(
+        "health",
+        "건강",
+        {"운동": 80, "수면 외 회복": 70, "식단 준비": 60, "생산활동": 60, "소비성 여가, 저생산 활동": 30},
+        alpha_table(saturating_curve),
+        multiplier={"운동": 1.2},
+        note="가중치가 낮은 구간에서 alpha가 빨리 오르는 곡선",
+    )
+)
+register_mode(
+    ValuationMode(
+        "study",
+        "학습",
+        {"집중 학습": 80, "복습": 60, "회복,건강,여가": 60, "소비성 여가, 저생산 활동": 30},
+        alpha_table(neutral_curve),
+        multiplier={"집중 학습": 1.2},
+        note="집중 세션에 상태 가중치(multiplier) 1.2",
+    )
+)
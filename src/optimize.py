@@ -0,0 +1,137 @@
+# 최적 시간 배분(제약 조건) 계산
+#
+# 가치는 시간에 선형(OC = hours * V)이므로
+#   max  Σ h_c * V_c
+#   s.t. Σ h_c <= 선택 가능한 시간,  min_c <= h_c <= max_c
+# 는 "최소 시간 먼저 채우고, 남은 시간을 V가 큰 범주부터 상한까지 채우는" 탐욕법이 최적해다. (O(C log C))
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .calc import (
+    OCConfig,
+    _clamp_nonneg,
+    _clamp_nonneg_array,
+    calc_value_matrix,
+    resolve_config,
+    resolve_factor_vectors,
+)
+from .models import ChoiceBlock, ChoiceTable
+from .modes import DEFAULT_MODE
+
+
+@dataclass(frozen=True)
+class AllocationResult:
+    """
+    최적 배분 결과 (C=범주 수)
+    - hours / current_hours: 최적 배분 / 현재 배분 (C,)
+    - value_per_hour: 범주별 유효가치(원/시간) (C,)
+    - total_value / current_value: 최적 / 현재 가치환산 합계
+    """
+    categories: Tuple[str, ...]
+    hours: np.ndarray
+    current_hours: np.ndarray
+    value_per_hour: np.ndarray
+    total_value: float
+    current_value: float
+
+    @property
+    def gap(self) -> float:
+        """최적 - 현재 (원)"""
+        return self.total_value - self.current_value
+
+    @property
+    def delta_hours(self) -> np.ndarray:
+        """범주별 시간 변화(최적 - 현재)"""
+        return self.hours - self.current_hours
+
+
+def solve_allocation(
+    budget: float,
+    value_per_hour: Any,
+    min_hours: Any = 0.0,
+    max_hours: Any = None,
+) -> np.ndarray:
+    """
+    상/하한이 있는 선형 배분 문제의 최적해 (C,).
+    - min_hours / max_hours: 스칼라 또는 범주별 (C,), max_hours=None이면 상한 없음(budget)
+    - 최소 시간 합계가 budget을 넘으면 ValueError
+    - 남는 시간은 V가 큰 범주부터(동률은 범주 순서) 상한까지 채운다. 모든 상한이 차면 나머지는 비워둔다.
+    """
+    v = np.asarray(value_per_hour, dtype=float)
+    n = v.shape[0]
+    b = _clamp_nonneg(budget)
+
+    lo = np.broadcast_to(_clamp_nonneg_array(min_hours), (n,)).astype(float)
+    hi = np.broadcast_to(_clamp_nonneg_array(b if max_hours is None else max_hours), (n,)).astype(float)
+    if np.any(hi < lo):
+        raise ValueError("최대 시간이 최소 시간보다 작은 범주가 있습니다.")
+
+    remaining = b - float(lo.sum())
+    if remaining < -1e-9:
+        raise ValueError(f"최소 시간 합계({lo.sum():.1f}시간)가 선택 가능한 시간({b:.1f}시간)보다 큽니다.")
+
+    order = np.argsort(-v, kind="stable")
+    cap = (hi - lo)[order]
+    before = np.cumsum(cap) - cap
+    give = np.clip(max(0.0, remaining) - before, 0.0, cap)
+
+    x = lo.copy()
+    x[order] += give
+    return x
+
+
+def optimize_choices(
+    choices: List[ChoiceBlock],
+    discretionary: float,
+    basis_hour_value: float,
+    *,
+    categories: Optional[Sequence[str]] = None,
+    config: Optional[OCConfig] = None,
+    weights: Optional[Dict[str, int]] = None,
+    alpha_mode: str = DEFAULT_MODE,
+    min_hours: Optional[Dict[str, float]] = None,
+    max_hours: Optional[Dict[str, float]] = None,
+) -> AllocationResult:
+    """
+    현재 choices 대비 가치가 최대가 되는 범주별 시간 배분.
+    - categories: 배분 대상 범주(기본: weights 키, 없으면 choices의 label 순서)
+    - min_hours / max_hours: {범주: 시간} (예: {"회복,건강,여가": 2.0}), 없는 범주는 0 ~ discretionary
+    - 현재/최적 가치는 같은 범주별 유효가치로 calc_value_matrix에서 한 번에 계산한다.
+    """
+    current: Dict[str, float] = {}
+    if isinstance(choices, ChoiceTable):
+        current = choices.category_hours()
+    else:
+        for c in choices:
+            label = str(getattr(c, "label", ""))
+            current[label] = current.get(label, 0.0) + _clamp_nonneg(getattr(c, "hours", 0.0))
+
+    if categories is None:
+        categories = list(weights.keys()) if weights else list(current.keys())
+    cats = tuple(str(c) for c in categories)
+
+    cfg = resolve_config(config, weights, alpha_mode)
+    alpha, p_conv, mult = resolve_factor_vectors(cats, cfg)
+    v = _clamp_nonneg(basis_hour_value) * alpha * p_conv * mult
+
+    budget = _clamp_nonneg(discretionary)
+    lo = np.array([_clamp_nonneg((min_hours or {}).get(c, 0.0)) for c in cats], dtype=float)
+    hi = np.array([_clamp_nonneg((max_hours or {}).get(c, budget)) for c in cats], dtype=float)
+    best = solve_allocation(budget, v, lo, hi)
+
+    cur = np.array([current.get(c, 0.0) for c in cats], dtype=float)
+    result = calc_value_matrix(np.vstack([cur, best]), basis_hour_value, alpha, p_conv, mult)
+    totals = result.total
+
+    return AllocationResult(
+        categories=cats,
+        hours=best,
+        current_hours=cur,
+        value_per_hour=v,
+        total_value=float(totals[1]),
+        current_value=float(totals[0]),
+    )
@@ -0,0 +1,172 @@
+# 멀티코어 실행 계층(프로세스 풀)
+# - 계산 함수(src/calc.py 등)는 순수 함수라, 큰 입력을 chunk로 나눠 여러 프로세스에서 돌릴 수 있다
+# - 결과는 입력 순서대로 돌려준다 (ordered merge)
+# - 동시에 떠 있는 작업 수를 제한해서, 스트리밍 입력(대량 기록)도 메모리가 일정하다
+# - 예외/중단(KeyboardInterrupt)/제너레이터 종료 시 대기 중인 작업을 취소하고 풀을 정리한다
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, TypeVar
+
+import numpy as np
+
+from .calc import calc_value_matrix
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+WORKERS_ENV = "NOAATS_WORKERS"
+
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """workers 인자 > 환경변수 NOAATS_WORKERS > CPU 수 순서로 작업자 수 결정 (최소 1)."""
+    if workers is None:
+        env = os.environ.get(WORKERS_ENV, "").strip()
+        try:
+            workers = int(env) if env else (os.cpu_count() or 1)
+        except ValueError:
+            workers = os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def auto_chunk_size(n_items: int, workers: int, *, chunks_per_worker: int = 4, min_chunk: int = 1) -> int:
+    """
+    작업자당 chunks_per_worker개 정도로 나뉘도록 chunk 크기를 정한다.
+    (chunk가 너무 작으면 전송/직렬화 비용이, 너무 크면 마지막 작업자 대기가 커진다)
+    """
+    target = max(1, workers * chunks_per_worker)
+    return max(min_chunk, -(-max(0, n_items) // target))
+
+
+def split_rows(n_rows: int, chunk_size: int) -> List[slice]:
+    """0..n_rows를 chunk_size 단위 slice 목록으로."""
+    step = max(1, int(chunk_size))
+    return [slice(i, min(i + step, n_rows)) for i in range(0, n_rows, step)]
+
+
+class ParallelRunner:
+    """
+    프로세스 풀 실행기 (with 문으로 사용, 풀은 블록 안에서 재사용).
+
+        with ParallelRunner(workers=8) as runner:
+            for out in runner.map(fn, chunks):
+                ...
+
+    - workers == 1이면 풀 없이 현재 프로세스에서 순서대로 실행한다.
+    - max_pending: 동시에 제출해 두는 작업 수 (기본 workers * 2)
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        *,
+        max_pending: Optional[int] = None,
+        mp_context: Any = None,
+    ) -> None:
+        self.workers = resolve_workers(workers)
+        self.max_pending = max(1, int(max_pending or self.workers * 2))
+        self._mp_context = mp_context
+        self._executor: Optional[Executor] = None
+        self._pending: Deque[Future] = deque()
+
+    def __enter__(self) -> "ParallelRunner":
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._mp_context)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.cancel()
+        elif self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def cancel(self) -> None:
+        """대기 중인 작업을 취소하고 풀을 내린다. (이미 실행 중인 작업은 끝날 때까지 기다리지 않는다)"""
+        while self._pending:
+            self._pending.popleft().cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def map(self, fn: Callable[..., R], items: Iterable[T], *extra: Any) -> Iterator[R]:
+        """
+        items의 각 원소에 fn(item, *extra)을 적용한 결과를 입력 순서대로 내보낸다.
+        fn / item / extra는 프로세스 간 전달되므로 pickle 가능해야 한다(모듈 최상위 함수).
+        """
+        if self._executor is None:
+            for item in items:
+                yield fn(item, *extra)
+            return
+
+        it = iter(items)
+        pending = self._pending
+        try:
+            for item in it:
+                pending.append(self._executor.submit(fn, item, *extra))
+                if len(pending) >= self.max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        except BaseException:
+            # 예외, KeyboardInterrupt, 소비자가 중간에 멈춘 경우(GeneratorExit) 모두 정리
+            self.cancel()
+            raise
+
+
+def parallel_map(
+    fn: Callable[..., R],
+    items: Iterable[T],
+    *extra: Any,
+    workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+) -> Iterator[R]:
+    """ParallelRunner 한 번 쓰고 닫는 간단 버전 (순서 보장 제너레이터)."""
+    with ParallelRunner(workers, max_pending=max_pending) as runner:
+        yield from runner.map(fn, items, *extra)
+
+
+# -----------------------------
+# 시나리오 그리드: (S, C) 시간 행렬을 행 단위로 나눠 채점
+# -----------------------------
+def _score_rows(args) -> np.ndarray:
+    hours, basis, alpha, p_conv, multiplier = args
+    return calc_value_matrix(hours, basis, alpha, p_conv, multiplier).total
+
+
+def parallel_value_totals(
+    hours: Any,
+    basis_hour_value: Any,
+    alpha: Any = 1.0,
+    p_conv: Any = 1.0,
+    multiplier: Any = 1.0,
+    *,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> np.ndarray:
+    """
+    calc_value_matrix(...).total과 같은 값(S,)을 행 chunk별로 나눠 여러 프로세스에서 계산.
+    - basis_hour_value: 스칼라 또는 (S,), 계수: 스칼라 / (C,) / (S, C)
+    """
+    h = np.asarray(hours, dtype=float)
+    if h.ndim == 1:
+        h = h[np.newaxis, :]
+    n_rows = h.shape[0]
+    n_workers = resolve_workers(workers)
+    size = chunk_size or auto_chunk_size(n_rows, n_workers, min_chunk=1024)
+
+    # 시나리오별 값(basis (S,), 계수 (S, C))만 행으로 자르고, 스칼라/범주별 (C,) 값은 그대로 보낸다
+    basis = np.asarray(basis_hour_value, dtype=float)
+    factors = [np.asarray(f, dtype=float) for f in (alpha, p_conv, multiplier)]
+    tasks = (
+        (
+            h[sl],
+            basis[sl] if basis.ndim == 1 else basis,
+            *(f[sl] if f.ndim == 2 else f for f in factors),
+        )
+        for sl in split_rows(n_rows, size)
+    )
+    parts = list(parallel_map(_score_rows, tasks, workers=n_workers))
+    return np.concatenate(parts) if parts else np.zeros(0)
@@ -0,0 +1,282 @@
+# 주간 계획 (요일마다 기본 생활 시간 / 범주별 시간)
+# - 한 주 = (7, C) 시간 행렬 + 요일별 TimeBasics
+# - 평가: 범주별 유효가치(원/시간, 가치 환산 모드 커널로 한 번)만 구해 두면 7×C 가치는 곱셈 한 번
+# - 요일을 건너는 재배분("토요일 소비성 여가 1시간 -> 화요일 인적자본 축적")도 (요일, 범주) 칸을
+#   범주처럼 보고 calc_reallocation_gains의 같은 변화량 계산으로 (7C × 7C) 한 번에 채점
+# - 화면에는 JSON으로 저장할 수 있는 dict(AppState.week_plan)로 들고 있는다 (to_dict / from_dict)
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .calc import ReallocationProfile, calc_reallocation_gains
+from .choices import category_hours
+from .models import AppState, TimeBasics
+from .modes import DEFAULT_MODE, get_mode
+
+DAYS: Tuple[str, ...] = ("월", "화", "수", "목", "금", "토", "일")
+BASICS_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(TimeBasics))
+_EPS = 1e-9
+
+
+@dataclass(frozen=True)
+class WeekPlan:
+    """
+    한 주 계획
+    - categories: 범주 (C,), hours: 요일 × 범주 시간 (7, C), basics: 요일별 기본 생활 시간 (7개)
+    """
+
+    categories: Tuple[str, ...]
+    hours: np.ndarray
+    basics: Tuple[TimeBasics, ...]
+
+    def __post_init__(self) -> None:
+        if self.hours.shape != (len(DAYS), len(self.categories)):
+            raise ValueError(f"hours는 (7, {len(self.categories)}) 모양이어야 합니다: {self.hours.shape}")
+        if len(self.basics) != len(DAYS):
+            raise ValueError("basics는 요일마다 하나씩 7개여야 합니다.")
+
+    @classmethod
+    def from_state(cls, s: AppState) -> "WeekPlan":
+        """오늘 입력(s.basics / s.choices)을 일주일 내내 반복한 계획."""
+        categories = tuple(s.weights)
+        hours = category_hours(s.choices)
+        row = np.array([max(0.0, float(hours.get(c, 0.0))) for c in categories], dtype=float)
+        return cls(categories, np.tile(row, (len(DAYS), 1)), tuple(replace(s.basics) for _ in DAYS))
+
+    @classmethod
+    def from_dict(cls, obj: Dict[str, Any]) -> "WeekPlan":
+        known = set(BASICS_FIELDS)
+        return cls(
+            tuple(str(c) for c in obj["categories"]),
+            np.asarray(obj["hours"], dtype=float).reshape(len(DAYS), len(obj["categories"])),
+            tuple(TimeBasics(**{k: v for k, v in b.items() if k in known}) for b in obj["basics"]),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "categories": list(self.categories),
+            "hours": self.hours.tolist(),
+            "basics": [asdict(b) for b in self.basics],
+        }
+
+    def with_hours(self, hours: Any) -> "WeekPlan":
+        return replace(self, hours=np.clip(np.asarray(hours, dtype=float), 0.0, None))
+
+    def with_basics(self, basics: Sequence[TimeBasics]) -> "WeekPlan":
+        return replace(self, basics=tuple(basics))
+
+
+def load_week_plan(s: AppState) -> WeekPlan:
+    """s.week_plan을 읽는다. 없거나 범주 구성이 지금 가중치와 다르면 오늘 입력으로 새로 만든다."""
+    obj = s.week_plan
+    if obj and list(obj.get("categories", ())) == list(s.weights):
+        try:
+            return WeekPlan.from_dict(obj)
+        except (KeyError, TypeError, ValueError):
+            pass
+    return WeekPlan.from_state(s)
+
+
+# -----------------------------
+# 평가
+# -----------------------------
+def basics_matrix(basics: Sequence[TimeBasics]) -> np.ndarray:
+    """요일별 필수 시간 (D, 항목 수), 음수/NaN은 0."""
+    m = np.array([[float(getattr(b, f, 0.0) or 0.0) for f in BASICS_FIELDS] for b in basics], dtype=float)
+    return np.where(m > 0.0, m, 0.0)
+
+
+def discretionary_hours(basics: Sequence[TimeBasics]) -> np.ndarray:
+    """요일별 선택 가능한 시간 (D,) (calc_discretionary_hours를 요일 수만큼 한 번에)."""
+    return 24.0 - basics_matrix(basics).sum(axis=1)
+
+
+def category_rates(
+    categories: Sequence[str],
+    basis_hour_value: float,
+    weights: Optional[Dict[str, Any]] = None,
+    alpha_mode: str = DEFAULT_MODE,
+) -> np.ndarray:
+    """범주별 유효가치(원/시간) (C,) = 기준가치 × alpha × p_conv × multiplier (모드 커널 한 번)."""
+    weights = weights or {}
+    idx = np.array([[_weight_index(weights.get(c)) for c in categories]], dtype=np.int64)
+    return get_mode(alpha_mode).value_matrix(categories, np.ones((1, len(categories))), idx, basis_hour_value)[0]
+
+
+def _weight_index(w: Any) -> int:
+    if w is None:
+        return -1
+    try:
+        return max(0, min(100, int(w)))
+    except (TypeError, ValueError):
+        return 50
+
+
+@dataclass(frozen=True)
+class WeekEvaluation:
+    """
+    한 주 평가 결과 (D=7, C=범주 수)
+    - rate: 범주별 유효가치(원/시간) (C,), values: 요일 × 범주 가치 (D, C)
+    - used / discretionary / over: 요일별 배분 합계, 선택 가능한 시간, 초과 시간 (D,)
+    """
+
+    categories: Tuple[str, ...]
+    rate: np.ndarray
+    values: np.ndarray
+    used: np.ndarray
+    discretionary: np.ndarray
+
+    @property
+    def day_totals(self) -> np.ndarray:
+        return self.values.sum(axis=1)
+
+    @property
+    def category_totals(self) -> np.ndarray:
+        return self.values.sum(axis=0)
+
+    @property
+    def total(self) -> float:
+        return float(self.values.sum())
+
+    @property
+    def over(self) -> np.ndarray:
+        return np.maximum(0.0, self.used - self.discretionary)
+
+
+def evaluate_week(
+    plan: WeekPlan,
+    basis_hour_value: float,
+    weights: Optional[Dict[str, Any]] = None,
+    alpha_mode: str = DEFAULT_MODE,
+) -> WeekEvaluation:
+    """7×C 계획 전체를 한 번에 평가."""
+    rate = category_rates(plan.categories, basis_hour_value, weights, alpha_mode)
+    return WeekEvaluation(
+        categories=plan.categories,
+        rate=rate,
+        values=plan.hours * rate[np.newaxis, :],
+        used=plan.hours.sum(axis=1),
+        discretionary=discretionary_hours(plan.basics),
+    )
+
+
+# -----------------------------
+# 요일을 건너는 재배분
+# -----------------------------
+@dataclass(frozen=True)
+class WeekMove:
+    """from_day의 from_cat에서 hours만큼 빼서 to_day의 to_cat에 더할 때 가치 변화(gain)."""
+
+    to_day: int
+    to_cat: str
+    from_day: int
+    from_cat: str
+    hours: float
+    gain: float
+
+    def describe(self) -> str:
+        return f"{DAYS[self.from_day]} {self.from_cat} {self.hours:g}h → {DAYS[self.to_day]} {self.to_cat} {self.hours:g}h"
+
+
+def week_profile(plan: WeekPlan, evaluation: WeekEvaluation) -> ReallocationProfile:
+    """(요일, 범주) 칸 7C개를 범주처럼 본 재배분 프로필 (칸 k = 요일 k // C, 범주 k % C)."""
+    n_day, n_cat = plan.hours.shape
+    rate = np.tile(evaluation.rate, n_day)
+    return ReallocationProfile(
+        categories=tuple(f"{DAYS[d]}:{c}" for d in range(n_day) for c in plan.categories),
+        hours=plan.hours.reshape(-1).copy(),
+        add_value=rate,
+        seg_hours=plan.hours.reshape(-1, 1).copy(),
+        seg_value=rate[:, np.newaxis],
+    )
+
+
+def week_move_gains(
+    plan: WeekPlan,
+    evaluation: WeekEvaluation,
+    delta_h: Any = 1.0,
+    *,
+    respect_budget: bool = True,
+) -> np.ndarray:
+    """
+    모든 (더할 칸, 뺄 칸) 조합의 가치 변화 (7C, 7C) (delta_h가 배열이면 (N, 7C, 7C)).
+    - 같은 범주를 요일만 옮기는 조합은 가치가 그대로라 NaN
+    - respect_budget: 더할 요일의 배분이 선택 가능한 시간을 넘게 되면 NaN (같은 요일 안의 이동은 항상 허용)
+    """
+    n_day, n_cat = plan.hours.shape
+    gains = calc_reallocation_gains(week_profile(plan, evaluation), delta_h)
+    day = np.repeat(np.arange(n_day), n_cat)
+    cat = np.tile(np.arange(n_cat), n_day)
+    same_cat = (cat[:, np.newaxis] == cat[np.newaxis, :]) & (day[:, np.newaxis] != day[np.newaxis, :])
+    gains[..., same_cat] = np.nan
+    if respect_budget:
+        d = np.atleast_1d(np.clip(np.asarray(delta_h, dtype=float), 0.0, None))
+        moved = np.minimum(d[:, np.newaxis], plan.hours.reshape(-1)[np.newaxis, :])  # (N, 7C): 뺄 칸 기준
+        room = (evaluation.discretionary - evaluation.used)[day]  # 더할 칸 요일의 남은 시간 (7C,)
+        cross = day[:, np.newaxis] != day[np.newaxis, :]
+        over = cross[np.newaxis] & (moved[:, np.newaxis, :] > room[np.newaxis, :, np.newaxis] + _EPS)
+        gains[over.reshape(gains.shape)] = np.nan
+    return gains
+
+
+def rank_week_moves(
+    plan: WeekPlan,
+    evaluation: WeekEvaluation,
+    delta_h: float = 1.0,
+    limit: Optional[int] = None,
+    *,
+    respect_budget: bool = True,
+) -> List[WeekMove]:
+    """가치 변화가 큰 순서의 요일 간/요일 안 재배분 (limit이 있으면 상위 limit개만 정렬)."""
+    gains = week_move_gains(plan, evaluation, delta_h, respect_budget=respect_budget)
+    flat = -gains.ravel()
+    idx = np.flatnonzero(~np.isnan(flat))
+    if limit is not None and 0 < limit < len(idx):
+        kth = np.partition(flat[idx], limit - 1)[limit - 1]
+        idx = idx[flat[idx] <= kth]
+    order = idx[np.argsort(flat[idx], kind="stable")][:limit]
+
+    n_cat = len(plan.categories)
+    slots = plan.hours.size
+    hours = plan.hours.reshape(-1)
+    out = []
+    for k in order.tolist():
+        a, r = divmod(k, slots)
+        out.append(
+            WeekMove(
+                to_day=a // n_cat,
+                to_cat=plan.categories[a % n_cat],
+                from_day=r // n_cat,
+                from_cat=plan.categories[r % n_cat],
+                hours=float(min(delta_h, hours[r])),
+                gain=-float(flat[k]),
+            )
+        )
+    return out
+
+
+def score_move(
+    plan: WeekPlan,
+    evaluation: WeekEvaluation,
+    from_day: int,
+    from_cat: str,
+    to_day: int,
+    to_cat: str,
+    delta_h: float,
+) -> WeekMove:
+    """재배분 하나의 가치 변화 (실제 이동량 = min(delta_h, 뺄 칸 시간))."""
+    fc, tc = plan.categories.index(from_cat), plan.categories.index(to_cat)
+    moved = float(min(max(0.0, float(delta_h)), plan.hours[from_day, fc]))
+    return WeekMove(to_day, to_cat, from_day, from_cat, moved, moved * float(evaluation.rate[tc] - evaluation.rate[fc]))
+
+
+def apply_move(plan: WeekPlan, move: WeekMove) -> WeekPlan:
+    hours = plan.hours.copy()
+    fc, tc = plan.categories.index(move.from_cat), plan.categories.index(move.to_cat)
+    moved = min(move.hours, hours[move.from_day, fc])
+    hours[move.from_day, fc] -= moved
+    hours[move.to_day, tc] += moved
+    return plan.with_hours(hours)
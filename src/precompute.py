@@ -0,0 +1,266 @@
+# 의사결정 지원 화면 계산을 미리 해 두기 (백그라운드)
+# - 입력 화면에서 choices / weights가 바뀌면 schedule_support_tables(...)로 계산을 예약한다
+#   -> 사용자가 "의사 결정 지원" 메뉴를 열 때는 다 된 결과(SupportTables)를 받아 바로 그린다
+# - 세션마다 Precomputer 하나 (진행 중인 작업은 최대 1개), 실행은 프로세스 공용 스레드 풀
+# - 입력이 또 바뀌면 이전 작업은 취소: 아직 시작 전이면 풀에서 빼고, 도는 중이면 단계 사이에서 멈춘다
+from __future__ import annotations
+
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, MutableMapping, Optional, Tuple
+
+import numpy as np
+
+from .cache import content_key
+from .calc import (
+    ReallocationProfile,
+    build_reallocation_profile,
+    calc_opportunity_cost_table,
+    calc_reallocation_gains,
+    resolve_config,
+    resolve_factor_vectors,
+)
+from .choices import category_hours, normalize_choices, reallocate_hours
+from .instrument import incr, timed
+from .models import AppState, ChoiceTable
+from .modes import DEFAULT_MODE
+from .optimize import AllocationResult, optimize_choices
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+MAX_WORKERS = 2  # 프로세스 전체에서 동시에 미리 계산하는 작업 수
+SESSION_KEY = "_precompute"
+SCENARIO_DELTA_H = 1.0  # 대안 비교의 기본 이동 시간 (이 값의 모든 범주 조합을 미리 계산)
+MAX_SCENARIO_CATEGORIES = 8  # 범주가 이보다 많으면 기본 조합 하나만
+SWEEP = np.arange(0.5, 8.0 + 0.25, 0.5)  # 이동 시간별 최대 변화량 표
+
+
+class Stale(Exception):
+    """입력이 다시 바뀌어서 더 이상 필요 없는 계산."""
+
+
+@dataclass(frozen=True)
+class SupportTables:
+    """
+    의사결정 지원 화면에 필요한 계산 결과 (key: 입력 내용 해시, support_tables_key)
+    - df_now / total_now: 현재 가치 표와 합계
+    - profile / gains / sweep_gains: 1시간 재배분 변화량, SWEEP별 변화량
+    - scenarios: {(늘릴 범주, 줄일 범주, 이동 시간): (대안 가치 표, 실제 이동 시간)}
+    - optimal: 기본 제약(범주별 0 ~ 선택 가능 시간)의 최적 배분 (범주가 2개 미만이면 None)
+    """
+
+    key: str
+    df_now: "pd.DataFrame"
+    total_now: float
+    categories: List[str]
+    profile: Optional[ReallocationProfile]
+    gains: Optional[np.ndarray]
+    sweep_gains: Optional[np.ndarray]
+    scenarios: Dict[Tuple[str, str, float], Tuple["pd.DataFrame", float]]
+    optimal: Optional[AllocationResult]
+
+
+def support_categories(choices: Any, weights: Optional[Dict[str, int]]) -> List[str]:
+    """범주 후보: weights의 키(가장 확실) 우선, 없으면 choices에서 추출."""
+    if isinstance(weights, dict) and len(weights) > 0:
+        return list(weights.keys())
+    return sorted(category_hours(choices).keys())
+
+
+def reallocation_profile(
+    choices: Any,
+    weights: Optional[Dict[str, int]],
+    basis_hour_value: float,
+    df_now: "pd.DataFrame",
+    categories: List[str],
+    alpha_mode: str = DEFAULT_MODE,
+) -> ReallocationProfile:
+    """현재 환산표(df_now, choices와 같은 순서)의 유효가치로 재배분 프로필을 만든다."""
+    cfg = resolve_config(weights=weights, alpha_mode=alpha_mode)
+    alpha, p_conv, mult = resolve_factor_vectors(categories, cfg)
+    v0 = max(0.0, float(basis_hour_value))
+    cols = normalize_choices(choices)
+    return build_reallocation_profile(
+        categories,
+        cols.categories,
+        cols.hours,
+        df_now["유효가치(원/시간)"].to_numpy(),
+        fallback_value=v0 * alpha * p_conv * mult,
+    )
+
+
+def scenario_table(
+    choices: Any,
+    weights: Optional[Dict[str, int]],
+    basis_hour_value: float,
+    add_to: str,
+    reduce_from: str,
+    delta_h: float,
+    alpha_mode: str = DEFAULT_MODE,
+) -> Tuple["pd.DataFrame", float]:
+    """add_to 범주를 delta_h 늘리고 reduce_from 범주를 줄인 대안의 가치 표."""
+    alt_choices, moved = reallocate_hours(choices, reduce_from, add_to, delta_h)
+    return calc_opportunity_cost_table(alt_choices, basis_hour_value, weights=weights, alpha_mode=alpha_mode), moved
+
+
+def support_tables_key(
+    choices: Any,
+    weights: Optional[Dict[str, int]],
+    basis_hour_value: float,
+    discretionary: float,
+    alpha_mode: str = DEFAULT_MODE,
+) -> str:
+    return content_key(choices, weights, float(basis_hour_value), float(discretionary), alpha_mode)
+
+
+def _never() -> bool:
+    return False
+
+
+@timed()
+def compute_support_tables(
+    choices: Any,
+    weights: Optional[Dict[str, int]],
+    basis_hour_value: float,
+    discretionary: float,
+    alpha_mode: str = DEFAULT_MODE,
+    *,
+    key: Optional[str] = None,
+    cancelled: Callable[[], bool] = _never,
+) -> SupportTables:
+    """
+    의사결정 지원 화면의 표를 한 번에 계산한다. (화면에서 바로 부르거나, 백그라운드에서 Precomputer로)
+    cancelled()가 True가 되면 다음 단계로 넘어가기 전에 Stale을 던진다.
+    """
+
+    def check() -> None:
+        if cancelled():
+            raise Stale()
+
+    if key is None:
+        key = support_tables_key(choices, weights, basis_hour_value, discretionary, alpha_mode)
+    df_now = calc_opportunity_cost_table(choices, basis_hour_value, weights=weights, alpha_mode=alpha_mode)
+    total_now = float(df_now["가치환산(원)"].sum()) if not df_now.empty else 0.0
+    categories = support_categories(choices, weights)
+    if len(categories) < 2:
+        return SupportTables(key, df_now, total_now, categories, None, None, None, {}, None)
+
+    check()
+    profile = reallocation_profile(choices, weights, basis_hour_value, df_now, categories, alpha_mode)
+    gains = calc_reallocation_gains(profile, 1.0)
+    sweep_gains = calc_reallocation_gains(profile, SWEEP)
+
+    check()
+    budget = max(0.0, float(discretionary))
+    optimal = optimize_choices(choices, budget, basis_hour_value, categories=categories, weights=weights, alpha_mode=alpha_mode)
+
+    # 대안 비교: 화면의 기본 선택(첫 번째 범주 +, 두 번째 범주 -)부터
+    pairs = [(categories[0], categories[1])]
+    if len(categories) <= MAX_SCENARIO_CATEGORIES:
+        pairs += [(a, r) for a in categories for r in categories if a != r and (a, r) != pairs[0]]
+    scenarios: Dict[Tuple[str, str, float], Tuple["pd.DataFrame", float]] = {}
+    for a, r in pairs:
+        check()
+        scenarios[(a, r, SCENARIO_DELTA_H)] = scenario_table(choices, weights, basis_hour_value, a, r, SCENARIO_DELTA_H, alpha_mode)
+
+    return SupportTables(key, df_now, total_now, categories, profile, gains, sweep_gains, scenarios, optimal)
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="precompute")
+        return _executor
+
+
+class Precomputer:
+    """
+    한 세션의 백그라운드 계산. 마지막으로 예약한 입력(key)의 작업 하나만 유지한다.
+    - schedule(key, fn, ...): 같은 key가 이미 예약/완료돼 있으면 그대로, 아니면 이전 작업을 취소하고 새로 예약
+    - result(key): 그 key의 결과 (도는 중이면 끝날 때까지 기다림, 예약이 없거나 실패했으면 None)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._key: Optional[str] = None
+        self._future: Optional[Future] = None
+        self._stop: Optional[threading.Event] = None
+
+    def schedule(self, key: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        with self._lock:
+            fut = self._future
+            if key == self._key and fut is not None and not (fut.done() and fut.exception() is not None):
+                return fut
+            self._cancel_locked()
+            stop = threading.Event()
+            self._key, self._stop = key, stop
+            self._future = _pool().submit(fn, *args, cancelled=stop.is_set, **kwargs)
+            incr("precompute.scheduled")
+            return self._future
+
+    def _cancel_locked(self) -> None:
+        if self._future is not None and not self._future.done():
+            self._future.cancel()
+            self._stop.set()
+            incr("precompute.cancelled")
+        self._key = self._future = self._stop = None
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancel_locked()
+
+    def ready(self, key: str) -> bool:
+        with self._lock:
+            return key == self._key and self._future is not None and self._future.done()
+
+    def result(self, key: str, timeout: Optional[float] = None) -> Any:
+        with self._lock:
+            fut = self._future if key == self._key else None
+        if fut is None:
+            return None
+        try:
+            return fut.result(timeout)
+        except Exception:
+            # 실패/취소/시간 초과면 화면에서 직접 계산 (오류도 거기서 드러난다)
+            return None
+
+
+def for_session(session_state: MutableMapping[str, Any]) -> Precomputer:
+    """세션 상태(st.session_state)에 붙어 있는 Precomputer (없으면 만든다)."""
+    pre = session_state.get(SESSION_KEY)
+    if pre is None:
+        pre = session_state[SESSION_KEY] = Precomputer()
+    return pre
+
+
+def schedule_support_tables(pre: Precomputer, s: AppState, discretionary: float) -> str:
+    """
+    지금 입력으로 의사결정 지원 표 계산을 예약하고 key를 돌려준다.
+    입력은 복사해서 넘긴다: ChoiceTable은 열 배열까지, 목록은 새 목록으로
+    (choice 객체는 제자리에서 고치지 않고 바꿀 때 새로 만든다 — choices.with_hours)
+    """
+    choices = s.choices.copy() if isinstance(s.choices, ChoiceTable) else list(s.choices)
+    weights = dict(s.weights)
+    key = support_tables_key(choices, weights, s.basis_hour_value, discretionary, s.valuation_mode)
+    job = functools.partial(compute_support_tables, key=key)
+    pre.schedule(key, job, choices, weights, float(s.basis_hour_value), float(discretionary), s.valuation_mode)
+    return key
+
+
+def support_tables(pre: Precomputer, s: AppState, discretionary: float) -> SupportTables:
+    """미리 계산된 결과가 있으면 그것을, 없으면 지금 계산한다."""
+    key = support_tables_key(s.choices, s.weights, s.basis_hour_value, discretionary, s.valuation_mode)
+    tables = pre.result(key)
+    if tables is not None:
+        incr("precompute.hit")
+        return tables
+    incr("precompute.miss")
+    return compute_support_tables(s.choices, s.weights, s.basis_hour_value, discretionary, s.valuation_mode, key=key)
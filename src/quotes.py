@@ -1,6 +1,16 @@
 # 격언, 문구
+# - QUOTES: 상태(버킷)별 문구 묶음
+# - RULES: 범주 시간 비율 기준의 상태 규칙 (DEV_first.md 7.2) -> 어느 버킷의 문구를 보여줄지
+# - RuleEngine: 규칙을 경계값 배열로 컴파일해 두고, 한 사람(대화형)이든 수천 일치 기록(배치)이든 한 번에 평가
+#   문구 선택은 (seed, key) 해시로 정해서 같은 입력이면 항상 같은 문구 (rerun마다 바뀌지 않음)
+import math
 import random
-from typing import List
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import ChoiceBlock, ChoiceTable, TimeBasics
 
 # quote.py
 
@@ -104,6 +114,180 @@ QUOTES = {
 }
 
 
+# -----------------------------
+# 상태 규칙
+# -----------------------------
+DEFAULT_BUCKET = "base"
+
+# 규칙 입력(특징): 범주 묶음별 시간 비율(0~1, 선택 시간 합계 대비) + 수면 시간
+GROUPS: Tuple[str, ...] = ("market", "human_capital", "rest", "low_value")
+FEATURES: Tuple[str, ...] = GROUPS + ("sleep_h",)
+
+# 범주(label) -> 묶음 (기본 선택지 4개, state._default_state와 같은 이름)
+CATEGORY_GROUPS: Dict[str, str] = {
+    "생산활동": "market",
+    "인적자본 축적": "human_capital",
+    "회복,건강,여가": "rest",
+    "소비성 여가, 저생산 활동": "low_value",
+}
+
+INF = math.inf
+
+
+@dataclass(frozen=True)
+class Rule:
+    """when의 모든 조건(특징 -> [하한, 상한))을 만족하면 bucket. 규칙은 앞에 있을수록 우선."""
+    bucket: str
+    when: Mapping[str, Tuple[float, float]]
+    note: str = ""
+
+
+RULES: Tuple[Rule, ...] = (
+    Rule("recovery_mode", {"sleep_h": (0.0, 6.0)}, "기본생활(수면)이 부족: 기초 회복 우선"),
+    Rule("over_consumption", {"low_value": (0.5, INF)}, "소비성 여가가 절반 이상"),
+    Rule("growth_and_market", {"market": (0.3, INF), "human_capital": (0.3, INF)}, "실행과 성장이 함께"),
+    Rule("preparation_mode", {"human_capital": (0.4, INF), "market": (0.0, 0.2)}, "미래 투자 위주, 즉시 수입은 적음"),
+    Rule("recovery_mode", {"rest": (0.4, INF), "human_capital": (0.0, 0.2)}, "휴식 비율이 높고 미래 투자가 낮음: 회복 + 작은 시작"),
+    Rule("market_high", {"market": (0.5, INF)}, "즉시 수입 비중이 높음: 현실 유지 + 번아웃 예방"),
+    Rule("human_capital_high", {"human_capital": (0.4, INF)}, "미래 투자가 일정 이상: 강화/지속"),
+    Rule("rest_high", {"rest": (0.35, INF)}),
+    Rule("low_value_high", {"low_value": (0.3, INF)}),
+    Rule("human_capital_low", {"human_capital": (0.0, 0.1)}),
+    Rule("market_low", {"market": (0.0, 0.1)}),
+    Rule("low_value_low", {"low_value": (0.0, 0.1)}),
+)
+
+
+def group_matrix(labels: Sequence[str], groups: Mapping[str, str] = CATEGORY_GROUPS) -> np.ndarray:
+    """(C, len(GROUPS)) 0/1 행렬: 범주가 어느 묶음에 속하는지 (묶음에 없는 범주는 0행)."""
+    g = np.zeros((len(labels), len(GROUPS)))
+    col = {name: j for j, name in enumerate(GROUPS)}
+    for i, label in enumerate(labels):
+        j = col.get(groups.get(str(label), ""))
+        if j is not None:
+            g[i, j] = 1.0
+    return g
+
+
+def features_from_hours(
+    labels: Sequence[str],
+    hours: np.ndarray,
+    sleep_h: Optional[np.ndarray] = None,
+    groups: Mapping[str, str] = CATEGORY_GROUPS,
+) -> np.ndarray:
+    """
+    (N, C) 범주별 시간 -> (N, len(FEATURES)) 특징.
+    - 비율의 분모는 모든 범주 시간 합계 (묶음에 없는 범주도 포함)
+    - 시간 합계가 0이면 비율은 NaN (비율 조건은 모두 불만족), sleep_h가 없으면 NaN
+    """
+    hours = np.clip(np.atleast_2d(np.asarray(hours, dtype=float)), 0.0, None)
+    total = hours.sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratios = np.where(total > 0, (hours @ group_matrix(labels, groups)) / total, np.nan)
+    sleep = np.full(len(hours), np.nan) if sleep_h is None else np.asarray(sleep_h, dtype=float).reshape(len(hours))
+    return np.column_stack([ratios, sleep])
+
+
+def state_features(choices: Iterable[ChoiceBlock], basics: Optional[TimeBasics] = None) -> np.ndarray:
+    """현재 선택(choices)과 기본생활(basics) -> (len(FEATURES),) 특징."""
+    if isinstance(choices, ChoiceTable):
+        by_label = choices.category_hours()
+    else:
+        by_label: Dict[str, float] = {}
+        for c in choices:
+            by_label[str(c.label)] = by_label.get(str(c.label), 0.0) + max(0.0, float(c.hours))
+    sleep = None if basics is None else np.array([basics.sleep_h])
+    return features_from_hours(list(by_label), np.array([list(by_label.values())]), sleep)[0]
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _uniform(seed: int, keys: np.ndarray) -> np.ndarray:
+    """(seed, key)마다 고정된 [0, 1) 값 (splitmix64). 배치를 어떻게 나눠 돌려도 같은 key면 같은 값."""
+    offset = np.uint64((int(seed) * 0x9E3779B97F4A7C15 + 0x632BE59BD9B4E019) & _MASK64)
+    with np.errstate(over="ignore"):
+        x = np.asarray(keys).astype(np.uint64) + offset
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x = x ^ (x >> np.uint64(31))
+    return (x >> np.uint64(11)).astype(float) / float(1 << 53)
+
+
+class RuleEngine:
+    """
+    규칙 목록을 (규칙 × 특징) 하한/상한 배열로 컴파일한 평가기.
+    - evaluate(X): (N, F) 특징 -> 버킷 번호 (N,) (첫 번째로 맞는 규칙, 없으면 기본 버킷)
+    - choose(X, seed, keys): 버킷 번호 + 문구 번호 (N,)
+    - pick(features, seed, key): 한 건 -> (버킷 이름, 문구)
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[Rule] = RULES,
+        quotes: Mapping[str, Sequence[str]] = QUOTES,
+        default: str = DEFAULT_BUCKET,
+    ) -> None:
+        col = {name: j for j, name in enumerate(FEATURES)}
+        for r in rules:
+            unknown = [k for k in r.when if k not in col]
+            if unknown:
+                raise ValueError(f"알 수 없는 특징입니다: {unknown} (가능: {', '.join(FEATURES)})")
+        missing = [b for b in [r.bucket for r in rules] + [default] if not quotes.get(b)]
+        if missing:
+            raise ValueError(f"문구가 없는 버킷입니다: {sorted(set(missing))}")
+
+        self.rules = tuple(rules)
+        self.buckets: Tuple[str, ...] = tuple(r.bucket for r in rules) + (default,)
+        lo = np.full((len(rules), len(FEATURES)), -INF)
+        hi = np.full((len(rules), len(FEATURES)), INF)
+        for i, r in enumerate(rules):
+            for name, (a, b) in r.when.items():
+                lo[i, col[name]], hi[i, col[name]] = a, b
+        self._lo, self._hi = lo, hi
+        self._free = np.isneginf(lo) & np.isposinf(hi)  # 조건 없는 특징 (NaN이어도 통과)
+
+        # 버킷별 문구를 한 줄로 펴 두고 (시작 위치, 개수)로 고른다
+        texts: List[str] = []
+        start, count = [], []
+        for b in self.buckets:
+            start.append(len(texts))
+            count.append(len(quotes[b]))
+            texts.extend(quotes[b])
+        self.texts: Tuple[str, ...] = tuple(texts)
+        self._start = np.array(start)
+        self._count = np.array(count)
+
+    def evaluate(self, features: np.ndarray) -> np.ndarray:
+        x = np.atleast_2d(np.asarray(features, dtype=float))[:, None, :]  # (N, 1, F)
+        with np.errstate(invalid="ignore"):
+            ok = ((x >= self._lo) & (x < self._hi)) | self._free  # (N, R, F)
+        hit = ok.all(axis=2)
+        return np.where(hit.any(axis=1), hit.argmax(axis=1), len(self.rules))
+
+    def choose(self, features: np.ndarray, seed: int = 0, keys: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """returns: (버킷 번호 (N,), self.texts의 문구 번호 (N,)). keys 기본값은 0..N-1"""
+        bucket = self.evaluate(features)
+        keys = np.arange(len(bucket)) if keys is None else np.asarray(keys).reshape(len(bucket))
+        pos = np.minimum((_uniform(seed, keys) * self._count[bucket]).astype(np.int64), self._count[bucket] - 1)
+        return bucket, self._start[bucket] + pos
+
+    def pick_many(self, features: np.ndarray, seed: int = 0, keys: Optional[np.ndarray] = None) -> List[Tuple[str, str]]:
+        bucket, quote = self.choose(features, seed, keys)
+        return [(self.buckets[b], self.texts[q]) for b, q in zip(bucket, quote)]
+
+    def pick(self, features: np.ndarray, seed: int = 0, key: int = 0) -> Tuple[str, str]:
+        return self.pick_many(np.atleast_2d(features), seed, np.array([key]))[0]
+
+
+DEFAULT_ENGINE = RuleEngine()
+
+
+def state_quote(choices: Iterable[ChoiceBlock], basics: Optional[TimeBasics] = None, *, seed: int = 0, key: int = 0) -> Tuple[str, str]:
+    """현재 상태 -> (버킷 이름, 문구). 같은 상태/seed/key면 같은 문구."""
+    return DEFAULT_ENGINE.pick(state_features(choices, basics), seed, key)
+
+
 def get_quotes() -> List[str]:
     return [
         "당신의 시간 가치는 숫자로만 정의되지 않는다.",
@@ -115,5 +299,9 @@ def get_quotes() -> List[str]:
 # 이부분은 생성형 ai의 도움을 받던지, 그냥 유명한 격언으로 채워도 가능.
 # 데이터 폴더부분을 통해서 잘 정리해보자.
 
-def pick_quote() -> str:
-    return random.choice(get_quotes())
+def pick_quote(bucket: str = DEFAULT_BUCKET, seed: Optional[int] = None) -> str:
+    """QUOTES[bucket]에서 하나 (없는 버킷이면 기본 버킷). seed를 주면 항상 같은 문구."""
+    quotes = QUOTES.get(bucket) or QUOTES[DEFAULT_BUCKET]
+    if seed is None:
+        return random.choice(quotes)
+    return quotes[min(int(_uniform(seed, np.array([0]))[0] * len(quotes)), len(quotes) - 1)]
@@ -19,7 +19,7 @@ def render_results_page(s: AppState, discretionary: float, fixed: dict) -> None:
         st.info("선택지(시간 배분)가 아직 없어. 입력 탭에서 추가해줘.")
         return
 
-    df = calc_opportunity_cost_table(s.choices, s.basis_hour_value, weights=s.weights)
+    df = calc_opportunity_cost_table(s.choices, s.basis_hour_value, weights=s.weights, alpha_mode=s.valuation_mode)
     df_show = df.copy()
     df_show["가치환산(원)"] = df_show["가치환산(원)"].apply(krw)
     st.dataframe(df_show, use_container_width=True, hide_index=True)
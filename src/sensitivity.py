@@ -0,0 +1,215 @@
+# 가중치 / 시간가치 기준에 대한 가치 반응면 (슬라이더 미리보기용)
+# - 가치 = 기준가치 × Σ 시간 × alpha(가중치) × p_conv × multiplier 라서
+#   지금 배분(choices)만 정해지면 범주별 "가중치 0~100점일 때의 가치"를 (범주 × 101) 표로 미리 만들 수 있다
+# - 그러면 가중치 조합·기준가치가 무엇이든 합계는 범주마다 표 한 칸씩 더하고 기준가치를 곱하면 끝 (다시 환산하지 않음)
+# - 편미분(∂합계/∂가중치, ∂합계/∂시간, ∂합계/∂기준가치)과 탄력성도 같은 표에서 바로 나온다
+# - 표는 choices + 가중치 범주 목록 + alpha 모드로만 정해지므로 슬라이더를 움직이는 동안에는 같은 표를 재사용
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cache import cached_result
+from .calc import calc_opportunity_cost, krw, resolve_config, resolve_factor_vectors
+from .modes import DEFAULT_MODE, get_mode
+
+WEIGHT_GRID = np.arange(101)  # 가중치 슬라이더 값 (0~100, 정수)
+HINT_STEP = 10  # "가장 크게 움직이는 가중치" 힌트의 기준 변화폭(점)
+
+
+def alpha_grid(alpha_mode: str = DEFAULT_MODE) -> np.ndarray:
+    """가중치 0~100 -> alpha 표 (101,) (모드에 미리 만들어 둔 표)."""
+    return get_mode(alpha_mode).alpha
+
+
+@dataclass(frozen=True)
+class Elasticities:
+    """
+    지금 가중치 / 기준가치에서의 변화율 (C=가중치 범주 수)
+    - d_weight: ∂합계/∂가중치(원/점), d_hours: ∂합계/∂시간(원/시간), d_basis: ∂합계/∂기준가치(시간)
+    - weight / hours / basis: 탄력성 (해당 값이 1% 바뀔 때 합계가 몇 % 바뀌는지, 합계가 0이면 0)
+    """
+
+    categories: Tuple[str, ...]
+    d_weight: np.ndarray
+    d_hours: np.ndarray
+    d_basis: float
+    weight: np.ndarray
+    hours: np.ndarray
+    basis: float
+
+
+@dataclass(frozen=True)
+class WeightHint:
+    category: str
+    weight: int
+    up: float  # 가중치 +step일 때 합계 변화(원)
+    down: float  # 가중치 -step일 때 합계 변화(원)
+
+    def describe(self, step: int = HINT_STEP) -> str:
+        return f"{self.category}: +{step}점 {_signed(self.up)} / -{step}점 {_signed(self.down)}"
+
+
+def _signed(x: float) -> str:
+    return f"+{krw(x)}" if x > 0 else (krw(x) if x < 0 else "변화 없음")
+
+
+@dataclass(frozen=True)
+class SensitivitySurface:
+    """
+    기준가치 1원/시간 기준의 반응면
+    - categories: 가중치 범주 (weights 키 순서)
+    - exposure: 범주별 Σ 시간 × p_conv × multiplier (C,)
+    - unit_value: 범주 c의 가중치가 w일 때 그 범주의 가치 (C, 101) = exposure[c] × alpha(w)
+    - rest: 가중치와 상관없는 부분(가중치 범주 밖 choice)의 가치
+    - hours / marginal: 범주별 시간, 범주에 1시간 더할 때의 p_conv × multiplier (C,)
+    """
+
+    categories: Tuple[str, ...]
+    alpha_mode: str
+    alpha: np.ndarray
+    exposure: np.ndarray
+    unit_value: np.ndarray
+    rest: float
+    hours: np.ndarray
+    marginal: np.ndarray
+
+    # -----------------------------
+    # 조회 (모두 표 조회 + 곱셈)
+    # -----------------------------
+    def weight_index(self, weights: Mapping[str, Any]) -> np.ndarray:
+        """weights -> 범주별 표 열 번호 (없는 범주는 중립 50, 0~100으로 자름)."""
+        out = np.empty(len(self.categories), dtype=np.intp)
+        for i, c in enumerate(self.categories):
+            try:
+                out[i] = int(weights.get(c, 50))
+            except (TypeError, ValueError):
+                out[i] = 50
+        return np.clip(out, 0, 100)
+
+    def category_values(self, weights: Mapping[str, Any], basis_hour_value: float) -> np.ndarray:
+        """범주별 가치 (C,)"""
+        idx = self.weight_index(weights)
+        return self.unit_value[np.arange(len(idx)), idx] * _basis(basis_hour_value)
+
+    def total(self, weights: Mapping[str, Any], basis_hour_value: float) -> float:
+        idx = self.weight_index(weights)
+        return float((self.rest + self.unit_value[np.arange(len(idx)), idx].sum()) * _basis(basis_hour_value))
+
+    def weight_curves(self, weights: Mapping[str, Any], basis_hour_value: float) -> np.ndarray:
+        """(C, 101): 행 c = 범주 c의 가중치만 0~100으로 움직일 때의 합계 (나머지는 지금 값)."""
+        idx = self.weight_index(weights)
+        rows = np.arange(len(idx))
+        now = self.unit_value[rows, idx]
+        others = self.rest + now.sum() - now
+        return (others[:, np.newaxis] + self.unit_value) * _basis(basis_hour_value)
+
+    def weight_curve(self, category: str, weights: Mapping[str, Any], basis_hour_value: float) -> np.ndarray:
+        """(101,): category 가중치만 0~100으로 움직일 때의 합계."""
+        i = self.categories.index(category)
+        idx = self.weight_index(weights)
+        now = self.unit_value[np.arange(len(idx)), idx]
+        return (self.rest + now.sum() - now[i] + self.unit_value[i]) * _basis(basis_hour_value)
+
+    def basis_curve(self, weights: Mapping[str, Any], basis_grid: Sequence[float]) -> np.ndarray:
+        """기준가치 후보별 합계 (합계는 기준가치에 비례)."""
+        grid = np.clip(np.asarray(basis_grid, dtype=float), 0.0, None)
+        return self.total(weights, 1.0) * grid
+
+    # -----------------------------
+    # 편미분 / 탄력성
+    # -----------------------------
+    def elasticities(self, weights: Mapping[str, Any], basis_hour_value: float) -> Elasticities:
+        """
+        ∂합계/∂가중치 = 기준가치 × exposure × (alpha 기울기: 표의 1점 차이)
+        (0점 / 100점 끝에서는 안쪽 방향 기울기, 선형 곡선이면 정확한 기울기)
+        """
+        b = _basis(basis_hour_value)
+        idx = self.weight_index(weights)
+        rows = np.arange(len(idx))
+        hi = np.minimum(idx + 1, 100)
+        lo = np.maximum(hi - 1, 0)
+        slope = self.alpha[hi] - self.alpha[lo]
+        d_weight = b * self.exposure * slope
+        d_hours = b * self.alpha[idx] * self.marginal
+        total = self.total(weights, b)
+        d_basis = total / b if b > 0 else self.total(weights, 1.0)
+        if total > 0:
+            e_weight = d_weight * idx / total
+            e_hours = b * self.alpha[idx] * self.exposure / total  # 범주가 합계에서 차지하는 몫
+            e_basis = 1.0
+        else:
+            e_weight = np.zeros(len(rows))
+            e_hours = np.zeros(len(rows))
+            e_basis = 0.0
+        return Elasticities(self.categories, d_weight, d_hours, float(d_basis), e_weight, e_hours, e_basis)
+
+    def weight_hints(
+        self,
+        weights: Mapping[str, Any],
+        basis_hour_value: float,
+        *,
+        step: int = HINT_STEP,
+        limit: Optional[int] = None,
+    ) -> List[WeightHint]:
+        """가중치를 ±step점 바꿀 때 합계가 크게 움직이는 범주 순서."""
+        idx = self.weight_index(weights)
+        curves = self.weight_curves(weights, basis_hour_value)
+        rows = np.arange(len(idx))
+        now = curves[rows, idx]
+        up = curves[rows, np.minimum(idx + step, 100)] - now
+        down = curves[rows, np.maximum(idx - step, 0)] - now
+        order = np.argsort(-np.maximum(np.abs(up), np.abs(down)), kind="stable")
+        if limit is not None:
+            order = order[:limit]
+        return [WeightHint(self.categories[i], int(idx[i]), float(up[i]), float(down[i])) for i in order.tolist()]
+
+
+def _basis(x: Any) -> float:
+    try:
+        v = float(x)
+    except (TypeError, ValueError):
+        return 0.0
+    return v if v > 0.0 else 0.0
+
+
+@cached_result()
+def sensitivity_surface(
+    choices: Any,
+    categories: Sequence[str],
+    alpha_mode: str = DEFAULT_MODE,
+) -> SensitivitySurface:
+    """
+    choices(지금 배분)와 가중치 범주 목록으로 반응면을 만든다.
+    가중치 값이나 기준가치는 키에 들어가지 않으므로, 슬라이더를 움직이는 동안에는 캐시에서 같은 표를 쓴다.
+    """
+    cats = tuple(str(c) for c in categories)
+    index = {c: i for i, c in enumerate(cats)}
+    cfg = resolve_config(None, None, alpha_mode)  # 모드의 p_conv / multiplier 기본값
+    labels, result = calc_opportunity_cost(choices, 1.0, None, None, alpha_mode)
+    hours = result.hours[0]
+    pm = result.p_conv[0] * result.multiplier[0]
+
+    code = np.fromiter((index.get(lb, -1) for lb in labels), dtype=np.intp, count=len(labels))
+    inside = code >= 0
+    n = len(cats)
+    exposure = np.bincount(code[inside], weights=(hours * pm)[inside], minlength=n)
+    cat_hours = np.bincount(code[inside], weights=hours[inside], minlength=n)
+    rest = float(result.value[0][~inside].sum())
+
+    # 범주에 1시간 더할 때의 p_conv × multiplier: 있는 choice들의 시간 가중 평균, 시간이 없으면 범주 기본값
+    _, p_conv, mult = resolve_factor_vectors(cats, cfg)
+    marginal = np.where(cat_hours > 0, exposure / np.where(cat_hours > 0, cat_hours, 1.0), p_conv * mult)
+
+    alpha = alpha_grid(alpha_mode)
+    unit_value = exposure[:, np.newaxis] * alpha[np.newaxis, :]
+    for arr in (exposure, unit_value, cat_hours, marginal):
+        arr.setflags(write=False)
+    return SensitivitySurface(cats, alpha_mode, alpha, exposure, unit_value, rest, cat_hours, marginal)
+
+
+def surface_for(choices: Any, weights: Dict[str, Any], alpha_mode: str = DEFAULT_MODE) -> SensitivitySurface:
+    """weights의 범주(키)로 반응면 (값은 조회할 때 넘긴다)."""
+    return sensitivity_surface(choices, tuple(weights), alpha_mode)
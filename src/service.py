@@ -0,0 +1,578 @@
+# 로컬 HTTP 채점 서비스 (Streamlit 없이 JSON으로 계산 결과를 받고 싶은 도구용)
+#
+#   python -m src.service --port 8765
+#   curl -s localhost:8765/score -d '{"hours": {"생산활동": 4}, "weights": {"생산활동": 80}, "basis_hour_value": 12000}'
+#
+# 엔드포인트 (요청/응답 모두 JSON, 요청 형식은 batch.py의 JSONL 한 줄과 같다)
+# - POST /discretionary  {"basics": {...}} -> discretionary_h, fixed
+# - POST /score          하루 기록 하나 또는 {"records": [...]} -> discretionary_h, values, total_value
+#                        짧은 시간(BATCH_WINDOW_S) 안에 들어온 요청은 모아서 한 번에 환산 (Batcher)
+# - POST /table          {"choices" 또는 "hours", "basis_hour_value", "weights"} -> 환산표 행들 (calc_opportunity_cost_table과 같은 열)
+# - POST /reallocate     /table 입력 + "delta_h", "limit" -> 재배분 변화량 순위
+#                        ("add_to", "reduce_from"가 있으면 그 대안 하나의 합계 비교)
+# - GET  /health, GET /metrics (요청 수, 처리량, 엔드포인트별 지연 p50/p95/max, 배치 크기)
+# 모든 POST는 "alpha_mode"로 가치 환산 모드를 고를 수 있다 (기본: modes.DEFAULT_MODE)
+#
+# 연결: HTTP/1.1 keep-alive (유휴 KEEPALIVE_S초 뒤 닫음), 동시 연결 수는 max_connections까지
+# 계산: /score는 배치 스레드 하나가 환산 (기다리는 기록이 MAX_PENDING을 넘으면 503),
+#       나머지 POST는 동시에 workers개까지 (자리가 QUEUE_TIMEOUT_S초 안에 안 나면 503)
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from . import instrument
+from .batch import DayRecord, _basics_from, _record_from_json, score_records_modes
+from .calc import (
+    OC_TABLE_COLUMNS,
+    OCBatchResult,
+    build_reallocation_profile,
+    calc_discretionary_hours,
+    calc_opportunity_cost,
+    calc_reallocation_gains,
+    rank_reallocation_moves,
+    resolve_config,
+    resolve_factor_vectors,
+)
+from .choices import normalize_choices, reallocate_hours
+from .instrument import incr, timer
+from .models import FACTOR_COLUMNS, ChoiceTable
+from .modes import DEFAULT_MODE, get_mode
+from .precompute import support_categories
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4  # 동시에 계산하는 요청 수
+DEFAULT_MAX_CONNECTIONS = 64
+BATCH_WINDOW_S = 0.002  # 첫 요청 뒤 이만큼 더 기다리며 같이 환산할 요청을 모은다
+MAX_BATCH = 512  # 배치 하나의 최대 기록 수
+MAX_PENDING = 8192  # 배치를 기다리는 기록 수 상한
+QUEUE_TIMEOUT_S = 5.0
+KEEPALIVE_S = 15.0
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+
+class BadRequest(ValueError):
+    """요청 본문이 잘못됐을 때 (400)."""
+
+
+class Busy(RuntimeError):
+    """처리할 자리가 없을 때 (503)."""
+
+
+# -----------------------------
+# 요청 모으기
+# -----------------------------
+class Batcher:
+    """
+    여러 스레드가 submit한 작업을 모아 한 번에 처리한다.
+    - 첫 작업이 들어오면 window_s 동안(또는 max_items가 찰 때까지) 더 기다렸다가
+      같은 key끼리 items를 이어 붙여 fn(key, items) 한 번으로 처리하고, 결과를 작업별로 나눠 돌려준다
+    - fn은 items와 같은 길이의 결과 목록을 돌려줘야 한다
+    - 아직 처리 못 한 items가 max_pending을 넘으면 submit이 Busy
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[Any, List[Any]], Sequence[Any]],
+        window_s: float = BATCH_WINDOW_S,
+        max_items: int = MAX_BATCH,
+        max_pending: int = MAX_PENDING,
+    ) -> None:
+        self._fn = fn
+        self._window_s = max(0.0, float(window_s))
+        self._max_items = max(1, int(max_items))
+        self._max_pending = max(1, int(max_pending))
+        self.pending = 0
+        self._queue: "queue.Queue[Optional[Tuple[Any, List[Any], Future]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.max_size = 0
+        self._thread = threading.Thread(target=self._loop, name="service-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, key: Any, items: List[Any]) -> Future:
+        items = list(items)
+        with self._lock:
+            if self.pending and self.pending + len(items) > self._max_pending:
+                raise Busy("배치 대기열이 가득 찼습니다.")
+            self.pending += len(items)
+        fut: Future = Future()
+        self._queue.put((key, items, fut))
+        return fut
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self.batches,
+                "items": self.items,
+                "mean_size": self.items / self.batches if self.batches else 0.0,
+                "max_size": self.max_size,
+                "pending": self.pending,
+            }
+
+    def _loop(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            jobs = [job]
+            n = len(job[1])
+            deadline = time.perf_counter() + self._window_s
+            stop = False
+            while n < self._max_items:
+                remaining = deadline - time.perf_counter()
+                try:
+                    nxt = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                jobs.append(nxt)
+                n += len(nxt[1])
+            self._run(jobs)
+            if stop:
+                return
+
+    def _run(self, jobs: List[Tuple[Any, List[Any], Future]]) -> None:
+        with self._lock:
+            self.pending -= sum(len(items) for _, items, _ in jobs)
+        groups: Dict[Any, List[Tuple[List[Any], Future]]] = {}
+        for key, items, fut in jobs:
+            if fut.set_running_or_notify_cancel():
+                groups.setdefault(key, []).append((items, fut))
+        for key, group in groups.items():
+            flat = [x for items, _ in group for x in items]
+            try:
+                with timer("service.batch"):
+                    results = self._fn(key, flat)
+            except Exception as e:
+                for _, fut in group:
+                    fut.set_exception(e)
+                continue
+            with self._lock:
+                self.batches += 1
+                self.items += len(flat)
+                self.max_size = max(self.max_size, len(flat))
+            pos = 0
+            for items, fut in group:
+                fut.set_result(results[pos : pos + len(items)])
+                pos += len(items)
+
+
+# -----------------------------
+# 계산 (JSON -> 계산 함수 -> JSON)
+# -----------------------------
+def _alpha_mode(body: Dict[str, Any]) -> str:
+    name = str(body.get("alpha_mode") or DEFAULT_MODE)
+    try:
+        return get_mode(name).name
+    except ValueError as e:
+        raise BadRequest(str(e)) from None
+
+
+def _float(body: Dict[str, Any], key: str, default: float) -> float:
+    try:
+        return float(body.get(key, default))
+    except (TypeError, ValueError):
+        raise BadRequest(f"{key}는 숫자여야 합니다.") from None
+
+
+def choices_from_json(body: Dict[str, Any]) -> ChoiceTable:
+    """{"choices": [{"label", "hours", (alpha / p_conv / multiplier)}]} 또는 {"hours": {label: h}} -> ChoiceTable."""
+    rows = body.get("choices")
+    if isinstance(rows, list):
+        if not all(isinstance(r, dict) for r in rows):
+            raise BadRequest("choices는 {label, hours} 객체 목록이어야 합니다.")
+        factors = {k: [r.get(k, np.nan) for r in rows] for k in FACTOR_COLUMNS if any(k in r for r in rows)}
+        try:
+            return ChoiceTable.from_columns([str(r.get("label", "")) for r in rows], [r.get("hours", 0.0) for r in rows], **factors)
+        except (TypeError, ValueError) as e:
+            raise BadRequest(f"choices를 읽을 수 없습니다: {e}") from None
+    hours = body.get("hours")
+    if isinstance(hours, dict):
+        try:
+            return ChoiceTable.from_columns([str(k) for k in hours], list(hours.values()))
+        except (TypeError, ValueError) as e:
+            raise BadRequest(f"hours를 읽을 수 없습니다: {e}") from None
+    raise BadRequest("choices 또는 hours가 필요합니다.")
+
+
+def _weights(body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    w = body.get("weights")
+    if w is None:
+        return None
+    if not isinstance(w, dict):
+        raise BadRequest("weights는 {범주: 0~100} 객체여야 합니다.")
+    return w
+
+
+def score_batch(alpha_mode: str, records: List[DayRecord]) -> List[Dict[str, Any]]:
+    """기록 여러 개를 한 번에 환산 (Batcher의 fn)."""
+    labels, values, disc = score_records_modes(records, [alpha_mode])
+    out = []
+    for rec, row, d in zip(records, values[0], disc):
+        out.append(
+            {
+                "discretionary_h": float(d),
+                "values": {label: float(v) for label, v in zip(labels, row) if label in rec.hours},
+                "total_value": float(row.sum()),
+            }
+        )
+    return out
+
+
+def handle_discretionary(body: Dict[str, Any]) -> Dict[str, Any]:
+    basics = body.get("basics", body)
+    if not isinstance(basics, dict):
+        raise BadRequest("basics는 객체여야 합니다.")
+    discretionary, fixed = calc_discretionary_hours(_basics_from(basics))
+    return {"discretionary_h": discretionary, "fixed": fixed}
+
+
+def _oc_rows(labels: Sequence[str], result: OCBatchResult) -> List[Dict[str, Any]]:
+    """환산 결과 한 시나리오 -> 환산표(OC_TABLE_COLUMNS)와 같은 열의 행 목록 (pandas 없이)."""
+    cols = (result.hours, result.basis, result.alpha, result.p_conv, result.multiplier, result.v_effective, result.value)
+    return [
+        dict(zip(OC_TABLE_COLUMNS, (label, *(float(c[0, j]) for c in cols))))
+        for j, label in enumerate(labels)
+    ]
+
+
+def handle_table(body: Dict[str, Any]) -> Dict[str, Any]:
+    labels, result = calc_opportunity_cost(
+        choices_from_json(body), _float(body, "basis_hour_value", 0.0), weights=_weights(body), alpha_mode=_alpha_mode(body)
+    )
+    return {"rows": _oc_rows(labels, result), "total_value": float(result.total[0])}
+
+
+def handle_reallocate(body: Dict[str, Any]) -> Dict[str, Any]:
+    choices = choices_from_json(body)
+    weights = _weights(body)
+    basis = _float(body, "basis_hour_value", 0.0)
+    delta_h = _float(body, "delta_h", 1.0)
+    mode = _alpha_mode(body)
+    _, now = calc_opportunity_cost(choices, basis, weights=weights, alpha_mode=mode)
+    total_now = float(now.total[0])
+    out: Dict[str, Any] = {"total_now": total_now}
+
+    add_to, reduce_from = body.get("add_to"), body.get("reduce_from")
+    if add_to is not None or reduce_from is not None:
+        if add_to is None or reduce_from is None:
+            raise BadRequest("add_to와 reduce_from은 함께 보내야 합니다.")
+        alt_choices, moved = reallocate_hours(choices, str(reduce_from), str(add_to), delta_h)
+        _, alt = calc_opportunity_cost(alt_choices, basis, weights=weights, alpha_mode=mode)
+        total_alt = float(alt.total[0])
+        out["scenario"] = {"add_to": add_to, "reduce_from": reduce_from, "moved_h": moved, "total_alt": total_alt, "gain": total_alt - total_now}
+        return out
+
+    categories = support_categories(choices, weights)
+    if len(categories) < 2:
+        out["moves"] = []
+        return out
+    limit = body.get("limit")
+    try:
+        limit = None if limit is None else int(limit)
+    except (TypeError, ValueError):
+        raise BadRequest("limit은 정수여야 합니다.") from None
+    cfg = resolve_config(weights=weights, alpha_mode=mode)
+    alpha, p_conv, mult = resolve_factor_vectors(categories, cfg)
+    cols = normalize_choices(choices)
+    profile = build_reallocation_profile(
+        categories, cols.categories, cols.hours, now.v_effective[0], fallback_value=max(0.0, basis) * alpha * p_conv * mult
+    )
+    moves = rank_reallocation_moves(profile, calc_reallocation_gains(profile, delta_h), limit)
+    out["moves"] = [{"add_to": a, "reduce_from": r, "gain": g} for a, r, g in moves]
+    return out
+
+
+# -----------------------------
+# 처리량
+# -----------------------------
+class _Throughput:
+    """초 단위 요청 수 (최근 window_s초의 평균 처리량)."""
+
+    def __init__(self, window_s: int = 60) -> None:
+        self._lock = threading.Lock()
+        self._window_s = window_s
+        self._buckets: Deque[List[int]] = deque()  # [초, 요청 수]
+        self.started = time.time()
+        self.total = 0
+
+    def add(self) -> None:
+        now = int(time.time())
+        with self._lock:
+            self.total += 1
+            if self._buckets and self._buckets[-1][0] == now:
+                self._buckets[-1][1] += 1
+            else:
+                self._buckets.append([now, 1])
+            while self._buckets and self._buckets[0][0] <= now - self._window_s:
+                self._buckets.popleft()
+
+    def stats(self) -> Dict[str, float]:
+        now = time.time()
+        with self._lock:
+            recent = sum(n for t, n in self._buckets if t > now - self._window_s)
+            uptime = now - self.started
+            return {
+                "uptime_s": uptime,
+                "requests": self.total,
+                "rps_overall": self.total / uptime if uptime > 0 else 0.0,
+                f"rps_last_{self._window_s}s": recent / min(self._window_s, max(uptime, 1e-9)),
+            }
+
+
+# -----------------------------
+# 서버
+# -----------------------------
+_POST_ROUTES: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "/discretionary": handle_discretionary,
+    "/table": handle_table,
+    "/reallocate": handle_reallocate,
+}
+
+
+class ScoringServer(ThreadingHTTPServer):
+    """
+    연결마다 스레드 하나 (keep-alive 연결은 유휴 시간까지 유지), 연결 수는 max_connections까지.
+    /score는 Batcher로, 나머지 계산은 workers개 자리(semaphore)를 얻은 요청만 한다.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        *,
+        workers: int = DEFAULT_WORKERS,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        batch_window_s: float = BATCH_WINDOW_S,
+        max_batch: int = MAX_BATCH,
+    ) -> None:
+        # listen 대기열(기본 5)이 연결 상한보다 작으면 몰릴 때 503/연결 닫기 전에 TCP 단계에서 끊긴다
+        self.request_queue_size = max(int(max_connections), socket.SOMAXCONN)
+        super().__init__(address, ScoringHandler)
+        self.slots = threading.BoundedSemaphore(max(1, int(workers)))
+        self.connections = threading.BoundedSemaphore(max(1, int(max_connections)))
+        self.batcher = Batcher(score_batch, batch_window_s, max_batch)
+        self.throughput = _Throughput()
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.errors = 0
+        self.rejected = 0
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        if not self.connections.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            incr("service.rejected.connection")
+            self.shutdown_request(request)
+            return
+        super().process_request(request, client_address)
+
+    def process_request_thread(self, request: Any, client_address: Any) -> None:
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self.connections.release()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.batcher.close()
+
+    def score(self, body: Any) -> Any:
+        if isinstance(body, dict) and isinstance(body.get("records"), list):
+            rows, many = body["records"], True
+            mode = _alpha_mode(body)
+        else:
+            rows, many = [body], False
+            mode = _alpha_mode(body) if isinstance(body, dict) else DEFAULT_MODE
+        if not all(isinstance(r, dict) for r in rows):
+            raise BadRequest("기록은 JSON 객체여야 합니다.")
+        try:
+            records = [_record_from_json(r, 0.0) for r in rows]
+        except (AttributeError, TypeError, ValueError) as e:
+            raise BadRequest(f"기록을 읽을 수 없습니다: {e}") from None
+        results = self.batcher.submit(mode, records).result() if records else []
+        return {"results": results} if many else results[0]
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {"in_flight": self.in_flight, "errors": self.errors, "rejected": self.rejected}
+        latency = {
+            m.name: {"count": m.count, "p50_ms": m.p50_ms, "p95_ms": m.p95_ms, "max_ms": m.max_ms}
+            for m in instrument.process_stats()
+            if m.kind == "timer" and m.name.startswith("service")
+        }
+        return {**self.throughput.stats(), **counts, "batches": self.batcher.stats(), "latency": latency}
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive (응답마다 Content-Length)
+    timeout = KEEPALIVE_S
+    wbufsize = 64 * 1024  # 헤더와 본문을 한 번에 보낸다 (따로 보내면 Nagle + 지연 ACK로 요청마다 수십 ms)
+    server: ScoringServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # 요청마다 stderr에 찍지 않는다 (처리량은 /metrics로)
+        pass
+
+    def _send(self, status: int, obj: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(obj, ensure_ascii=False, default=_json_default).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if path == "/health":
+            self._send(200, {"ok": True})
+        elif path == "/metrics":
+            self._send(200, self.server.metrics())
+        else:
+            self._send(404, {"error": f"없는 경로: {path}"})
+
+    def do_POST(self) -> None:
+        path = urlsplit(self.path).path
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self.close_connection = True
+            self._send(400, {"error": "Content-Length가 잘못됐습니다."})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send(413, {"error": "요청 본문이 너무 큽니다."})
+            return
+        raw = self.rfile.read(length) if length > 0 else b""
+        if path != "/score" and path not in _POST_ROUTES:
+            self._send(404, {"error": f"없는 경로: {path}"})
+            return
+
+        server = self.server
+        # /score는 배치 스레드가 계산하므로 자리를 잡지 않는다 (잡으면 workers개 넘게 모이지 않는다)
+        slot = path != "/score"
+        if slot and not server.slots.acquire(timeout=QUEUE_TIMEOUT_S):
+            self._busy()
+            return
+        with server._lock:
+            server.in_flight += 1
+        try:
+            with timer(f"service{path}"):
+                status, result = self._dispatch(path, raw)
+        except Busy:
+            self._busy()
+            return
+        finally:
+            with server._lock:
+                server.in_flight -= 1
+            if slot:
+                server.slots.release()
+        server.throughput.add()
+        if status >= 400:
+            with server._lock:
+                server.errors += 1
+        self._send(status, result)
+
+    def _busy(self) -> None:
+        with self.server._lock:
+            self.server.rejected += 1
+        incr("service.rejected.busy")
+        self._send(503, {"error": "요청이 많아 처리하지 못했습니다. 잠시 뒤 다시 시도해 주세요."}, {"Retry-After": "1"})
+
+    def _dispatch(self, path: str, raw: bytes) -> Tuple[int, Any]:
+        try:
+            body = json.loads(raw.decode("utf-8")) if raw else {}
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            return 400, {"error": f"JSON을 읽을 수 없습니다: {e}"}
+        try:
+            if path == "/score":
+                return 200, self.server.score(body)
+            if not isinstance(body, dict):
+                raise BadRequest("요청 본문은 JSON 객체여야 합니다.")
+            return 200, _POST_ROUTES[path](body)
+        except BadRequest as e:
+            return 400, {"error": str(e)}
+        except Busy:
+            raise
+        except Exception as e:  # 계산 중 예상 못 한 오류: 연결은 유지하고 500으로 알린다
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+
+def _json_default(o: Any) -> Any:
+    if isinstance(o, np.generic):
+        return o.item()
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    raise TypeError(f"JSON으로 바꿀 수 없는 값: {type(o).__name__}")
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, **kwargs: Any) -> ScoringServer:
+    """서버 만들기 (port=0이면 빈 포트). 지연/처리량 측정을 위해 계측을 켠다."""
+    instrument.enable()
+    return ScoringServer((host, port), **kwargs)
+
+
+def serve_in_background(host: str = DEFAULT_HOST, port: int = 0, **kwargs: Any) -> Tuple[ScoringServer, threading.Thread]:
+    """백그라운드 스레드에서 서버 실행 (로컬 테스트 / 벤치마크용). 끝낼 때: server.shutdown(); server.server_close()"""
+    server = make_server(host, port, **kwargs)
+    thread = threading.Thread(target=server.serve_forever, name="service", daemon=True)
+    thread.start()
+    return server, thread
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.service", description="기회비용 계산 HTTP 서비스 (JSON)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="동시에 계산하는 요청 수")
+    parser.add_argument("--max-connections", type=int, default=DEFAULT_MAX_CONNECTIONS, help="동시 연결 수 상한")
+    parser.add_argument("--batch-window-ms", type=float, default=BATCH_WINDOW_S * 1000.0, help="/score 요청을 모으는 시간(ms, 0이면 모으지 않음)")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="배치 하나의 최대 기록 수")
+    args = parser.parse_args(argv)
+
+    server = make_server(
+        args.host,
+        args.port,
+        workers=args.workers,
+        max_connections=args.max_connections,
+        batch_window_s=args.batch_window_ms / 1000.0,
+        max_batch=args.max_batch,
+    )
+    host, port = server.server_address[:2]
+    print(f"http://{host}:{port} 에서 대기 중 (Ctrl+C로 종료)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
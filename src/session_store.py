@@ -0,0 +1,268 @@
+# 세션 상태(AppState) 외부 저장소
+# - 기본은 지금처럼 프로세스 안의 st.session_state에만 둔다 (저장소 없음)
+# - NOAATS_SESSION_BACKEND=sqlite 이면 AppState를 SQLite(data/sessions.sqlite3)에 세션 id(sid)별로 저장
+#   -> 같은 머신에서 여러 Streamlit 프로세스를 로드밸런서 뒤에 띄워도, 어느 프로세스가 받든 같은 상태를 본다
+#   (sid는 URL 쿼리 파라미터 ?sid=...로 따라다닌다, state.session_id 참고)
+# - 쓰기는 낙관적 동시성: 읽을 때의 version과 같을 때만 덮어쓰고 version+1, 다르면 ConflictError
+# - 직렬화: 작은 필드는 JSON, choices(ChoiceTable)의 열 배열은 base64 바이트로 (행이 많아도 싸게)
+from __future__ import annotations
+
+import base64
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, fields, is_dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from .models import FACTOR_COLUMNS, AppState, ChoiceBlock, ChoiceTable, TimeBasics
+
+BACKEND_ENV = "NOAATS_SESSION_BACKEND"  # "" (기본: 저장소 없음) | "memory" | "sqlite"
+DB_ENV = "NOAATS_SESSION_DB"
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data" / "sessions.sqlite3"
+SESSION_TTL_S = 30 * 24 * 3600.0  # 이보다 오래 안 쓴 세션은 sqlite 저장소를 열 때 정리
+
+CODEC_VERSION = 1
+
+
+class ConflictError(RuntimeError):
+    """다른 프로세스가 먼저 같은 세션을 고쳐서 version이 맞지 않을 때."""
+
+
+# -----------------------------
+# 직렬화
+# -----------------------------
+def _pack_array(a: np.ndarray, dtype: str) -> str:
+    return base64.b64encode(np.ascontiguousarray(a, dtype=dtype).tobytes()).decode("ascii")
+
+
+def _unpack_array(text: str, dtype: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(text), dtype=dtype).copy()
+
+
+def _encode_choices(choices: Any) -> Dict[str, Any]:
+    table = ChoiceTable.from_blocks(choices)
+    out: Dict[str, Any] = {
+        "categories": list(table.categories),
+        "codes": _pack_array(table.codes, "<i4"),
+        "hours": _pack_array(table.hours, "<f8"),
+    }
+    for key in FACTOR_COLUMNS:
+        col = getattr(table, key)
+        if col is not None:
+            out[key] = _pack_array(col, "<f8")
+    return out
+
+
+def _decode_choices(obj: Dict[str, Any]) -> ChoiceTable:
+    factors = {key: _unpack_array(obj[key], "<f8") for key in FACTOR_COLUMNS if key in obj}
+    return ChoiceTable(obj["categories"], _unpack_array(obj["codes"], "<i4"), _unpack_array(obj["hours"], "<f8"), **factors)
+
+
+def _state_fields(s: AppState) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"_v": CODEC_VERSION}
+    for f in fields(AppState):
+        v = getattr(s, f.name)
+        if f.name == "choices":
+            v = _encode_choices(v)
+        elif is_dataclass(v):
+            v = asdict(v)
+        out[f.name] = v
+    return out
+
+
+def _dumps(obj: Dict[str, Any]) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def encode_state(s: AppState) -> bytes:
+    """AppState -> bytes. 같은 상태면 같은 bytes (바뀌었는지 비교하는 데도 쓴다)."""
+    return _dumps(_state_fields(s))
+
+
+def decode_state(payload: bytes) -> AppState:
+    """
+    bytes -> AppState.
+    지금 AppState / TimeBasics에 없는 필드는 버리고, 저장본에 없는 필드는 기본값 (필드가 늘거나 줄어도 읽힌다)
+    """
+    obj = json.loads(payload.decode("utf-8"))
+    s = AppState()
+    for f in fields(AppState):
+        if f.name not in obj:
+            continue
+        v = obj[f.name]
+        if f.name == "choices":
+            v = _decode_choices(v) if isinstance(v, dict) else ChoiceTable.from_blocks(ChoiceBlock(**c) for c in v)
+        elif f.name == "basics":
+            known = {x.name for x in fields(TimeBasics)}
+            v = TimeBasics(**{k: x for k, x in v.items() if k in known})
+        setattr(s, f.name, v)
+    return s
+
+
+def merge_payloads(base: Optional[bytes], local: bytes, remote: bytes) -> bytes:
+    """
+    필드 단위 3-way 병합: base(마지막으로 맞춘 저장본) 대비 이 프로세스가 바꾼 필드는 local 값,
+    나머지는 remote 값. 같은 필드를 양쪽이 다 바꿨으면 local(나중에 쓰는 쪽)이 이긴다.
+    """
+    b = json.loads(base.decode("utf-8")) if base else {}
+    mine = json.loads(local.decode("utf-8"))
+    out = json.loads(remote.decode("utf-8"))
+    for k, v in mine.items():
+        if b.get(k) != v:
+            out[k] = v
+    return _dumps(out)
+
+
+# -----------------------------
+# 저장소
+# -----------------------------
+class SessionBackend(ABC):
+    """
+    sid -> (version, payload) 저장소.
+    - version(sid): 지금 version (없으면 None) — 매 실행마다 부르므로 가볍게
+    - load(sid): (version, payload) 또는 None
+    - save(sid, payload, expected): expected(처음이면 0)와 지금 version이 같을 때만 저장 -> 새 version
+    (메서드를 하나라도 빠뜨린 저장소는 만들 때 TypeError)
+    """
+
+    @abstractmethod
+    def version(self, sid: str) -> Optional[int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load(self, sid: str) -> Optional[Tuple[int, bytes]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, sid: str, payload: bytes, expected: int) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, sid: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryBackend(SessionBackend):
+    """프로세스 안 dict (한 프로세스에서 여러 탭이 sid로 상태를 나눠 쓸 때 / 테스트용)."""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[int, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def version(self, sid: str) -> Optional[int]:
+        found = self._data.get(sid)
+        return found[0] if found else None
+
+    def load(self, sid: str) -> Optional[Tuple[int, bytes]]:
+        return self._data.get(sid)
+
+    def save(self, sid: str, payload: bytes, expected: int) -> int:
+        with self._lock:
+            current = self._data.get(sid, (0, b""))[0]
+            if current != expected:
+                raise ConflictError(f"세션 {sid}: version {expected} 기준으로 썼지만 지금은 {current}")
+            self._data[sid] = (current + 1, bytes(payload))
+            return current + 1
+
+    def delete(self, sid: str) -> None:
+        with self._lock:
+            self._data.pop(sid, None)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_state (
+    sid TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteBackend(SessionBackend):
+    """
+    SQLite 파일 하나를 여러 프로세스가 같이 쓴다 (WAL: 읽기는 쓰기에 막히지 않음).
+    version 비교와 갱신은 UPDATE ... WHERE version = ? 한 문장이라 프로세스 사이에서도 원자적이다.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB_PATH, *, ttl_s: float = SESSION_TTL_S) -> None:
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        if ttl_s > 0:
+            conn.execute("DELETE FROM session_state WHERE updated_at < ?", (time.time() - ttl_s,))
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # 연결은 스레드마다 따로 (Streamlit 세션은 서로 다른 스레드에서 돈다)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)  # autocommit
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def version(self, sid: str) -> Optional[int]:
+        row = self._conn().execute("SELECT version FROM session_state WHERE sid = ?", (sid,)).fetchone()
+        return int(row[0]) if row else None
+
+    def load(self, sid: str) -> Optional[Tuple[int, bytes]]:
+        row = self._conn().execute("SELECT version, payload FROM session_state WHERE sid = ?", (sid,)).fetchone()
+        return (int(row[0]), bytes(row[1])) if row else None
+
+    def save(self, sid: str, payload: bytes, expected: int) -> int:
+        conn = self._conn()
+        now = time.time()
+        if expected == 0:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO session_state VALUES (?, 1, ?, ?)",
+                (sid, sqlite3.Binary(payload), now),
+            )
+        else:
+            cur = conn.execute(
+                "UPDATE session_state SET version = version + 1, payload = ?, updated_at = ? WHERE sid = ? AND version = ?",
+                (sqlite3.Binary(payload), now, sid, expected),
+            )
+        if cur.rowcount != 1:
+            raise ConflictError(f"세션 {sid}: version {expected} 기준으로 썼지만 다른 프로세스가 먼저 바꿨습니다.")
+        return expected + 1
+
+    def delete(self, sid: str) -> None:
+        self._conn().execute("DELETE FROM session_state WHERE sid = ?", (sid,))
+
+
+_backend: Optional[SessionBackend] = None
+_backend_ready = False
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> Optional[SessionBackend]:
+    """환경변수 NOAATS_SESSION_BACKEND로 고른 프로세스 공용 저장소 (설정이 없으면 None = st.session_state만 사용)."""
+    global _backend, _backend_ready
+    with _backend_lock:
+        if not _backend_ready:
+            kind = os.environ.get(BACKEND_ENV, "").strip().lower()
+            if kind == "sqlite":
+                _backend = SQLiteBackend(os.environ.get(DB_ENV) or DEFAULT_DB_PATH)
+            elif kind == "memory":
+                _backend = MemoryBackend()
+            elif kind:
+                raise ValueError(f"{BACKEND_ENV}={kind!r}: 'memory' 또는 'sqlite'만 가능합니다.")
+            _backend_ready = True
+        return _backend
+
+
+def set_backend(backend: Optional[SessionBackend]) -> None:
+    """저장소를 직접 지정 (None이면 저장소 없이 st.session_state만)."""
+    global _backend, _backend_ready
+    with _backend_lock:
+        _backend, _backend_ready = backend, True
@@ -0,0 +1,431 @@
+# 바이너리 일별 스냅샷 파일 (.noasnap)
+#
+#   python -m src.snapshot pack -o noah.noasnap --user 노아 [--compress]
+#   python -m src.snapshot dump noah.noasnap --last 90          # JSONL로 출력
+#
+# 파일 구조 (little-endian)
+#   [고정 헤더 64B] magic / 형식 버전 / flags / 스키마 길이 / 레코드 수 / 블록 크기 / 블록 수 / 인덱스 위치
+#   [스키마 JSON]   레코드 dtype(필드 이름/형식), TimeBasics 필드, 범주 목록, user_id
+#   [데이터 블록]   고정 길이 레코드(numpy structured dtype)를 block_records개씩, 날짜 오름차순
+#                   flags & COMPRESSED이면 블록마다 zlib 압축
+#   [블록 인덱스]   블록별 (첫 날짜, 마지막 날짜, 위치, 길이, 레코드 수)
+#
+# - 읽기는 mmap: 날짜 범위 조회는 인덱스에서 블록을 고르고 그 블록만 읽는다(압축이면 그 블록만 푼다)
+# - 레코드 dtype은 파일 안의 스키마에서 만든다 -> TimeBasics에 필드가 늘거나 줄어도 옛 파일을 그대로 읽는다
+#   (파일에 없는 필드는 기본값, 지금 모델에 없는 필드는 무시)
+# - 시간(기본 생활 시간 / 범주별 시간)은 float64: JSON/SQLite 기록과 같은 값으로 왕복한다
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+import zlib
+from dataclasses import dataclass, fields
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .history import DaySnapshot, HistoryStore, get_history_store
+from .models import ChoiceBlock, TimeBasics
+
+MAGIC = b"NOASNAP\0"
+FORMAT_VERSION = 1
+COMPRESSED = 0x1
+
+_HEADER = struct.Struct("<8sHHIQIIQ24x")  # magic, version, flags, schema_len, n_records, block_records, n_blocks, index_offset
+_INDEX_DTYPE = np.dtype([("first_day", "<i4"), ("last_day", "<i4"), ("offset", "<u8"), ("length", "<u8"), ("n_records", "<u4")])
+_DATA_ALIGN = 64
+
+WEIGHT_MISSING = 255  # weights에 없는 범주
+_EPOCH = date(1970, 1, 1).toordinal()
+
+PathLike = Union[str, Path]
+
+
+def day_to_int(d: date) -> int:
+    return d.toordinal() - _EPOCH
+
+
+def int_to_day(n: int) -> date:
+    return date.fromordinal(int(n) + _EPOCH)
+
+
+def record_dtype(basics_fields: Sequence[str], n_categories: int) -> np.dtype:
+    """스키마 -> 레코드 dtype (패딩 없음). 기록(DaySnapshot)에 있는 값만 담는다."""
+    c = max(0, int(n_categories))
+    return np.dtype(
+        [("day", "<i4")]
+        + [(name, "<f8") for name in basics_fields]
+        + [
+            ("basis_hour_value", "<f8"),
+            ("hours", "<f8", (c,)),
+            ("weight", "u1", (c,)),
+        ]
+    )
+
+
+def _dtype_from_descr(descr: List[Any]) -> np.dtype:
+    # JSON에는 튜플 대신 리스트로 저장되므로 되돌린다
+    return np.dtype([tuple(x[:2]) + ((tuple(x[2]),) if len(x) > 2 else ()) for x in descr])
+
+
+@dataclass(frozen=True)
+class SnapshotSchema:
+    version: int
+    dtype: np.dtype
+    basics_fields: Tuple[str, ...]
+    categories: Tuple[str, ...]
+    user_id: str
+
+    def to_json(self) -> bytes:
+        return json.dumps(
+            {
+                "version": self.version,
+                "dtype": [list(x) for x in self.dtype.descr],
+                "basics_fields": list(self.basics_fields),
+                "categories": list(self.categories),
+                "user_id": self.user_id,
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, raw: bytes) -> "SnapshotSchema":
+        obj = json.loads(raw.decode("utf-8"))
+        return cls(
+            version=int(obj["version"]),
+            dtype=_dtype_from_descr(obj["dtype"]),
+            basics_fields=tuple(obj["basics_fields"]),
+            categories=tuple(obj["categories"]),
+            user_id=str(obj.get("user_id", "")),
+        )
+
+
+# -----------------------------
+# 쓰기
+# -----------------------------
+def snapshots_to_records(snaps: Sequence[DaySnapshot], schema: SnapshotSchema) -> np.ndarray:
+    """DaySnapshot 목록 -> 레코드 배열. 범주 목록에 없는 choice label이 있으면 ValueError."""
+    index = {c: i for i, c in enumerate(schema.categories)}
+    rec = np.zeros(len(snaps), dtype=schema.dtype)
+    rec["weight"] = WEIGHT_MISSING
+    for i, snap in enumerate(snaps):
+        r = rec[i]
+        r["day"] = day_to_int(snap.day)
+        for name in schema.basics_fields:
+            r[name] = getattr(snap.basics, name, 0.0)
+        r["basis_hour_value"] = snap.basis_hour_value
+        for c in snap.choices:
+            j = index.get(c.label)
+            if j is None:
+                raise ValueError(f"스키마에 없는 범주입니다: {c.label}")
+            r["hours"][j] += max(0.0, float(c.hours))
+        for label, w in snap.weights.items():
+            j = index.get(label)
+            if j is not None:
+                r["weight"][j] = max(0, min(100, int(w)))
+    return rec
+
+
+class SnapshotWriter:
+    """
+    블록 단위로 바로 쓰는 기록기 (날짜 오름차순으로 add).
+        with SnapshotWriter(path, categories, compress=True) as w:
+            for snap in snaps:
+                w.add(snap)
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        categories: Sequence[str],
+        *,
+        user_id: str = "",
+        compress: bool = False,
+        block_records: int = 256,
+    ) -> None:
+        basics_fields = tuple(f.name for f in fields(TimeBasics))
+        self.schema = SnapshotSchema(
+            version=FORMAT_VERSION,
+            dtype=record_dtype(basics_fields, len(categories)),
+            basics_fields=basics_fields,
+            categories=tuple(str(c) for c in categories),
+            user_id=str(user_id),
+        )
+        self.compress = bool(compress)
+        self.block_records = max(1, int(block_records))
+        self._fp = open(path, "wb")
+        self._schema_raw = self.schema.to_json()
+        self._buf: List[DaySnapshot] = []
+        self._index: List[Tuple[int, int, int, int, int]] = []
+        self._n_records = 0
+        self._last_day: Optional[int] = None
+
+        self._fp.write(b"\0" * _HEADER.size)  # 헤더는 close()에서 채운다
+        self._fp.write(self._schema_raw)
+        self._pad()
+
+    def _pad(self) -> None:
+        pos = self._fp.tell()
+        self._fp.write(b"\0" * (-pos % _DATA_ALIGN))
+
+    def add(self, snap: DaySnapshot) -> None:
+        d = day_to_int(snap.day)
+        if self._last_day is not None and d <= self._last_day:
+            raise ValueError("스냅샷은 날짜 오름차순(중복 없이)으로 추가해야 합니다.")
+        self._last_day = d
+        self._buf.append(snap)
+        if len(self._buf) >= self.block_records:
+            self._flush_block()
+
+    def _flush_block(self) -> None:
+        if not self._buf:
+            return
+        rec = snapshots_to_records(self._buf, self.schema)
+        raw = rec.tobytes()
+        if self.compress:
+            raw = zlib.compress(raw, 6)
+        offset = self._fp.tell()
+        self._fp.write(raw)
+        self._index.append((int(rec["day"][0]), int(rec["day"][-1]), offset, len(raw), len(rec)))
+        self._n_records += len(rec)
+        self._buf = []
+
+    def close(self) -> None:
+        if self._fp.closed:
+            return
+        self._flush_block()
+        self._pad()
+        index_offset = self._fp.tell()
+        self._fp.write(np.array(self._index, dtype=_INDEX_DTYPE).tobytes())
+        self._fp.seek(0)
+        self._fp.write(
+            _HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                COMPRESSED if self.compress else 0,
+                len(self._schema_raw),
+                self._n_records,
+                self.block_records,
+                len(self._index),
+                index_offset,
+            )
+        )
+        self._fp.close()
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def write_snapshot(
+    path: PathLike,
+    snaps: Iterable[DaySnapshot],
+    *,
+    categories: Optional[Sequence[str]] = None,
+    user_id: str = "",
+    compress: bool = False,
+    block_records: int = 256,
+) -> int:
+    """
+    스냅샷들을 파일로. returns: 레코드 수
+    - categories가 없으면 snaps를 한 번 훑어 범주를 모은다(이때는 전체를 메모리에 올린다)
+    """
+    if categories is None:
+        snaps = list(snaps)
+        seen: Dict[str, None] = {}
+        for snap in snaps:
+            for c in snap.choices:
+                seen.setdefault(c.label)
+            for label in snap.weights:
+                seen.setdefault(label)
+        categories = list(seen)
+    with SnapshotWriter(path, categories, user_id=user_id, compress=compress, block_records=block_records) as w:
+        for snap in sorted(snaps, key=lambda x: x.day) if isinstance(snaps, list) else snaps:
+            w.add(snap)
+        return w._n_records + len(w._buf)
+
+
+def pack_history(
+    store: HistoryStore,
+    path: PathLike,
+    user_id: str,
+    *,
+    compress: bool = False,
+    block_records: int = 256,
+) -> int:
+    """저장소의 한 사용자 기록 전체를 스냅샷 파일로 (저장소에서 페이지 단위로 읽어 블록 단위로 쓴다)."""
+    return write_snapshot(
+        path,
+        store.iter_days(user_id),
+        categories=store.labels(user_id),
+        user_id=user_id,
+        compress=compress,
+        block_records=block_records,
+    )
+
+
+# -----------------------------
+# 읽기
+# -----------------------------
+class SnapshotReader:
+    """
+    mmap 기반 읽기 (with 문 사용 권장).
+    - read(start, end): 날짜 범위 레코드 배열 (필요한 블록만 읽는다)
+    - last(n_days): 마지막 기록일 기준 최근 n_days일
+    - iter_snapshots(start, end): DaySnapshot으로 (현재 TimeBasics에 맞춰 변환)
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        self._f = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 빈 파일
+            self._f.close()
+            raise ValueError("스냅샷 파일이 비어 있습니다.") from None
+
+        if len(self._mm) < _HEADER.size:
+            self.close()
+            raise ValueError("스냅샷 파일 헤더가 잘렸습니다.")
+        magic, version, flags, schema_len, n_records, block_records, n_blocks, index_offset = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("스냅샷 파일이 아닙니다.")
+        if version > FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"더 새로운 형식(v{version})의 파일입니다. (지원: v{FORMAT_VERSION} 이하)")
+
+        self.version = version
+        self.compressed = bool(flags & COMPRESSED)
+        self.n_records = int(n_records)
+        self.block_records = int(block_records)
+        self.schema = SnapshotSchema.from_json(bytes(self._mm[_HEADER.size : _HEADER.size + schema_len]))
+        self.index = np.frombuffer(self._mm, dtype=_INDEX_DTYPE, count=n_blocks, offset=index_offset)
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        return self.schema.categories
+
+    def close(self) -> None:
+        # frombuffer로 만든 배열이 mmap을 참조하고 있으면 닫을 수 없으므로 먼저 놓는다
+        self.index = None  # type: ignore[assignment]
+        mm = getattr(self, "_mm", None)
+        if mm is not None and not mm.closed:
+            try:
+                mm.close()
+            except BufferError:
+                pass  # 사용자가 아직 압축 안 된 블록 뷰를 들고 있다 -> GC에 맡긴다
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self) -> "SnapshotReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _block(self, i: int) -> np.ndarray:
+        entry = self.index[i]
+        offset, length, n = int(entry["offset"]), int(entry["length"]), int(entry["n_records"])
+        if self.compressed:
+            raw = zlib.decompress(self._mm[offset : offset + length])
+            return np.frombuffer(raw, dtype=self.schema.dtype, count=n)
+        # 압축이 없으면 mmap 위의 뷰 (복사 없음, 읽는 페이지만 디스크에서 올라온다)
+        return np.frombuffer(self._mm, dtype=self.schema.dtype, count=n, offset=offset)
+
+    def read(self, start: Optional[date] = None, end: Optional[date] = None) -> np.ndarray:
+        """start ~ end(포함) 레코드 (날짜 오름차순). 블록 인덱스로 겹치는 블록만 읽는다."""
+        if self.n_records == 0:
+            return np.zeros(0, dtype=self.schema.dtype)
+        lo = day_to_int(start) if start is not None else np.iinfo(np.int32).min
+        hi = day_to_int(end) if end is not None else np.iinfo(np.int32).max
+        first = int(np.searchsorted(self.index["last_day"], lo, side="left"))
+        last = int(np.searchsorted(self.index["first_day"], hi, side="right"))
+        parts = []
+        for i in range(first, last):
+            block = self._block(i)
+            days = block["day"]
+            a = int(np.searchsorted(days, lo, side="left"))
+            b = int(np.searchsorted(days, hi, side="right"))
+            if a < b:
+                parts.append(block[a:b])
+        if not parts:
+            return np.zeros(0, dtype=self.schema.dtype)
+        # 결과는 복사본 (mmap을 닫아도 쓸 수 있게)
+        return np.concatenate(parts) if len(parts) > 1 else parts[0].copy()
+
+    def last_day(self) -> Optional[date]:
+        return int_to_day(self.index["last_day"][-1]) if len(self.index) else None
+
+    def last(self, n_days: int) -> np.ndarray:
+        """마지막 기록일 포함 최근 n_days일."""
+        end = self.last_day()
+        if end is None:
+            return self.read()
+        return self.read(end - timedelta(days=max(1, int(n_days)) - 1), end)
+
+    def to_snapshots(self, rec: np.ndarray) -> List[DaySnapshot]:
+        """레코드 배열 -> DaySnapshot (시간이 0인 범주는 choice로 만들지 않는다)."""
+        known = {f.name for f in fields(TimeBasics)}
+        basics_fields = [n for n in self.schema.basics_fields if n in known]
+        cats = self.schema.categories
+        out = []
+        for r in rec:
+            out.append(
+                DaySnapshot(
+                    user_id=self.schema.user_id,
+                    day=int_to_day(r["day"]),
+                    basics=TimeBasics(**{n: float(r[n]) for n in basics_fields}),
+                    choices=[ChoiceBlock(cats[j], float(h)) for j, h in enumerate(r["hours"]) if h > 0],
+                    weights={cats[j]: int(w) for j, w in enumerate(r["weight"]) if w != WEIGHT_MISSING},
+                    basis_hour_value=float(r["basis_hour_value"]),
+                )
+            )
+        return out
+
+    def iter_snapshots(self, start: Optional[date] = None, end: Optional[date] = None) -> Iterator[DaySnapshot]:
+        yield from self.to_snapshots(self.read(start, end))
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.snapshot", description="바이너리 일별 스냅샷 파일")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    pk = sub.add_parser("pack", help="저장소의 기록을 스냅샷 파일로")
+    pk.add_argument("-o", "--output", required=True)
+    pk.add_argument("--user", required=True)
+    pk.add_argument("--compress", action="store_true", help="블록 단위 zlib 압축")
+    pk.add_argument("--block-records", type=int, default=256)
+
+    dp = sub.add_parser("dump", help="스냅샷 파일을 JSONL로 출력")
+    dp.add_argument("input")
+    dp.add_argument("--start", type=date.fromisoformat)
+    dp.add_argument("--end", type=date.fromisoformat)
+    dp.add_argument("--last", type=int, help="마지막 기록일 기준 최근 N일")
+
+    args = parser.parse_args(argv)
+    if args.cmd == "pack":
+        n = pack_history(get_history_store(), args.output, args.user, compress=args.compress, block_records=args.block_records)
+        print(f"{n}일 저장: {args.output}", file=sys.stderr)
+        return 0
+
+    from .history_io import snapshot_to_json
+
+    with SnapshotReader(args.input) as reader:
+        rec = reader.last(args.last) if args.last else reader.read(args.start, args.end)
+        for snap in reader.to_snapshots(rec):
+            sys.stdout.write(json.dumps(snapshot_to_json(snap), ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
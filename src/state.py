@@ -1,21 +1,129 @@
 # 현재 세션 상태.
 # 세션 초기화 및 가져오기, 프로토타입의 시작
+# - 저장소(session_store.get_backend)가 설정돼 있으면 AppState를 sid별로 저장소와 맞춘다
+#   get_state: 저장소 version이 마지막으로 맞춘 version과 다를 때만 다시 읽는다 (매 실행은 version 조회 한 번)
+#   commit_state: 실행이 끝날 때 바뀐 게 있으면 저장 (version이 어긋나면 필드 단위로 병합해서 다시 시도)
+import uuid
+from dataclasses import fields
+from typing import Optional
+
 import streamlit as st
 
-from .models import AppState, ChoiceBlock
+from .instrument import incr
+from .models import AppState, ChoiceBlock, ChoiceTable
+from .modes import apply_mode
+from .session_store import ConflictError, decode_state, encode_state, get_backend, merge_payloads
+
+SID_PARAM = "sid"
+_SYNC_KEY = "_state_sync"  # (sid, version, payload): 저장소와 마지막으로 맞춘 상태
+_COMMIT_RETRIES = 3
+
+# AppState 값을 들고 있는 위젯 key (다른 프로세스가 바꾼 상태를 읽으면 지워서 새 값으로 다시 그리게)
+_MIRROR_PREFIXES = ("cat_hours_", "sb_w_")
 
 
 def _default_state() -> AppState:
     s = AppState()
-    s.choices = [
+    s.choices = ChoiceTable.from_blocks([
         ChoiceBlock("생산활동", 4.0),
         ChoiceBlock("인적자본 축적", 4.0),
         ChoiceBlock("회복,건강,여가", 2.0),
         ChoiceBlock("소비성 여가, 저생산 활동", 2.0)
-    ]
+    ])
     return s
 
+
+def session_id() -> str:
+    """URL의 ?sid=... (없으면 새로 만들어 URL에 붙인다 -> 다른 프로세스로 가도 같은 세션)."""
+    sid = st.query_params.get(SID_PARAM)
+    if not sid:
+        sid = uuid.uuid4().hex
+        st.query_params[SID_PARAM] = sid
+    return sid
+
+
+def _replace_state(new: AppState) -> None:
+    # 객체는 그대로 두고 필드만 바꾼다 (조각 함수가 인자로 들고 있는 AppState도 새 값을 보게)
+    s = st.session_state.app_state
+    for f in fields(AppState):
+        setattr(s, f.name, getattr(new, f.name))
+    _drop_mirrored_widgets()
+
+
+def _drop_mirrored_widgets() -> None:
+    for k in [k for k in st.session_state if str(k).startswith(_MIRROR_PREFIXES)]:
+        del st.session_state[k]
+
+
+def switch_mode(s: AppState, name: str) -> None:
+    """가치 환산 모드 변경. 범주 구성이 바뀌면 범주 순서로 값을 들고 있던 위젯도 지운다."""
+    if apply_mode(s, name):
+        _drop_mirrored_widgets()
+
+
 def get_state() -> AppState:
-    if "app_state" not in st.session_state:
-        st.session_state.app_state = _default_state()
+    backend = get_backend()
+    if backend is None:
+        if "app_state" not in st.session_state:
+            st.session_state.app_state = _default_state()
+        return st.session_state.app_state
+
+    sid = session_id()
+    sync = st.session_state.get(_SYNC_KEY)
+    remote = backend.version(sid)
+    fresh = "app_state" not in st.session_state or sync is None or sync[0] != sid
+    if fresh or (remote is not None and remote != sync[1]):
+        loaded = backend.load(sid) if remote is not None else None
+        if loaded is not None:
+            version, payload = loaded
+            if fresh:
+                st.session_state.app_state = decode_state(payload)
+            else:
+                _replace_state(decode_state(payload))
+            st.session_state[_SYNC_KEY] = (sid, version, payload)
+            incr("session.load")
+        elif fresh:
+            st.session_state.app_state = _default_state()
+            st.session_state[_SYNC_KEY] = (sid, 0, None)
     return st.session_state.app_state
+
+
+def commit_state() -> Optional[int]:
+    """
+    이번 실행에서 바뀐 AppState를 저장소에 쓴다. (저장소가 없거나 바뀐 게 없으면 아무것도 안 함)
+    returns: 새 version (안 썼으면 None)
+    """
+    backend = get_backend()
+    sync = st.session_state.get(_SYNC_KEY)
+    if backend is None or sync is None or "app_state" not in st.session_state:
+        return None
+    sid, version, base = sync
+    payload = encode_state(st.session_state.app_state)
+    if payload == base:
+        incr("session.commit.unchanged")
+        return None
+
+    merged = False
+    for _ in range(_COMMIT_RETRIES):
+        try:
+            version = backend.save(sid, payload, version)
+        except ConflictError:
+            # 다른 프로세스가 먼저 썼다: 그 저장본 위에 이 프로세스가 바꾼 필드만 얹어서 다시
+            incr("session.commit.conflict")
+            loaded = backend.load(sid)
+            if loaded is None:
+                version, base = 0, None
+                continue
+            version, remote = loaded
+            payload = merge_payloads(base, payload, remote)
+            base, merged = remote, True
+            continue
+        if merged:
+            # 병합으로 다른 프로세스의 변경을 받았으면 이 세션 상태에도 반영
+            _replace_state(decode_state(payload))
+        st.session_state[_SYNC_KEY] = (sid, version, payload)
+        incr("session.commit")
+        return version
+
+    incr("session.commit.failed")
+    return None
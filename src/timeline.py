@@ -0,0 +1,387 @@
+# 분 단위 시간 블록 타임라인 (시작~끝 블록으로 하루를 기록)
+# - 시각은 "절대 분" = 날짜.toordinal() × 1440 + 그날 0시부터의 분 (자정을 넘는 블록도 한 블록으로)
+# - 블록은 서로 겹치지 않게 유지 -> 시작 시각 정렬 리스트 하나로 끝 시각도 정렬된 상태 (bisect로 찾기)
+#   추가 / 겹침 검사 / "이 구간에 걸친 블록" 찾기는 O(log n)
+# - 범주별 분(分)은 날짜별 펜윅 트리(누적합)에 따로 쌓아 두고, "기간 안의 범주별 시간"은
+#   통째로 들어가는 날은 트리에서 O(log 일수), 양 끝의 잘린 날만 블록을 잘라서 더한다
+# - 고정 활동(수면/식사 등 calc_discretionary_hours의 항목)은 같은 이름의 블록으로 기록하면 TimeBasics와 비교할 수 있다
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .calc import calc_discretionary_hours
+from .models import ChoiceBlock, ChoiceTable, TimeBasics
+
+MINUTES_PER_DAY = 24 * 60
+
+# 고정 활동 이름 (calc_discretionary_hours의 fixed 키와 같게)
+FIXED_LABELS: Tuple[str, ...] = tuple(calc_discretionary_hours(TimeBasics())[1])
+
+DayLike = Union[date, int]  # date 또는 date.toordinal()
+
+
+class TimeBlock(NamedTuple):
+    start: int  # 절대 분
+    end: int  # 절대 분 (start < end)
+    label: str
+
+    @property
+    def minutes(self) -> int:
+        return self.end - self.start
+
+    @property
+    def hours(self) -> float:
+        return self.minutes / 60.0
+
+    @property
+    def day(self) -> date:
+        """시작한 날."""
+        return date.fromordinal(self.start // MINUTES_PER_DAY)
+
+
+class OverlapError(ValueError):
+    """이미 있는 블록과 겹치는 블록을 넣으려 할 때. conflicts: 겹치는 기존 블록들"""
+
+    def __init__(self, block: TimeBlock, conflicts: Sequence[TimeBlock]) -> None:
+        self.block = block
+        self.conflicts = list(conflicts)
+        first = self.conflicts[0]
+        super().__init__(
+            f"{format_block(block)} 블록이 {format_block(first)} 블록과 겹칩니다."
+            + (f" (외 {len(self.conflicts) - 1}개)" if len(self.conflicts) > 1 else "")
+        )
+
+
+# -----------------------------
+# 시각 변환
+# -----------------------------
+def _ordinal(day: DayLike) -> int:
+    return day.toordinal() if isinstance(day, date) else int(day)
+
+
+def parse_hhmm(text: str) -> int:
+    """ "07:30" -> 450 (그날 0시부터의 분). "24:00"까지, 그 이상은 다음 날로 넘어간 시각 ("25:30" = 다음 날 01:30)."""
+    try:
+        hh, mm = str(text).strip().split(":")
+        h, m = int(hh), int(mm)
+    except ValueError:
+        raise ValueError(f"시각은 HH:MM 형식이어야 합니다: {text!r}") from None
+    if h < 0 or not 0 <= m < 60:
+        raise ValueError(f"시각 범위를 벗어났습니다: {text!r}")
+    return h * 60 + m
+
+
+def format_hhmm(minute_of_day: int) -> str:
+    return f"{minute_of_day // 60:02d}:{minute_of_day % 60:02d}"
+
+
+def format_block(block: TimeBlock) -> str:
+    day0 = block.start // MINUTES_PER_DAY
+    end = block.end - day0 * MINUTES_PER_DAY
+    return f"{block.label} {format_hhmm(block.start - day0 * MINUTES_PER_DAY)}~{format_hhmm(end)}"
+
+
+def day_bounds(day: DayLike) -> Tuple[int, int]:
+    start = _ordinal(day) * MINUTES_PER_DAY
+    return start, start + MINUTES_PER_DAY
+
+
+def make_block(day: DayLike, start: Union[int, str], end: Union[int, str], label: str) -> TimeBlock:
+    """
+    그날 기준 시각(분 또는 "HH:MM")으로 블록 만들기.
+    끝이 시작보다 이르거나 같으면 자정을 넘긴 것으로 본다 ("23:00"~"07:00" = 8시간).
+    """
+    s = parse_hhmm(start) if isinstance(start, str) else int(start)
+    e = parse_hhmm(end) if isinstance(end, str) else int(end)
+    if e <= s:
+        e += MINUTES_PER_DAY
+    base = _ordinal(day) * MINUTES_PER_DAY
+    return TimeBlock(base + s, base + e, str(label))
+
+
+def make_cycle_blocks(day: DayLike, start: Union[int, str], end: Union[int, str], label: str) -> List[TimeBlock]:
+    """
+    하루(24시간)를 한 바퀴로 보고 블록 만들기 (하루치만 적는 입력 화면용).
+    자정을 넘는 블록은 그날 안에서 둘로 나눈다 ("23:00"~"07:00" -> 23:00~24:00, 00:00~07:00).
+    """
+    block = make_block(day, start, end, label)
+    lo, hi = day_bounds(day)
+    if block.start >= hi or block.end - block.start > MINUTES_PER_DAY:
+        raise ValueError(f"하루 안의 블록이 아닙니다: {start}~{end}")
+    if block.end <= hi:
+        return [block]
+    return [TimeBlock(lo, block.end - MINUTES_PER_DAY, block.label), TimeBlock(block.start, hi, block.label)]
+
+
+def _split_by_day(start: int, end: int) -> Iterator[Tuple[int, int]]:
+    """(날짜 ordinal, 그날에 걸친 분) - 자정을 넘는 블록은 날마다 나눈다."""
+    d = start // MINUTES_PER_DAY
+    while start < end:
+        cut = min(end, (d + 1) * MINUTES_PER_DAY)
+        yield d, cut - start
+        start, d = cut, d + 1
+
+
+# -----------------------------
+# 날짜별 누적합 (펜윅 트리)
+# -----------------------------
+class _DayFenwick:
+    """날짜(ordinal)별 값의 구간합. 범위 밖 날짜가 들어오면 두 배로 늘려 다시 만든다 (상각 O(1))."""
+
+    __slots__ = ("offset", "values", "tree")
+
+    def __init__(self, first_day: int, size: int = 64) -> None:
+        self.offset = first_day
+        self.values = [0.0] * size
+        self.tree = [0.0] * (size + 1)
+
+    def _grow(self, lo: int, hi: int, front: bool) -> None:
+        """[lo, hi]를 담도록 두 배씩 늘린다. 앞으로 늘릴 때는 여유 칸을 앞에 둔다 (과거 날짜를 하루씩 넣어도 상각 O(1))."""
+        old_offset, old = self.offset, self.values
+        size = 2 * len(old)
+        while size < hi - lo + 1:
+            size *= 2
+        self.offset = hi - size + 1 if front else lo
+        values = [0.0] * size
+        i = old_offset - self.offset
+        values[i : i + len(old)] = old
+        # 선형 시간으로 트리 만들기
+        tree = [0.0] + values
+        for k in range(1, size + 1):
+            j = k + (k & -k)
+            if j <= size:
+                tree[j] += tree[k]
+        self.values, self.tree = values, tree
+
+    def add(self, day: int, v: float) -> None:
+        end = self.offset + len(self.values)
+        if day < self.offset:
+            self._grow(day, end - 1, front=True)
+        elif day >= end:
+            self._grow(self.offset, day, front=False)
+        i = day - self.offset
+        self.values[i] += v
+        i += 1
+        n = len(self.values)
+        tree = self.tree
+        while i <= n:
+            tree[i] += v
+            i += i & -i
+
+    def _prefix(self, i: int) -> float:
+        """앞에서 i칸 합."""
+        i = max(0, min(i, len(self.values)))
+        tree = self.tree
+        s = 0.0
+        while i > 0:
+            s += tree[i]
+            i -= i & -i
+        return s
+
+    def range_sum(self, day_lo: int, day_hi: int) -> float:
+        """[day_lo, day_hi) 날짜 합."""
+        return self._prefix(day_hi - self.offset) - self._prefix(day_lo - self.offset)
+
+
+# -----------------------------
+# 하루 점검
+# -----------------------------
+@dataclass(frozen=True)
+class DayCheck:
+    """
+    하루 기록 점검 (check_day)
+    - gaps: 기록이 없는 구간 (그날 0시 기준 분, 끝 미포함), unlogged_h: 그 합
+    - fixed_expected / fixed_logged: 고정 활동별 TimeBasics 값 / 블록으로 기록된 시간
+    - choice_h: 고정 활동 밖 블록 시간 합, discretionary_h: TimeBasics 기준 선택 가능한 시간
+    """
+
+    day: date
+    gaps: List[Tuple[int, int]]
+    unlogged_h: float
+    fixed_expected: Dict[str, float]
+    fixed_logged: Dict[str, float]
+    choice_h: float
+    discretionary_h: float
+
+    @property
+    def over_h(self) -> float:
+        """선택 활동이 선택 가능한 시간을 넘은 만큼."""
+        return max(0.0, self.choice_h - self.discretionary_h)
+
+    @property
+    def fixed_missing(self) -> Dict[str, float]:
+        """TimeBasics보다 덜 기록된 고정 활동 (이름 -> 모자란 시간). 고정 활동을 하나도 기록하지 않았으면 비어 있다."""
+        if not any(self.fixed_logged.values()):
+            return {}
+        return {k: v - self.fixed_logged.get(k, 0.0) for k, v in self.fixed_expected.items() if v - self.fixed_logged.get(k, 0.0) > 1e-9}
+
+
+# -----------------------------
+# 타임라인
+# -----------------------------
+class Timeline:
+    """
+    겹치지 않는 시간 블록 모음 (시작 시각 순)
+    - add(block): 겹치면 OverlapError, 아니면 넣는다 (찾기 O(log n))
+    - overlapping(start, end): [start, end)에 걸친 블록 / gaps(start, end): 비어 있는 구간
+    - category_minutes / category_hours(start, end): 기간 안의 범주별 시간 (블록이 걸치면 잘라서)
+    - choices(start, end): calc_opportunity_cost_table에 넘길 ChoiceTable (고정 활동 제외)
+    """
+
+    def __init__(self, blocks: Iterable[TimeBlock] = ()) -> None:
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._labels: List[str] = []
+        self._minutes: Dict[str, _DayFenwick] = {}
+        for b in sorted(blocks):
+            self.add(b)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[TimeBlock]:
+        return map(TimeBlock, self._starts, self._ends, self._labels)
+
+    def _block(self, i: int) -> TimeBlock:
+        return TimeBlock(self._starts[i], self._ends[i], self._labels[i])
+
+    def _span(self, start: int, end: int) -> Tuple[int, int]:
+        """[start, end)에 걸친 블록의 인덱스 범위 [i, j). (끝 시각도 정렬돼 있어서 bisect 두 번)"""
+        return bisect_right(self._ends, start), bisect_left(self._starts, end)
+
+    # -----------------------------
+    # 수정
+    # -----------------------------
+    def add(self, block: TimeBlock) -> None:
+        start, end, label = int(block.start), int(block.end), str(block.label)
+        if end <= start:
+            raise ValueError(f"블록의 끝이 시작보다 늦어야 합니다: {block}")
+        i, j = self._span(start, end)
+        if i < j:
+            raise OverlapError(TimeBlock(start, end, label), [self._block(k) for k in range(i, j)])
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        self._labels.insert(i, label)
+        self._count(start, end, label, +1.0)
+
+    def remove(self, block: TimeBlock) -> None:
+        i = bisect_left(self._starts, block.start)
+        if i == len(self._starts) or self._block(i) != (block.start, block.end, block.label):
+            raise KeyError(f"없는 블록입니다: {block}")
+        del self._starts[i], self._ends[i], self._labels[i]
+        self._count(block.start, block.end, block.label, -1.0)
+
+    def _count(self, start: int, end: int, label: str, sign: float) -> None:
+        tree = self._minutes.get(label)
+        if tree is None:
+            tree = self._minutes[label] = _DayFenwick(start // MINUTES_PER_DAY)
+        for d, m in _split_by_day(start, end):
+            tree.add(d, sign * m)
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    @property
+    def labels(self) -> List[str]:
+        return list(self._minutes)
+
+    def overlapping(self, start: int, end: int) -> List[TimeBlock]:
+        i, j = self._span(start, end)
+        return [self._block(k) for k in range(i, j)]
+
+    def day_blocks(self, day: DayLike) -> List[TimeBlock]:
+        return self.overlapping(*day_bounds(day))
+
+    def gaps(self, start: int, end: int, min_minutes: int = 1) -> List[Tuple[int, int]]:
+        """[start, end) 안에서 블록이 없는 구간 (절대 분). min_minutes보다 짧은 틈은 뺀다."""
+        out: List[Tuple[int, int]] = []
+        cur = start
+        i, j = self._span(start, end)
+        for k in range(i, j):
+            if self._starts[k] - cur >= min_minutes:
+                out.append((cur, self._starts[k]))
+            cur = max(cur, self._ends[k])
+        if end - cur >= min_minutes:
+            out.append((cur, end))
+        return out
+
+    def category_minutes(self, start: int, end: int) -> Dict[str, float]:
+        """[start, end) 안의 범주별 분. 통째로 들어가는 날은 날짜별 누적합, 양 끝의 잘린 날만 블록을 자른다."""
+        out: Dict[str, float] = {}
+        if end <= start:
+            return out
+        d_lo = -(-start // MINUTES_PER_DAY)  # 통째로 들어가는 첫날
+        d_hi = end // MINUTES_PER_DAY  # 통째로 들어가는 날의 끝 (미포함)
+        if d_lo < d_hi:
+            for label, tree in self._minutes.items():
+                v = tree.range_sum(d_lo, d_hi)
+                if v > 0.0:
+                    out[label] = v
+            edges = [(start, d_lo * MINUTES_PER_DAY), (d_hi * MINUTES_PER_DAY, end)]
+        else:
+            edges = [(start, end)]
+        for lo, hi in edges:
+            if hi <= lo:
+                continue
+            for b in self.overlapping(lo, hi):
+                out[b.label] = out.get(b.label, 0.0) + (min(hi, b.end) - max(lo, b.start))
+        return out
+
+    def category_hours(self, start: int, end: int) -> Dict[str, float]:
+        return {k: v / 60.0 for k, v in self.category_minutes(start, end).items()}
+
+    def day_hours(self, day: DayLike) -> Dict[str, float]:
+        return self.category_hours(*day_bounds(day))
+
+    def choices(
+        self,
+        start: int,
+        end: int,
+        categories: Optional[Sequence[str]] = None,
+        *,
+        include_fixed: bool = False,
+    ) -> ChoiceTable:
+        """
+        기간 안의 범주별 시간을 ChoiceTable로 (calc_opportunity_cost_table 입력).
+        categories가 있으면 그 순서로 (없는 범주는 0시간), 목록 밖 범주도 뒤에 붙인다.
+        """
+        hours = self.category_hours(start, end)
+        if not include_fixed:
+            hours = {k: v for k, v in hours.items() if k not in FIXED_LABELS}
+        order = list(categories or ())
+        order += [k for k in hours if k not in order]
+        return ChoiceTable.from_blocks([ChoiceBlock(c, hours.get(c, 0.0)) for c in order], categories=order)
+
+    def check_day(self, day: DayLike, basics: TimeBasics, min_gap_minutes: int = 1) -> DayCheck:
+        """하루 기록을 TimeBasics와 비교 (빈 구간, 고정 활동 기록, 선택 활동 초과)."""
+        lo, hi = day_bounds(day)
+        hours = self.category_hours(lo, hi)
+        discretionary, fixed = calc_discretionary_hours(basics)
+        gaps = [(s - lo, e - lo) for s, e in self.gaps(lo, hi, min_gap_minutes)]
+        return DayCheck(
+            day=date.fromordinal(_ordinal(day)),
+            gaps=gaps,
+            unlogged_h=sum(e - s for s, e in gaps) / 60.0,
+            fixed_expected=dict(fixed),
+            fixed_logged={k: hours.get(k, 0.0) for k in fixed},
+            choice_h=sum(v for k, v in hours.items() if k not in FIXED_LABELS),
+            discretionary_h=discretionary,
+        )
+
+
+def find_overlaps(blocks: Iterable[TimeBlock]) -> List[Tuple[TimeBlock, TimeBlock]]:
+    """
+    블록 목록 안에서 서로 겹치는 쌍 (입력 검사용, 넣기 전에 전부 보여주고 싶을 때).
+    시작 순으로 훑으면서 지금까지 가장 늦게 끝나는 블록과만 비교한다. O(n log n)
+    """
+    out: List[Tuple[TimeBlock, TimeBlock]] = []
+    latest: Optional[TimeBlock] = None
+    for b in sorted(blocks):
+        if latest is not None and b.start < latest.end:
+            out.append((latest, b))
+        if latest is None or b.end > latest.end:
+            latest = b
+    return out
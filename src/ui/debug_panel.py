@@ -0,0 +1,77 @@
+# 숨은 디버그 패널: 주소 뒤에 ?debug=1 을 붙이면 사이드바에 표시
+import streamlit as st
+
+from .. import instrument
+from ..cache import all_cache_stats, clear_caches
+
+
+def is_debug_enabled() -> bool:
+    return str(st.query_params.get("debug", "")).lower() in ("1", "true", "yes")
+
+
+def render_debug_panel() -> None:
+    if not is_debug_enabled():
+        return
+
+    with st.sidebar.expander("디버그", expanded=False):
+        st.caption("계산 결과 캐시 (서버 프로세스 공용)")
+        stats = all_cache_stats()
+        st.dataframe(
+            [
+                {
+                    "함수": name.rsplit(".", 1)[-1],
+                    "hit": s.hits,
+                    "miss": s.misses,
+                    "적중률": f"{s.hit_rate:.0%}",
+                    "eviction": s.evictions,
+                    "만료": s.expirations,
+                    "건너뜀": s.bypassed,
+                    "크기": f"{s.size}/{s.maxsize}",
+                }
+                for name, s in stats.items()
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+        if st.button("캐시 비우기", key="debug_clear_cache"):
+            clear_caches(reset_stats=True)
+            st.rerun()
+
+        st.divider()
+        _render_instrument_stats()
+
+
+def _stats_rows(stats):
+    return [
+        {
+            "이름": m.name.rsplit(".", 1)[-1] if m.name.startswith("src.") else m.name,
+            "종류": m.kind,
+            "횟수": m.count,
+            "p50(ms)": round(m.p50_ms, 2),
+            "p95(ms)": round(m.p95_ms, 2),
+            "max(ms)": round(m.max_ms, 2),
+        }
+        for m in stats
+    ]
+
+
+def _render_instrument_stats() -> None:
+    st.caption("계측: 화면/계산 함수 실행 시간 (count / p50 / p95 / max)")
+    on = st.toggle("계측 켜기(프로세스 전체)", value=instrument.is_enabled(), key="debug_instrument_on")
+    if on != instrument.is_enabled():
+        instrument.enable(on)
+    if not on:
+        return
+
+    sid = st.session_state.get("_instrument_sid")
+    scope = st.radio("범위", ["이 세션", "프로세스"], horizontal=True, key="debug_instrument_scope")
+    stats = instrument.session_stats(sid) if scope == "이 세션" and sid else instrument.process_stats()
+    st.dataframe(_stats_rows(stats), use_container_width=True, hide_index=True)
+
+    c1, c2 = st.columns(2)
+    if c1.button("JSONL로 저장", key="debug_instrument_dump"):
+        n = instrument.dump_jsonl()
+        st.toast(f"{n}줄 저장: {instrument.DEFAULT_DUMP_PATH}")
+    if c2.button("계측 초기화", key="debug_instrument_reset"):
+        instrument.reset_stats()
+        st.rerun()
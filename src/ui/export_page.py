@@ -1,11 +1,20 @@
 #부가적인 기능 내보내기 형식
+import io
 import json
+import os
+import tempfile
 import streamlit as st
 from dataclasses import asdict
+from datetime import date
 
+from ..instrument import timed
+from ..history import get_history_store, snapshot_from_state
+from ..history_io import FORMATS, detect_format, export_history, import_history
+from ..snapshot import pack_history
 from ..models import AppState
 
 
+@timed()
 def render_export_page(s: AppState) -> None:
     st.subheader("5) 업데이트 가능 구조(저장/불러오기 틀)")
     st.caption("v0에서는 JSON을 ‘보여주기’까지만. v1에서 파일 업로드/다운로드로 확장하면 된다.")
@@ -20,3 +29,129 @@ def render_export_page(s: AppState) -> None:
     }
 
     st.code(json.dumps(payload, ensure_ascii=False, indent=2), language="json")
+
+    st.divider()
+    _render_history_save(s)
+
+    st.divider()
+    _render_history_transfer(s)
+
+    st.divider()
+    _render_snapshot_export(s)
+
+
+def _render_history_save(s: AppState) -> None:
+    st.subheader("하루 기록 저장")
+    st.caption("지금 설정/배분을 날짜별로 저장해. 같은 날짜에 다시 저장하면 덮어써.")
+
+    store = get_history_store()
+    col1, col2 = st.columns([2, 1])
+    day = col1.date_input("기록 날짜", value=date.today(), key="history_day")
+    if col2.button("이 날짜로 저장", use_container_width=True):
+        store.save_day(snapshot_from_state(s, day))  # 백그라운드에서 기록 (rerun을 막지 않음)
+        st.toast(f"{day.isoformat()} 기록을 저장했어.")
+
+    saved = store.days(s.persona_name)
+    if saved:
+        st.caption(f"저장된 기록: {len(saved)}일 ({saved[0].isoformat()} ~ {saved[-1].isoformat()})")
+
+
+def _render_history_transfer(s: AppState) -> None:
+    st.subheader("기록 파일로 내보내기 / 가져오기")
+    st.caption("저장된 하루 기록 전체를 JSONL/CSV 파일로 주고받아. 몇 년치 기록도 한 줄씩 처리해.")
+
+    store = get_history_store()
+    col1, col2 = st.columns(2)
+    fmt = col1.radio("형식", list(FORMATS), horizontal=True, key="history_export_format")
+    everyone = col2.checkbox("모든 인물의 기록", value=False, key="history_export_all")
+    user_id = None if everyone else s.persona_name
+
+    if st.button("내보내기 파일 만들기", key="history_export_build"):
+        bar = st.progress(0.0, text="내보내는 중...")
+
+        def _progress(done: int, total: int) -> None:
+            bar.progress(min(1.0, done / max(1, total)), text=f"{done:,} / {total:,}일")
+
+        _discard_export()
+        fd, path = tempfile.mkstemp(prefix="history_", suffix=f".{fmt}")
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            n = export_history(store, f, fmt, user_id=user_id, progress=_progress)
+        st.session_state["history_export"] = {"path": path, "fmt": fmt, "days": n}
+
+    exp = st.session_state.get("history_export")
+    if exp and os.path.exists(exp["path"]):
+        with open(exp["path"], "rb") as f:
+            st.download_button(
+                f"history.{exp['fmt']} 받기 ({exp['days']:,}일)",
+                data=f,
+                file_name=f"history.{exp['fmt']}",
+                mime="text/csv" if exp["fmt"] == "csv" else "application/x-ndjson",
+                key="history_export_download",
+            )
+
+    up = st.file_uploader("기록 파일 가져오기 (JSONL / CSV)", type=["jsonl", "json", "csv"], key="history_upload")
+    force = st.checkbox(f"모두 ‘{s.persona_name}’의 기록으로 가져오기", value=False, key="history_import_force")
+    if up is None or not st.button("가져오기", key="history_import"):
+        return
+
+    bar = st.progress(0.0, text="가져오는 중...")
+    size = max(1, up.size)
+
+    def _progress_lines(lines: int) -> None:
+        bar.progress(min(1.0, up.tell() / size), text=f"{lines:,}줄 처리")
+
+    text = io.TextIOWrapper(up, encoding="utf-8-sig", newline="")
+    try:
+        report = import_history(
+            store,
+            text,
+            detect_format(up.name),
+            default_user=s.persona_name,
+            force_user=force,
+            progress=_progress_lines,
+        )
+    except UnicodeDecodeError:
+        st.error("UTF-8 텍스트 파일이 아니야.")
+        return
+    finally:
+        text.detach()
+
+    bar.progress(1.0, text="완료")
+    if report.failed:
+        st.warning(f"{report.imported:,}일 가져옴, {report.failed:,}줄은 건너뛰었어.")
+        st.dataframe([{"행": n, "사유": reason} for n, reason in report.errors], use_container_width=True, hide_index=True)
+    else:
+        st.success(f"{report.imported:,}일 기록을 가져왔어.")
+
+
+def _render_snapshot_export(s: AppState) -> None:
+    st.subheader("바이너리 스냅샷")
+    st.caption("지금 인물의 기록을 고정 길이 레코드 파일(.noasnap)로 묶어. 최근 N일만 읽을 때 파일 전체를 풀지 않아.")
+
+    compress = st.checkbox("블록 압축(zlib)", value=True, key="snapshot_compress")
+    if st.button("스냅샷 파일 만들기", key="snapshot_build"):
+        old = st.session_state.pop("snapshot_export", None)
+        if old and os.path.exists(old["path"]):
+            os.remove(old["path"])
+        fd, path = tempfile.mkstemp(prefix="history_", suffix=".noasnap")
+        os.close(fd)
+        n = pack_history(get_history_store(), path, s.persona_name, compress=compress)
+        st.session_state["snapshot_export"] = {"path": path, "days": n}
+
+    exp = st.session_state.get("snapshot_export")
+    if exp and os.path.exists(exp["path"]):
+        with open(exp["path"], "rb") as f:
+            st.download_button(
+                f"history.noasnap 받기 ({exp['days']:,}일)",
+                data=f,
+                file_name="history.noasnap",
+                mime="application/octet-stream",
+                key="snapshot_download",
+            )
+
+
+def _discard_export() -> None:
+    # 이전에 만든 내보내기 임시 파일 정리
+    old = st.session_state.pop("history_export", None)
+    if old and os.path.exists(old["path"]):
+        os.remove(old["path"])
@@ -0,0 +1,50 @@
+# 화면 조각(fragment) 단위 재실행 + 명시적 무효화
+# - 위젯 묶음을 st.fragment로 감싸면, 그 위젯을 바꿀 때 조각만 다시 그린다(main 전체 재실행 X)
+# - 조각 안에서 AppState 필드를 바꿨다면 invalidate(바뀐 필드)로 알린다
+#   -> 지금 보이는 화면이 그 필드를 읽을 때만 앱 전체를 다시 실행한다
+# - 화면별로 읽는 필드는 main 전체 실행 때마다 set_view_deps(...)로 등록한다
+import streamlit as st
+from typing import Any, Iterable, Sequence, Set, Tuple
+
+from ..instrument import incr
+from ..models import AppState
+from ..state import commit_state
+
+_DEPS_KEY = "_view_deps"
+
+
+def set_view_deps(fields: Iterable[str]) -> None:
+    """이번 실행에서 그리는 화면이 읽는 AppState 필드 (다음 전체 실행 전까지 유지)."""
+    st.session_state[_DEPS_KEY] = frozenset(fields)
+
+
+def _freeze(v: Any) -> Any:
+    # 값 비교용 복사본 (weights처럼 제자리에서 바뀌는 dict도 비교할 수 있게)
+    if isinstance(v, dict):
+        return tuple(sorted((k, _freeze(x)) for k, x in v.items()))
+    if isinstance(v, (list, tuple)):
+        return tuple(_freeze(x) for x in v)
+    return v
+
+
+def state_signature(s: AppState, fields: Sequence[str]) -> Tuple[Any, ...]:
+    return tuple(_freeze(getattr(s, f, None)) for f in fields)
+
+
+def changed_fields(s: AppState, fields: Sequence[str], before: Tuple[Any, ...]) -> Set[str]:
+    after = state_signature(s, fields)
+    return {f for f, a, b in zip(fields, after, before) if a != b}
+
+
+def invalidate(changed: Iterable[str]) -> None:
+    """바뀐 필드를 읽는 화면이 있으면 앱 전체 재실행. (등록된 의존성이 없으면 안전하게 재실행)"""
+    changed = set(changed)
+    if not changed:
+        return
+    # 조각만 다시 실행될 때는 app.py의 commit_state를 거치지 않으므로 여기서 저장
+    commit_state()
+    deps = st.session_state.get(_DEPS_KEY)
+    if deps is None or deps & changed:
+        incr("ui.invalidate.rerun")
+        st.rerun()
+    incr("ui.invalidate.skipped")
@@ -1,8 +1,20 @@
+from typing import List
+
 import streamlit as st
 
-from ..models import AppState, ChoiceBlock
+from ..calc import calc_discretionary_hours
+from ..instrument import timed
+from ..models import AppState, ChoiceBlock, ChoiceTable
+from ..precompute import for_session, schedule_support_tables
+from ..timeline import FIXED_LABELS, Timeline, day_bounds, find_overlaps, format_block, format_hhmm, make_cycle_blocks
+
+# 입력 화면의 블록은 날짜 없이 "하루"로만 다룬다 (타임라인 위치는 아무 날이나 고정)
+_BLOCK_DAY = 1
+_BLOCKS_EDITOR_KEY = "time_blocks_editor"
+_BLOCKS_BASE_KEY = "_time_blocks_base"
 
 
+@timed()
 def render_input_page(s: AppState, discretionary: float) -> None:
     st.subheader("1) 기본 생활 시간(필수)")
     st.caption("정확하지 않아도 괜찮아. 대략적으로만 적어도 계산은 돌아가게 만든다.")
@@ -22,6 +34,24 @@ def render_input_page(s: AppState, discretionary: float) -> None:
 
     categories = list(s.weights.keys())
 
+    entry = st.radio("입력 방식", ["범주별 합계", "시간 블록"], horizontal=True, key="input_entry_mode")
+    if entry == "시간 블록":
+        used = _render_time_blocks(s, categories)
+    else:
+        used = _render_category_totals(s, categories)
+
+    # 의사결정 지원 화면의 표는 백그라운드에서 미리 계산 (입력이 그대로면 다시 예약하지 않고, 바뀌면 이전 작업 취소)
+    # discretionary는 위에서 바꾼 기본 생활 시간 기준으로 다시 (지원 화면이 쓰는 값과 같게)
+    schedule_support_tables(for_session(st.session_state), s, calc_discretionary_hours(s.basics)[0])
+
+    st.info(f"선택 가능한 시간(추정): {discretionary:.1f}시간 / 현재 배분 합계: {used:.1f}시간")
+    if used > discretionary + 0.25:
+        st.warning("배분 시간이 선택 가능한 시간을 초과했어. 괜찮아—대략치니까. 필요하면 조금만 줄여봐.")
+    elif used < max(0.0, discretionary - 2.0):
+        st.caption("배분하지 않은 시간이 남아 있어. 일부러 비워두는 것도 하나의 선택이야.")
+
+
+def _render_category_totals(s: AppState, categories: List[str]) -> float:
     # 기존 입력값 유지용 매핑
     existing = {c.label: float(c.hours) for c in (s.choices or [])}
 
@@ -49,10 +79,61 @@ def render_input_page(s: AppState, discretionary: float) -> None:
         new_choices.append(ChoiceBlock(cat, float(hours)))
 
     # 저장(범주 고정)
-    s.choices = new_choices
-
-    st.info(f"선택 가능한 시간(추정): {discretionary:.1f}시간 / 현재 배분 합계: {used:.1f}시간")
-    if used > discretionary + 0.25:
-        st.warning("배분 시간이 선택 가능한 시간을 초과했어. 괜찮아—대략치니까. 필요하면 조금만 줄여봐.")
-    elif used < max(0.0, discretionary - 2.0):
-        st.caption("배분하지 않은 시간이 남아 있어. 일부러 비워두는 것도 하나의 선택이야.")
\ No newline at end of file
+    s.choices = ChoiceTable.from_blocks(new_choices, categories=categories)
+    return used
+
+
+def _render_time_blocks(s: AppState, categories: List[str]) -> float:
+    # 시작~끝 블록으로 하루를 적으면 타임라인(src/timeline.py)으로 합쳐서 범주별 시간으로
+    st.caption("시작~끝 시각으로 적으면 범주별 시간으로 합쳐서 계산해. 끝이 시작보다 이르면 자정을 넘긴 걸로 봐. (수면/식사 같은 필수 시간도 적을 수 있어)")
+    # data_editor는 처음 넘긴 데이터 위에 편집 내역을 쌓으므로, 위젯이 살아 있는 동안은 같은 원본을 넘긴다
+    if _BLOCKS_EDITOR_KEY not in st.session_state or _BLOCKS_BASE_KEY not in st.session_state:
+        # 비어 있으면 빈 줄 하나로 (열 타입이 문자열로 잡히게)
+        st.session_state[_BLOCKS_BASE_KEY] = [dict(r) for r in s.time_blocks] or [{"start": "", "end": "", "label": ""}]
+    rows = st.data_editor(
+        st.session_state[_BLOCKS_BASE_KEY],
+        num_rows="dynamic",
+        column_config={
+            "start": st.column_config.TextColumn("시작(HH:MM)", required=True),
+            "end": st.column_config.TextColumn("끝(HH:MM)", required=True),
+            "label": st.column_config.SelectboxColumn("범주", options=categories + list(FIXED_LABELS), required=True),
+        },
+        use_container_width=True,
+        hide_index=True,
+        key=_BLOCKS_EDITOR_KEY,
+    )
+    s.time_blocks = [{k: str(r.get(k) or "") for k in ("start", "end", "label")} for r in rows if any(r.values())]
+
+    blocks = []
+    for n, r in enumerate(s.time_blocks, start=1):
+        if not (r["start"] and r["end"] and r["label"]):
+            continue
+        try:
+            blocks += make_cycle_blocks(_BLOCK_DAY, r["start"], r["end"], r["label"])
+        except ValueError as e:
+            st.error(f"{n}번째 줄: {e}")
+            return _used_hours(s)
+    if not blocks:
+        return _used_hours(s)
+    overlaps = find_overlaps(blocks)
+    if overlaps:
+        st.error("겹치는 블록이 있어: " + " · ".join(f"{format_block(a)} / {format_block(b)}" for a, b in overlaps[:3]))
+        return _used_hours(s)
+
+    timeline = Timeline(blocks)
+    day = day_bounds(_BLOCK_DAY)
+    s.choices = timeline.choices(*day, categories)
+    check = timeline.check_day(_BLOCK_DAY, s.basics, min_gap_minutes=15)
+
+    if blocks and check.gaps:
+        longest = max(check.gaps, key=lambda g: g[1] - g[0])
+        st.caption(f"기록이 없는 시간: {check.unlogged_h:.1f}시간 (가장 긴 빈 구간 {format_hhmm(longest[0])}~{format_hhmm(longest[1])})")
+    missing = check.fixed_missing
+    if missing:
+        st.caption("필수 시간 설정보다 적게 적힌 항목 → " + " · ".join(f"{k} {v:.1f}시간" for k, v in missing.items()))
+    return check.choice_h
+
+
+def _used_hours(s: AppState) -> float:
+    # 블록 입력에 오류가 있으면 이전 배분을 그대로 둔다
+    return float(sum(c.hours for c in (s.choices or [])))
@@ -1,6 +1,9 @@
 import streamlit as st
+from ..instrument import timed
 from ..models import AppState
+from ..sensitivity import surface_for
 
+@timed()
 def render_onboarding_page(s: AppState) -> None:
     st.header("먼저, 당신의 기준을 정해볼까요?")
 
@@ -33,6 +36,10 @@ def render_onboarding_page(s: AppState) -> None:
             note = "자기 인식 기반 환산값(공식 통계 아님)."
 
         st.subheader("활동 중요도(가중치)")
+        # 지금 시간 배분에서 가중치를 바꿀 때 가치가 많이 달라지는 범주 (반응면 조회라 계산 없음)
+        hints = surface_for(s.choices, s.weights, s.valuation_mode).weight_hints(s.weights, s.basis_hour_value, limit=2)
+        if hints and (hints[0].up or hints[0].down):
+            st.caption("가중치에 민감한 범주 → " + " · ".join(h.describe() for h in hints))
         new_weights = {k: st.slider(k, 0, 100, int(v)) for k, v in s.weights.items()}
 
         apply = st.form_submit_button("설정 완료! 다음 단계로", type="primary", use_container_width=True)
@@ -44,4 +51,4 @@ def render_onboarding_page(s: AppState) -> None:
         s.onboarding_completed = True
 
         st.session_state["scroll_to"] = "main_top"  # ✅ 메인 상단으로 자동 점프
-        st.rerun()
\ No newline at end of file
+        st.rerun()
\ No newline at end of file
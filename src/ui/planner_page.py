@@ -0,0 +1,132 @@
+# 주간 계획 페이지: 요일마다 기본 생활 시간 / 범주별 시간을 정하고 한 주의 가치를 히트맵으로
+import altair as alt
+import streamlit as st
+
+from ..calc import krw
+from ..instrument import timed
+from ..models import AppState, TimeBasics
+from ..planner import (
+    BASICS_FIELDS,
+    DAYS,
+    WeekEvaluation,
+    WeekPlan,
+    apply_move,
+    evaluate_week,
+    load_week_plan,
+    rank_week_moves,
+)
+from ..state import commit_state
+from .fragments import changed_fields, invalidate, state_signature
+
+_BASICS_LABELS = {
+    "sleep_h": "수면",
+    "meals_h": "식사",
+    "hygiene_h": "위생/용변/정리",
+    "commute_h": "이동",
+    "chores_h": "필수 집안일",
+}
+_HOURS_EDITOR = "week_hours_editor"
+_BASICS_EDITOR = "week_basics_editor"
+_BASE_KEY = "_week_plan_base"
+_MOVE_LIMIT = 5
+
+
+@timed()
+def render_planner_page(s: AppState) -> None:
+    st.subheader("주간 계획")
+    st.caption("요일마다 필수 시간과 범주별 시간을 다르게 잡아 보고, 한 주 전체의 가치를 한눈에 봐.")
+
+    if st.button("오늘 입력으로 일주일 채우기"):
+        s.week_plan = WeekPlan.from_state(s).to_dict()
+        _reset_editors()
+
+    _render_week(s)
+
+
+def _reset_editors() -> None:
+    # data_editor는 처음 넘긴 데이터 위에 편집 내역을 쌓으므로, 계획을 통째로 바꿀 때는 위젯도 새로 만든다
+    for k in (_HOURS_EDITOR, _BASICS_EDITOR, _BASE_KEY):
+        st.session_state.pop(k, None)
+
+
+@st.fragment
+def _render_week(s: AppState) -> None:
+    # 조각: 표를 고치면 이 부분만 다시 그린다 (다른 화면은 week_plan을 읽지 않는다)
+    before = state_signature(s, ("week_plan",))
+
+    stale = _BASE_KEY in st.session_state and st.session_state[_BASE_KEY].categories != tuple(s.weights)
+    if stale or _HOURS_EDITOR not in st.session_state or _BASE_KEY not in st.session_state:
+        # 처음이거나 범주 구성이 바뀌었으면(가치 환산 모드 변경) 저장된 계획으로 다시
+        _reset_editors()
+        st.session_state[_BASE_KEY] = load_week_plan(s)
+    base: WeekPlan = st.session_state[_BASE_KEY]
+    categories = list(base.categories)
+
+    rows = st.data_editor(
+        [{"요일": d, **{c: float(h) for c, h in zip(categories, base.hours[i])}} for i, d in enumerate(DAYS)],
+        disabled=["요일"],
+        column_config={c: st.column_config.NumberColumn(c, min_value=0.0, max_value=24.0, step=0.5) for c in categories},
+        use_container_width=True,
+        hide_index=True,
+        key=_HOURS_EDITOR,
+    )
+    with st.expander("요일별 기본 생활 시간(필수)", expanded=False):
+        basics_rows = st.data_editor(
+            [{"요일": d, **{_BASICS_LABELS.get(f, f): float(getattr(b, f)) for f in BASICS_FIELDS}} for d, b in zip(DAYS, base.basics)],
+            disabled=["요일"],
+            use_container_width=True,
+            hide_index=True,
+            key=_BASICS_EDITOR,
+        )
+
+    plan = base.with_hours([[float(r.get(c) or 0.0) for c in categories] for r in rows]).with_basics(
+        [TimeBasics(**{f: float(r.get(_BASICS_LABELS.get(f, f)) or 0.0) for f in BASICS_FIELDS}) for r in basics_rows]
+    )
+    s.week_plan = plan.to_dict()
+
+    ev = evaluate_week(plan, s.basis_hour_value, s.weights, s.valuation_mode)
+
+    cA, cB, cC = st.columns(3)
+    cA.metric("한 주 가치", krw(ev.total))
+    cB.metric("하루 평균", krw(ev.total / len(DAYS)))
+    cC.metric("초과 요일", f"{int((ev.over > 0.25).sum())}일")
+
+    st.altair_chart(_heatmap(plan, ev), use_container_width=True)
+    over_days = [f"{DAYS[i]}(+{ev.over[i]:.1f}h)" for i in range(len(DAYS)) if ev.over[i] > 0.25]
+    if over_days:
+        st.warning("선택 가능한 시간을 넘긴 요일: " + ", ".join(over_days))
+
+    st.markdown("#### 요일을 건너는 재배분")
+    delta_h = st.number_input("이동 시간(시간)", min_value=0.5, max_value=8.0, value=1.0, step=0.5, key="week_move_h")
+    moves = [m for m in rank_week_moves(plan, ev, delta_h, _MOVE_LIMIT) if m.gain > 0]
+    if not moves:
+        st.caption("지금 계획에서 가치가 늘어나는 재배분이 없어. (선택 가능한 시간 안에서)")
+    else:
+        st.markdown("\n".join(f"{i}. **{m.describe()}** : **+{krw(m.gain)}**" for i, m in enumerate(moves, start=1)))
+        pick = st.selectbox("적용해 볼 재배분", range(len(moves)), format_func=lambda i: moves[i].describe(), key="week_move_pick")
+        if st.button("이 재배분 적용"):
+            s.week_plan = apply_move(plan, moves[pick]).to_dict()
+            _reset_editors()
+            commit_state()
+            st.rerun()
+    st.caption("※ 재배분은 범주별 유효가치(가중치 × 모드 계수) 차이만 본 기준선이야. 요일마다의 사정은 네가 제일 잘 알아.")
+
+    invalidate(changed_fields(s, ("week_plan",), before))
+
+
+def _heatmap(plan: WeekPlan, ev: WeekEvaluation) -> alt.LayerChart:
+    values = [
+        {"요일": DAYS[d], "범주": c, "가치": float(ev.values[d, j]), "시간": float(plan.hours[d, j])}
+        for d in range(len(DAYS))
+        for j, c in enumerate(plan.categories)
+    ]
+    base = alt.Chart(alt.Data(values=values)).encode(
+        x=alt.X("요일:N", sort=list(DAYS), title=None),
+        y=alt.Y("범주:N", sort=list(plan.categories), title=None),
+    )
+    rect = base.mark_rect().encode(
+        color=alt.Color("가치:Q", scale=alt.Scale(scheme="greens"), title="가치(원)"),
+        tooltip=["요일:N", "범주:N", alt.Tooltip("시간:Q", format=".1f"), alt.Tooltip("가치:Q", format=",.0f")],
+    )
+    text = base.mark_text(fontSize=11).encode(text=alt.Text("시간:Q", format=".1f"))
+    return rect + text
@@ -1,10 +1,15 @@
 #선택지에 따른 가치환산 결과창
 import streamlit as st
 
+from ..aggregates import history_aggregates
+from ..instrument import timed
+from ..history import get_history_store
 from ..models import AppState
 from ..calc import calc_opportunity_cost_table, krw
+from ..uncertainty import simulate_value_bands, triangular
 
 
+@timed()
 def render_results_page(s: AppState, discretionary: float, fixed: dict) -> None:
     st.subheader("선택한 활동의 가치")
     st.caption("선택한 활동에 대해 너가 생각한 가치를 보여준다.")
@@ -17,9 +22,11 @@ def render_results_page(s: AppState, discretionary: float, fixed: dict) -> None:
 
     if not s.choices:
         st.info("선택지(시간 배분)가 아직 없어. 입력 탭에서 추가해줘.")
+        st.divider()
+        _render_history_totals(s)
         return
 
-    df = calc_opportunity_cost_table(s.choices, s.basis_hour_value)
+    df = calc_opportunity_cost_table(s.choices, s.basis_hour_value, alpha_mode=s.valuation_mode)
     df_show = df.copy()
     df_show["가치환산(원)"] = df_show["가치환산(원)"].apply(krw)
     st.dataframe(df_show, use_container_width=True, hide_index=True)
@@ -31,3 +38,116 @@ def render_results_page(s: AppState, discretionary: float, fixed: dict) -> None:
         "- 이 숫자는 **평가가 아니라 가시화**야.\n"
         "- 휴식도 선택이고 실행도 선택이야. 중요한 건 **내가 지금 어떤 선택을 하고 있는지**를 인식하는 것."
     )
+
+    st.divider()
+    _render_value_bands(s, df)
+
+    st.divider()
+    _render_history_totals(s)
+
+
+@st.fragment
+def _render_value_bands(s: AppState, df) -> None:
+    """
+    불확실성 모드: 선택별 p_conv / multiplier 범위를 정하면 총 가치의 범위를 보여준다.
+    (조각: 범위/표본 수를 바꿔도 이 부분만 다시 계산)
+    """
+    if df.empty or not st.toggle("불확실성 모드(가치의 범위 보기)", key="uncertainty_mode"):
+        return
+
+    st.caption("전환 확률(p_conv)과 상태 가중치(multiplier)를 ‘최소~최빈~최대’ 범위로 두고 여러 번 뽑아본 결과야.")
+    ranges = st.data_editor(
+        [
+            {
+                "선택": label,
+                "p_conv 최소": max(0.0, p - 0.2),
+                "p_conv 최빈": p,
+                "p_conv 최대": min(1.0, p + 0.2),
+                "multiplier 최소": max(0.0, m - 0.2),
+                "multiplier 최빈": m,
+                "multiplier 최대": m + 0.2,
+            }
+            for label, p, m in zip(df["선택"], df["p_conv"], df["multiplier"])
+        ],
+        disabled=["선택"],
+        use_container_width=True,
+        hide_index=True,
+        key="uncertainty_ranges",
+    )
+    n_samples = st.select_slider("표본 수", options=[10_000, 100_000, 1_000_000], value=100_000)
+
+    try:
+        p_dists = [triangular(*sorted((r["p_conv 최소"], r["p_conv 최빈"], r["p_conv 최대"]))) for r in ranges]
+        m_dists = [triangular(*sorted((r["multiplier 최소"], r["multiplier 최빈"], r["multiplier 최대"]))) for r in ranges]
+    except (TypeError, ValueError):
+        st.warning("범위 값을 숫자로 채워줘.")
+        return
+
+    bands = simulate_value_bands(
+        df["시간(시간)"].to_numpy(),
+        s.basis_hour_value,
+        df["alpha"].to_numpy(),
+        p_dists,
+        m_dists,
+        n_samples=n_samples,
+        seed=0,
+    )
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("평균", krw(bands.mean[0]))
+    c2.metric("P10", krw(bands.p10[0]))
+    c3.metric("P50", krw(bands.p50[0]))
+    c4.metric("P90", krw(bands.p90[0]))
+    st.caption(f"가능한 범위: {krw(bands.low[0])} ~ {krw(bands.high[0])} (표본 {bands.n_samples:,}개)")
+
+
+_PERIOD_LABELS = {"week": "주간", "month": "월간"}
+
+
+@st.fragment
+def _render_history_totals(s: AppState) -> None:
+    """
+    저장된 하루 기록의 주간/월간 합계 (내보내기 탭에서 저장한 기록 기준).
+    합계는 누적 집계(aggregates)에서 바로 꺼내므로 기록이 길어도 날마다 다시 계산하지 않는다.
+    """
+    st.subheader("기록 흐름(주간/월간)")
+    agg = history_aggregates(get_history_store(), s.persona_name, s.valuation_mode)
+    if agg.last_day is None:
+        st.caption("아직 저장된 하루 기록이 없어. 내보내기 탭에서 날짜별로 저장하면 여기서 흐름을 볼 수 있어.")
+        return
+
+    col1, col2 = st.columns([1, 2])
+    period = col1.radio("단위", list(_PERIOD_LABELS), format_func=_PERIOD_LABELS.get, horizontal=True, key="history_period")
+    count = col2.slider("기간 수", 2, 26 if period == "week" else 12, 8 if period == "week" else 6, key="history_period_count")
+
+    windows = agg.periods(period, count)
+    st.dataframe(
+        [
+            {
+                "기간": f"{w.start.isoformat()} ~ {w.end.isoformat()}",
+                "기록일": w.days,
+                "시간(시간)": round(w.total_hours, 1),
+                "가치(원)": krw(w.total_value),
+                "가중 가치(원)": krw(w.total_effective),
+            }
+            for w in windows
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+    st.bar_chart(
+        {"가중 가치(원)": [w.total_effective for w in windows]},
+        x_label=_PERIOD_LABELS[period],
+    )
+
+    latest = windows[-1]
+    st.caption(f"가장 최근 {_PERIOD_LABELS[period]} 범주별 시간 ({latest.start.isoformat()} ~ {latest.end.isoformat()})")
+    st.dataframe(
+        [
+            {"범주": label, "시간(시간)": round(float(h), 1), "가중 가치(원)": krw(float(e))}
+            for label, h, e in zip(latest.categories, latest.hours, latest.effective)
+            if h > 0
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
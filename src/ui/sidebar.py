@@ -1,30 +1,71 @@
 #첫 설정한 내용 수정용으로 사용!
 import streamlit as st
+from ..calc import krw
 from ..models import AppState
+from ..modes import get_mode, mode_names
+from ..sensitivity import surface_for
+from ..state import switch_mode
+from .fragments import changed_fields, invalidate, state_signature
+
+# 사이드바에서 바꿀 수 있는 AppState 필드
+_SIDEBAR_FIELDS = ("persona_name", "value_reference", "basis_hour_value", "basis_note", "weights", "valuation_mode")
 
 
 def render_sidebar(s: AppState) -> None:
-    st.sidebar.header("설정")
+    # 사이드바는 조각(fragment)으로: 위젯을 바꿔도 사이드바만 다시 그리고,
+    # 지금 화면이 읽는 필드가 바뀐 경우에만 앱 전체를 다시 실행한다
+    with st.sidebar:
+        _render_sidebar_fragment(s)
+
+
+@st.fragment
+def _render_sidebar_fragment(s: AppState) -> None:
+    before = state_signature(s, _SIDEBAR_FIELDS)
+
+    st.header("설정")
 
     # 온보딩 상태 표시 + 재시작 버튼
     if s.onboarding_completed:
-        st.sidebar.success("온보딩 완료")
-        if st.sidebar.button("온보딩 다시하기"):
+        st.success("온보딩 완료")
+        if st.button("온보딩 다시하기"):
             s.onboarding_completed = False
             st.rerun()
     else:
-        st.sidebar.warning("온보딩 진행 전")
+        st.warning("온보딩 진행 전")
 
-    s.persona_name = st.sidebar.text_input("인물 이름", value=s.persona_name)
+    s.persona_name = st.text_input("인물 이름", value=s.persona_name)
 
-    st.sidebar.subheader("기준 시점")
-    s.value_reference = st.sidebar.selectbox("전성기/현재/미래", ["전성기", "현재", "미래"], index=["전성기", "현재", "미래"].index(s.value_reference))
+    st.subheader("기준 시점")
+    s.value_reference = st.selectbox("전성기/현재/미래", ["전성기", "현재", "미래"], index=["전성기", "현재", "미래"].index(s.value_reference))
 
-    st.sidebar.subheader("시간가치 기준(원/시간)")
-    s.basis_hour_value = st.sidebar.number_input("기준 시간가치", min_value=0.0, value=float(s.basis_hour_value), step=500.0)
-    s.basis_note = st.sidebar.text_area("기준 설명(선택)", value=s.basis_note, height=70)
+    st.subheader("가치 환산 모드")
+    names = mode_names()
+    mode = st.selectbox(
+        "모드",
+        names,
+        index=names.index(s.valuation_mode) if s.valuation_mode in names else 0,
+        format_func=lambda name: get_mode(name).title,
+    )
+    if mode != s.valuation_mode:
+        switch_mode(s, mode)
+    if get_mode(mode).note:
+        st.caption(get_mode(mode).note)
 
-    st.sidebar.subheader("활동 중요도(가중치)")
-    with st.sidebar.expander("가중치 수정", expanded=False):
+    # 미리보기: 지금 배분의 반응면(가중치 / 기준가치가 바뀌어도 다시 환산하지 않고 표에서 조회)
+    surface = surface_for(s.choices, s.weights, s.valuation_mode)
+
+    st.subheader("시간가치 기준(원/시간)")
+    s.basis_hour_value = st.number_input("기준 시간가치", min_value=0.0, value=float(s.basis_hour_value), step=500.0)
+    st.caption(f"기준 +500원/시간 → 합계 {krw(surface.total(s.weights, 500.0))} 증가")
+    s.basis_note = st.text_area("기준 설명(선택)", value=s.basis_note, height=70)
+
+    st.subheader("활동 중요도(가중치)")
+    with st.expander("가중치 수정", expanded=False):
         for k in list(s.weights.keys()):
             s.weights[k] = st.slider(k, 0, 100, int(s.weights[k]), key=f"sb_w_{k}")
+        st.caption(f"합계 미리보기: **{krw(surface.total(s.weights, s.basis_hour_value))}**")
+        hints = surface.weight_hints(s.weights, s.basis_hour_value, limit=1)
+        if hints and (hints[0].up or hints[0].down):
+            st.caption(f"가장 크게 움직이는 가중치 → {hints[0].describe()}")
+
+    invalidate(changed_fields(s, _SIDEBAR_FIELDS, before))
@@ -1,8 +1,211 @@
-#의사 결정 지원 UI
+# 의사결정지원(회고록/대안가치) 페이지
+import numpy as np
 import streamlit as st
+from datetime import date
+from typing import Dict, List, Tuple
 
+from ..instrument import timed
+from ..choices import category_hours, reallocate_hours
 from ..models import AppState
-from ..quotes import pick_quote
+from ..optimize import optimize_choices
+from ..precompute import SWEEP, SupportTables, for_session, support_tables
+from ..quotes import state_quote
+from ..calc import (
+    calc_opportunity_cost_table,
+    krw,
+    rank_reallocation_moves,
+)
+
+
+# -----------------------------
+# 내부 유틸: choices(dict / 객체 / ChoiceTable)는 choices.normalize_choices로 한 번 정리해서 열로 다룬다
+# -----------------------------
+def _aggregate_hours_by_category(choices: List[dict]) -> Dict[str, float]:
+    return category_hours(choices)
+
+
+# -----------------------------
+# 대안 시나리오: "A에서 Δh 빼서 B에 더하기"
+# choices 구조를 최대한 유지하면서 "시간"만 수정
+# -----------------------------
+@timed()
+def _reallocate_time_between_categories(
+    choices: List[dict],
+    reduce_from_cat: str,
+    add_to_cat: str,
+    delta_h: float,
+) -> Tuple[List[dict], float]:
+    """
+    returns: (new_choices, moved_hours)
+    - reduce_from_cat에 속한 choice들의 시간을 합쳐서 delta_h만큼 줄이고
+      add_to_cat에 속한 choice(들) 중 첫 번째에 delta_h만큼 더함(없으면 새 choice 생성)
+    """
+    return reallocate_hours(choices, reduce_from_cat, add_to_cat, delta_h)
+
+
+# -----------------------------
+# "가능성" 블록: 1시간 재배분 시 가치 변화(가중치 기반)
+# -----------------------------
+def _shift_gain_per_hour(base_hour_value: float, w_add: float, w_reduce: float) -> float:
+    return float(base_hour_value) * (float(w_add) - float(w_reduce))
+
+
+@st.fragment
+def _render_optimal_allocation(s: AppState, discretionary: float, tables: SupportTables) -> None:
+    # 조각: 최소/최대 제약을 바꾸면 최적 배분만 다시 계산
+    st.subheader("최적 배분: 제약 안에서 가치가 가장 큰 시간 배분")
+    st.caption("범주별 최소/최대 시간(예: 회복 2시간 이상)을 정하면, 선택 가능한 시간 안에서 가치가 가장 큰 배분을 계산해.")
+
+    budget = max(0.0, float(discretionary))
+    categories = tables.categories
+    default_bounds = [{"범주": c, "최소(시간)": 0.0, "최대(시간)": budget} for c in categories]
+    bounds = st.data_editor(
+        default_bounds,
+        disabled=["범주"],
+        use_container_width=True,
+        hide_index=True,
+        key="opt_bounds_editor",
+    )
+
+    if tables.optimal is not None and list(bounds) == default_bounds:
+        # 제약을 손대지 않았으면 미리 계산한 결과
+        res = tables.optimal
+    else:
+        try:
+            res = optimize_choices(
+                s.choices,
+                budget,
+                s.basis_hour_value,
+                categories=categories,
+                weights=s.weights,
+                alpha_mode=s.valuation_mode,
+                min_hours={row["범주"]: row["최소(시간)"] for row in bounds},
+                max_hours={row["범주"]: row["최대(시간)"] for row in bounds},
+            )
+        except ValueError as e:
+            st.warning(str(e))
+            return
+
+    cA, cB, cC = st.columns(3)
+    cA.metric("현재 가치", f"{res.current_value:,.0f}원")
+    cB.metric("최적 배분 가치", f"{res.total_value:,.0f}원")
+    cC.metric("차이(최적-현재)", f"{res.gap:,.0f}원")
+
+    st.dataframe(
+        [
+            {
+                "범주": c,
+                "현재(시간)": float(cur),
+                "최적(시간)": float(opt),
+                "변화(시간)": float(d),
+                "유효가치(원/시간)": krw(v),
+            }
+            for c, cur, opt, d, v in zip(
+                res.categories, res.current_hours, res.hours, res.delta_hours, res.value_per_hour
+            )
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+    st.caption("※ 최적 배분은 ‘정답’이 아니라, 지금 정한 가중치 기준으로 본 하나의 기준선이야.")
+
+
+@st.fragment
+def _render_reflection_questions() -> None:
+    # 조각: 답을 입력해도 위의 가치 표는 다시 계산하지 않는다
+    st.subheader("회고 질문 3개")
+    st.write("비교/평가가 아니라 **정리/인식**을 돕는 질문이야.")
+
+    st.text_area("1) 오늘 가장 의미 있었던 선택(순간)은 무엇이었나요?", height=90)
+    st.text_area("2) 내일도 유지하고 싶은 선택은 무엇인가요? (이유 포함)", height=90)
+    st.text_area("3) 내일 ‘1시간’만 바꿀 수 있다면, 어디에 쓰고 싶나요?", height=90)
+
+    st.markdown(
+        "- 이 숫자는 **평가가 아니라 가시화**야.\n"
+        "- 휴식도 선택이고 실행도 선택이야. 중요한 건 **내가 지금 어떤 선택을 하고 있는지**를 인식하는 것."
+    )
+
+
+@st.fragment
+def _render_alternative_compare(s: AppState, tables: SupportTables) -> None:
+    # 조각: 범주/이동 시간을 바꾸면 대안 비교만 다시 계산 (미리 계산한 조합이면 그대로)
+    categories = tables.categories
+    total_now = tables.total_now
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        add_to = st.selectbox("늘릴 범주(+)", categories, index=0)
+    with col2:
+        reduce_from = st.selectbox("줄일 범주(-)", categories, index=min(1, len(categories) - 1))
+    with col3:
+        delta_h = st.number_input("이동 시간(시간)", min_value=0.0, max_value=24.0, value=1.0, step=0.5)
+
+    found = tables.scenarios.get((add_to, reduce_from, float(delta_h)))
+    if found is not None:
+        df_alt, moved = found
+    else:
+        alt_choices, moved = _reallocate_time_between_categories(
+            s.choices,
+            reduce_from_cat=reduce_from,
+            add_to_cat=add_to,
+            delta_h=delta_h,
+        )
+        df_alt = calc_opportunity_cost_table(alt_choices, s.basis_hour_value, weights=s.weights, alpha_mode=s.valuation_mode)
+    total_alt = float(df_alt["가치환산(원)"].sum()) if not df_alt.empty else 0.0
+    diff = total_alt - total_now
+
+    cA, cB, cC = st.columns(3)
+    cA.metric("현재 가치", f"{total_now:,.0f}원")
+    cB.metric("대안 가치", f"{total_alt:,.0f}원")
+    cC.metric("차이(대안-현재)", f"{diff:,.0f}원")
+
+    if moved < float(delta_h) and float(delta_h) > 0:
+        st.caption(f"※ 줄일 범주({reduce_from})에서 실제로 이동 가능한 시간이 부족해서 **{moved:.1f}시간**만 이동했어.")
+
+    with st.expander("대안 시간 배분 테이블 보기", expanded=False):
+        df_alt_show = df_alt.copy()
+        if "가치환산(원)" in df_alt_show.columns:
+            df_alt_show["가치환산(원)"] = df_alt_show["가치환산(원)"].apply(krw)
+        st.dataframe(df_alt_show, use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def _render_reallocation_gains(s: AppState, tables: SupportTables) -> None:
+    # 조각: 표시 개수 슬라이더는 이 부분만 다시 그린다
+    st.subheader("가능성: ‘1시간 재배분’ 시 가치 변화(시뮬레이션)")
+    st.caption("모든 조합의 변화량을 범주별 유효가치로 한 번에 계산해서 보여줘.")
+
+    profile, gains = tables.profile, tables.gains
+    n_moves = int(np.count_nonzero(~np.isnan(gains)))
+
+    if n_moves == 0:
+        st.write("- 현재 시간 분포상 ‘줄일 수 있는 범주’가 부족해서 조합을 만들기 어려워.")
+        return
+
+    top_n = st.slider("표시할 조합 개수", min_value=3, max_value=min(30, n_moves), value=min(10, n_moves))
+    rows = rank_reallocation_moves(profile, gains, limit=top_n)
+    for i, (a, r, gain) in enumerate(rows[:top_n], start=1):
+        if gain > 0:
+            st.write(f"{i}. **{r} 1h → {a} 1h** : **+{gain:,.0f}원**")
+        elif gain < 0:
+            st.write(f"{i}. **{r} 1h → {a} 1h** : **{gain:,.0f}원**")
+        else:
+            st.write(f"{i}. **{r} 1h → {a} 1h** : 변화 없음")
+
+    best_a, best_r, best_gain = rows[0]
+    if best_gain > 0:
+        st.success(f"**{best_r} → {best_a} (1시간)** 이동이 **약 +{best_gain:,.0f}원**로 가장 커.")
+    else:
+        st.info("큰 이득이 나는 1시간 재배분이 뚜렷하지 않아.")
+
+    with st.expander("이동 시간(Δh)별 최대 변화량 보기", expanded=False):
+        sweep_rows = []
+        for dh, g in zip(SWEEP, tables.sweep_gains):
+            best = rank_reallocation_moves(profile, g, limit=1)
+            if best:
+                a, r, gain = best[0]
+                sweep_rows.append({"이동 시간(시간)": float(dh), "조합": f"{r} → {a}", "변화량(원)": krw(gain)})
+        st.dataframe(sweep_rows, use_container_width=True, hide_index=True)
 
 
 def _sunk_cost_text() -> str:
@@ -14,6 +217,7 @@ def _sunk_cost_text() -> str:
     )
 
 
+@timed()
 def render_support_page(s: AppState) -> None:
     st.subheader("의사결정 지원(비난 없음)")
     st.caption("선택을 ‘정답/오답’으로 판정하지 않고, 다음 질문을 던지는 형태로 돕는다.")
@@ -32,5 +236,72 @@ def render_support_page(s: AppState) -> None:
 
     st.divider()
     st.subheader("오늘의 한 문장")
-    st.write(pick_quote())
+    # 오늘의 시간 배분에 맞는 문구 묶음에서, 날짜를 seed로 골라 같은 날에는 rerun해도 같은 문장
+    _, quote = state_quote(s.choices, s.basics, seed=date.today().toordinal())
+    st.write(quote)
     st.caption("이 앱은 너를 몰아붙이기 위한 도구가 아니다. 시간을 ‘보여주기’ 위한 도구다.")
+
+
+@timed()
+def render_decision_support_page(s: AppState, discretionary: float, fixed: dict) -> None:
+    st.subheader("의사결정 지원")
+    st.caption("회고록(사후 가시화) / 대안가치(재배분 비교) 두 모드 중 선택")
+
+    fixed_sum = sum(fixed.values())
+    st.write(f"- 필수 시간 합계: **{fixed_sum:.1f}시간**")
+    st.write(f"- 선택 가능한 시간(추정): **{discretionary:.1f}시간**")
+    st.write(f"- 시간가치 기준: **{krw(s.basis_hour_value)}/시간**")
+    st.caption(s.basis_note)
+
+    if not s.choices:
+        st.info("선택지(시간 배분)가 아직 없어. 입력 탭에서 추가해줘.")
+        return
+
+    mode = st.radio(
+        "모드 선택",
+        ["회고록 모드", "대안 가치 모드"],
+        horizontal=True,
+        key="support_mode_radio",  # ✅ 고유 key
+    )
+
+    # 공통: 현재 가치 테이블 (입력 화면에서 백그라운드로 미리 계산해 둔 결과가 있으면 그것)
+    tables = support_tables(for_session(st.session_state), s, discretionary)
+    df_now, total_now = tables.df_now, tables.total_now
+
+    st.divider()
+    st.subheader("현재 시간 배분 (가치 가시화)")
+    df_show = df_now.copy()
+    if "가치환산(원)" in df_show.columns:
+        df_show["가치환산(원)"] = df_show["가치환산(원)"].apply(krw)
+    st.dataframe(df_show, use_container_width=True, hide_index=True)
+    st.success(f"현재 선택들의 ‘가능성 가치 환산 합계’는 **{krw(total_now)}** 정도로 표현될 수 있어.")
+
+    if mode == "회고록 모드":
+        st.divider()
+        _render_reflection_questions()
+        return
+
+    # -----------------------------
+    # 대안 가치 모드
+    # -----------------------------
+    st.divider()
+    st.subheader("대안 가치 모드: 재배분 비교")
+
+    # 범주 후보: s.weights의 키(가장 확실) 우선, 없으면 choices에서 추출 (precompute.support_categories)
+    if len(tables.categories) < 2:
+        st.warning("대안 비교를 하려면 범주가 2개 이상 필요해.")
+        return
+
+    _render_alternative_compare(s, tables)
+
+    # -----------------------------
+    # 최적 배분: 범주별 최소/최대 시간 제약 안에서 가치가 가장 큰 배분
+    # -----------------------------
+    st.divider()
+    _render_optimal_allocation(s, discretionary, tables)
+
+    # -----------------------------
+    # 가능성: 1시간 재배분 민감도 (calc.py 기반으로!)
+    # -----------------------------
+    st.divider()
+    _render_reallocation_gains(s, tables)
@@ -0,0 +1,223 @@
+# 불확실성 모드: p_conv / multiplier를 분포로 두고 총 가치의 범위(P10/P50/P90)를 추정
+#
+# 총 가치 = Σ_c hours_c * basis * alpha_c * p_conv_c * multiplier_c
+# p_conv_c, multiplier_c만 확률변수이므로, 표본마다 (p * m) @ (hours * alpha * basis)로 한 번에 계산한다.
+# 분포는 모두 유한 구간이라 총 가치의 범위를 미리 알 수 있다
+#   -> 시나리오별 고정 크기 히스토그램에 누적(스트리밍)하므로 표본 수와 무관하게 메모리가 일정하다.
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .calc import _clamp_nonneg_array
+from .parallel import parallel_map
+
+DIST_KINDS = ("point", "uniform", "triangular", "beta")
+
+
+@dataclass(frozen=True)
+class FactorDist:
+    """
+    계수 분포(모두 [low, high] 구간)
+    - point: low(=high) 고정값
+    - uniform: low ~ high 균등
+    - triangular: low ~ high, 최빈값 mode
+    - beta: low + (high - low) * Beta(a, b)
+    """
+    kind: str = "point"
+    low: float = 1.0
+    high: float = 1.0
+    mode: Optional[float] = None
+    a: float = 2.0
+    b: float = 2.0
+
+    def __post_init__(self) -> None:
+        if self.kind not in DIST_KINDS:
+            raise ValueError(f"지원하지 않는 분포입니다: {self.kind}")
+        if self.high < self.low:
+            raise ValueError("high는 low 이상이어야 합니다.")
+
+    @property
+    def center(self) -> float:
+        """triangular 최빈값(없으면 구간 중앙)"""
+        return float(self.mode) if self.mode is not None else (self.low + self.high) / 2.0
+
+
+def point(value: float) -> FactorDist:
+    return FactorDist("point", float(value), float(value))
+
+
+def uniform(low: float, high: float) -> FactorDist:
+    return FactorDist("uniform", float(low), float(high))
+
+
+def triangular(low: float, mode: float, high: float) -> FactorDist:
+    return FactorDist("triangular", float(low), float(high), mode=float(mode))
+
+
+def beta(a: float, b: float, low: float = 0.0, high: float = 1.0) -> FactorDist:
+    return FactorDist("beta", float(low), float(high), a=float(a), b=float(b))
+
+
+@dataclass(frozen=True)
+class ValueBands:
+    """시나리오별 총 가치 요약 (모두 (S,))"""
+    mean: np.ndarray
+    p10: np.ndarray
+    p50: np.ndarray
+    p90: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+    n_samples: int
+
+
+def _sample(dists: Sequence[FactorDist], rng: np.random.Generator, n: int) -> np.ndarray:
+    """범주별 분포에서 (n, C) 표본. 같은 종류의 분포는 한 번의 호출로 뽑는다."""
+    out = np.empty((n, len(dists)), dtype=float)
+    by_kind: Dict[str, List[int]] = {}
+    for i, d in enumerate(dists):
+        by_kind.setdefault(d.kind, []).append(i)
+
+    for kind, idx in by_kind.items():
+        ds = [dists[i] for i in idx]
+        low = np.array([d.low for d in ds])
+        high = np.array([d.high for d in ds])
+        if kind == "point":
+            out[:, idx] = low
+        elif kind == "uniform":
+            out[:, idx] = rng.uniform(low, high, size=(n, len(idx)))
+        elif kind == "triangular":
+            mode = np.clip([d.center for d in ds], low, high)
+            # numpy triangular은 low == high를 허용하지 않으므로 폭 0인 분포는 고정값으로 둔다
+            width = high > low
+            vals = np.broadcast_to(low, (n, len(idx))).copy()
+            if width.any():
+                vals[:, width] = rng.triangular(low[width], mode[width], high[width], size=(n, int(width.sum())))
+            out[:, idx] = vals
+        else:  # beta
+            a = np.array([d.a for d in ds])
+            b = np.array([d.b for d in ds])
+            out[:, idx] = low + (high - low) * rng.beta(a, b, size=(n, len(idx)))
+    return out
+
+
+def _support(dists: Sequence[FactorDist], lo_clip: float, hi_clip: float) -> Tuple[np.ndarray, np.ndarray]:
+    low = np.clip([d.low for d in dists], lo_clip, hi_clip)
+    high = np.clip([d.high for d in dists], lo_clip, hi_clip)
+    return low, high
+
+
+def _simulate_chunk(
+    coef: np.ndarray,
+    p_dists: Sequence[FactorDist],
+    m_dists: Sequence[FactorDist],
+    edges_lo: np.ndarray,
+    edges_hi: np.ndarray,
+    bins: int,
+    n: int,
+    seed: np.random.SeedSequence,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    n개 표본 -> (히스토그램 (S, bins), 합계 (S,)).
+    프로세스 풀에서도 쓰이므로 모듈 최상위 함수로 둔다.
+    """
+    rng = np.random.default_rng(seed)
+    p = np.clip(_sample(p_dists, rng, n), 0.0, 1.0)
+    m = np.clip(_sample(m_dists, rng, n), 0.0, None)
+    totals = (p * m) @ coef.T  # (n, S)
+
+    n_scen = coef.shape[0]
+    width = edges_hi - edges_lo
+    scale = np.divide(bins, width, out=np.zeros_like(width), where=width > 0)
+    idx = np.clip(((totals - edges_lo) * scale).astype(np.int64), 0, bins - 1)
+    idx += np.arange(n_scen, dtype=np.int64) * bins
+    counts = np.bincount(idx.ravel(), minlength=n_scen * bins).reshape(n_scen, bins)
+    return counts, totals.sum(axis=0)
+
+
+def _simulate_task(args) -> Tuple[np.ndarray, np.ndarray]:
+    return _simulate_chunk(*args)
+
+
+def _quantiles(counts: np.ndarray, lo: np.ndarray, hi: np.ndarray, qs: Sequence[float]) -> List[np.ndarray]:
+    """히스토그램 누적분포에서 구간 내 선형 보간으로 분위수 추정 (오차 <= 구간 폭/bins)."""
+    n_scen, bins = counts.shape
+    cdf = np.cumsum(counts, axis=1)
+    total = cdf[:, -1:]
+    width = (hi - lo) / bins
+    out = []
+    for q in qs:
+        target = q * total
+        k = np.minimum((cdf < target).sum(axis=1), bins - 1)
+        rows = np.arange(n_scen)
+        prev = np.where(k > 0, cdf[rows, np.maximum(k - 1, 0)], 0)
+        in_bin = counts[rows, k]
+        frac = np.divide(target[:, 0] - prev, in_bin, out=np.zeros(n_scen), where=in_bin > 0)
+        out.append(lo + (k + np.clip(frac, 0.0, 1.0)) * width)
+    return out
+
+
+def simulate_value_bands(
+    hours: Any,
+    basis_hour_value: Any,
+    alpha: Any,
+    p_conv: Sequence[FactorDist],
+    multiplier: Sequence[FactorDist],
+    *,
+    n_samples: int = 100_000,
+    chunk_size: int = 20_000,
+    bins: int = 2048,
+    seed: Optional[int] = None,
+    workers: Optional[int] = 1,
+) -> ValueBands:
+    """
+    시나리오별 총 가치의 평균/P10/P50/P90.
+
+    - hours: (S, C) 또는 (C,), basis_hour_value: 스칼라 또는 (S,), alpha: 스칼라/(C,)/(S, C)
+    - p_conv / multiplier: 범주별 FactorDist (길이 C)
+    - 표본은 chunk_size 단위로 뽑아 히스토그램에 누적한다. (메모리: chunk_size * S + S * bins)
+    - workers > 1이면 청크를 프로세스 풀로 나눠 계산한다. (None이면 NOAATS_WORKERS 또는 CPU 수)
+    - 청크마다 seed에서 파생된 독립 난수열을 쓰므로, 같은 seed면 workers 수와 관계없이 결과가 같다.
+    """
+    h = _clamp_nonneg_array(hours)
+    if h.ndim == 1:
+        h = h[np.newaxis, :]
+    v0 = _clamp_nonneg_array(basis_hour_value)
+    if v0.ndim == 1:
+        v0 = v0[:, np.newaxis]
+    coef = h * v0 * np.broadcast_to(_clamp_nonneg_array(alpha), h.shape)  # (S, C)
+
+    n_cat = h.shape[1]
+    if len(p_conv) != n_cat or len(multiplier) != n_cat:
+        raise ValueError("p_conv / multiplier 분포 개수가 범주 수와 다릅니다.")
+
+    # 총 가치의 범위: 모든 항이 0 이상이므로 구간 끝점의 곱으로 결정된다
+    p_lo, p_hi = _support(p_conv, 0.0, 1.0)
+    m_lo, m_hi = _support(multiplier, 0.0, np.inf)
+    lo = coef @ (p_lo * m_lo)
+    hi = coef @ (p_hi * m_hi)
+
+    n_samples = max(1, int(n_samples))
+    chunk_size = max(1, int(chunk_size))
+    sizes = [min(chunk_size, n_samples - i) for i in range(0, n_samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(coef, p_conv, multiplier, lo, hi, bins, n, sd) for n, sd in zip(sizes, seeds)]
+
+    counts = np.zeros((h.shape[0], bins), dtype=np.int64)
+    total = np.zeros(h.shape[0], dtype=float)
+    for c, t in parallel_map(_simulate_task, args, workers=workers if len(args) > 1 else 1):
+        counts += c
+        total += t
+
+    p10, p50, p90 = _quantiles(counts, lo, hi, (0.1, 0.5, 0.9))
+    return ValueBands(
+        mean=total / n_samples,
+        p10=p10,
+        p50=p50,
+        p90=p90,
+        low=lo,
+        high=hi,
+        n_samples=n_samples,
+    )